@@ -0,0 +1,161 @@
+from abc import ABC, abstractmethod
+from typing import Dict, NamedTuple, Optional
+
+
+class AdmissionDecision(NamedTuple):
+    allowed: bool
+    retry_after: int = 0
+    reason: str = ""
+    # burst_exceeded일 때 한 번에 허용되는 최대 cost
+    limit: int = 0
+
+
+class IAdmissionController(ABC):
+    @abstractmethod
+    def check_queue(self, inference_engine: str, incoming: int = 1) -> AdmissionDecision:
+        pass
+
+    @abstractmethod
+    def consume_user_tokens(self, user_id: str, cost: int = 1) -> AdmissionDecision:
+        pass
+
+    @abstractmethod
+    def record_completions(self, inference_engine: str, count: int = 1) -> None:
+        pass
+
+
+import logging
+import math
+import time
+from app.infrastructure.Environment import get_environment_variables
+from app.infrastructure.Queue import IQueue
+from app.infrastructure.RedisClient import get_redis_client
+
+# 토큰 버킷 : 경과 시간만큼 채운 뒤 cost만큼 차감, 부족하면 다시 채워질 때까지의 시간을 반환
+# 여러 API 프로세스가 같은 시계를 쓰도록 Redis TIME을 사용
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or burst
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {allowed, tostring(retry_after)}
+"""
+
+
+def parse_high_water_marks(value: str) -> Dict[str, int]:
+    # "tflite=1000,onnx=500"
+    high_water_marks = {}
+    for entry in value.split(","):
+        if "=" in entry:
+            inference_engine, limit = entry.split("=", 1)
+            high_water_marks[inference_engine.strip()] = int(limit)
+    return high_water_marks
+
+
+class RedisAdmissionController(IAdmissionController):
+    def __init__(
+        self,
+        queue: IQueue,
+        high_water_marks: Optional[Dict[str, int]] = None,
+        user_rate: Optional[float] = None,
+        user_burst: Optional[int] = None,
+    ):
+        self.env = get_environment_variables()
+        self.client = get_redis_client()
+        self.queue = queue
+        self.default_high_water_mark = self.env.ADMISSION_HIGH_WATER_MARK
+        self.high_water_marks = (
+            high_water_marks
+            if high_water_marks is not None
+            else parse_high_water_marks(self.env.ADMISSION_HIGH_WATER_MARKS)
+        )
+        self.drain_window = max(1, self.env.ADMISSION_DRAIN_WINDOW_SECONDS)
+        self.max_retry_after = self.env.ADMISSION_MAX_RETRY_AFTER_SECONDS
+        self.user_rate = (
+            user_rate if user_rate is not None else self.env.USER_RATE_LIMIT_PER_SECOND
+        )
+        self.user_burst = (
+            user_burst if user_burst is not None else self.env.USER_RATE_LIMIT_BURST
+        )
+        self.token_bucket = self.client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    def get_high_water_mark(self, inference_engine: str) -> int:
+        return self.high_water_marks.get(inference_engine, self.default_high_water_mark)
+
+    def get_drain_key(self, inference_engine: str, second: int) -> str:
+        return f"inference_drain:{inference_engine}:{second}"
+
+    def get_drain_rate(self, inference_engine: str) -> float:
+        """최근 drain_window초 동안 워커가 완료한 초당 처리량"""
+        now = int(time.time())
+        counts = self.client.mget(
+            [
+                self.get_drain_key(inference_engine, second)
+                for second in range(now - self.drain_window, now)
+            ]
+        )
+        return sum(int(count) for count in counts if count) / self.drain_window
+
+    def check_queue(self, inference_engine: str, incoming: int = 1) -> AdmissionDecision:
+        high_water_mark = self.get_high_water_mark(inference_engine)
+        if high_water_mark <= 0:
+            return AdmissionDecision(True)
+        try:
+            queue_length = self.queue.get_queue_length(inference_engine)
+            if queue_length + incoming <= high_water_mark:
+                return AdmissionDecision(True)
+            drain_rate = self.get_drain_rate(inference_engine)
+        except Exception as e:
+            # 혼잡 제어가 장애 지점이 되지 않도록 Redis 오류 시에는 허용
+            logging.error(f"[ERROR] Failed to check queue admission: {e}")
+            return AdmissionDecision(True)
+
+        excess = queue_length + incoming - high_water_mark
+        retry_after = (
+            math.ceil(excess / drain_rate) if drain_rate > 0 else self.max_retry_after
+        )
+        return AdmissionDecision(
+            False, min(max(retry_after, 1), self.max_retry_after), "queue_full"
+        )
+
+    def consume_user_tokens(self, user_id: str, cost: int = 1) -> AdmissionDecision:
+        if self.user_rate <= 0:
+            return AdmissionDecision(True)
+        if cost > self.user_burst:
+            # 버킷이 가득 차도 통과할 수 없으므로 재시도 시간을 주지 않음
+            return AdmissionDecision(False, 0, "burst_exceeded", self.user_burst)
+        try:
+            allowed, retry_after = self.token_bucket(
+                keys=[f"rate_limit:{user_id}"],
+                args=[self.user_rate, self.user_burst, cost],
+            )
+        except Exception as e:
+            logging.error(f"[ERROR] Failed to check user rate limit: {e}")
+            return AdmissionDecision(True)
+        if int(allowed):
+            return AdmissionDecision(True)
+        return AdmissionDecision(
+            False, max(math.ceil(float(retry_after)), 1), "rate_limited"
+        )
+
+    def record_completions(self, inference_engine: str, count: int = 1) -> None:
+        key = self.get_drain_key(inference_engine, int(time.time()))
+        pipeline = self.client.pipeline(transaction=False)
+        pipeline.incrby(key, count)
+        pipeline.expire(key, self.drain_window * 2)
+        pipeline.execute()
@@ -3,7 +3,15 @@ from sqlalchemy.orm import sessionmaker
 from app.infrastructure.Environment import get_environment_variables
 
 env = get_environment_variables()
-DATABASE_URL = f"{env.DATABASE_DIALECT}://{env.DATABASE_USERNAME}:{env.DATABASE_PASSWORD}@{env.DATABASE_HOSTNAME}:{env.DATABASE_PORT}/{env.DATABASE_NAME}"
+# DATABASE_URL이 지정되면 우선 사용 (예: 부하 테스트용 sqlite)
+DATABASE_URL = (
+    env.DATABASE_URL
+    or f"{env.DATABASE_DIALECT}://{env.DATABASE_USERNAME}:{env.DATABASE_PASSWORD}@{env.DATABASE_HOSTNAME}:{env.DATABASE_PORT}/{env.DATABASE_NAME}"
+)
+# sqlite 연결은 워커 스레드에서도 사용되므로 스레드 검사를 끔
+connect_args = (
+    {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+)
 
-engine = create_engine(DATABASE_URL, echo=True)
+engine = create_engine(DATABASE_URL, echo=env.DATABASE_ECHO, connect_args=connect_args)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
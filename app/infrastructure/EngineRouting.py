@@ -0,0 +1,126 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+
+class IEngineRouter(ABC):
+    @abstractmethod
+    def choose_engine(self, inference_engines: List[str], incoming: int = 1) -> str:
+        pass
+
+    @abstractmethod
+    def record_service_time(self, inference_engine: str, seconds_per_image: float) -> None:
+        pass
+
+    @abstractmethod
+    def record_heartbeat(self, inference_engine: str, worker_id: str) -> None:
+        pass
+
+
+import logging
+import time
+from app.infrastructure.Environment import get_environment_variables
+from app.infrastructure.Queue import IQueue
+from app.infrastructure.RedisClient import get_redis_client
+
+# 첫 번째 엔진의 확신도가 낮을 때만 두 번째 엔진으로 넘기는 요청 모드
+CASCADE_INFERENCE_ENGINE = "cascade"
+
+# 이미지당 처리 시간의 지수 이동 평균 (첫 관측값은 그대로 저장)
+EWMA_SCRIPT = """
+local alpha = tonumber(ARGV[1])
+local sample = tonumber(ARGV[2])
+local current = tonumber(redis.call('GET', KEYS[1]) or '')
+if current then
+    sample = current * (1 - alpha) + sample * alpha
+end
+redis.call('SET', KEYS[1], tostring(sample))
+return tostring(sample)
+"""
+
+
+class RedisEngineRouter(IEngineRouter):
+    """대기열 깊이와 엔진별 처리 시간 이동 평균으로 예상 완료 시간이 가장 짧은 엔진을 고릅니다.
+
+    예상 완료 시간 = (대기 중인 이미지 + 새 이미지) x 이미지당 처리 시간 / 실행 중인 워커 수
+    처리 시간은 API와 별도로 실행되는 워커도 공유할 수 있도록 Redis에 기록합니다.
+    """
+
+    def __init__(self, queue: IQueue):
+        self.env = get_environment_variables()
+        self.client = get_redis_client()
+        self.queue = queue
+        self.alpha = min(max(self.env.ENGINE_ROUTING_EWMA_ALPHA, 0.01), 1.0)
+        self.worker_ttl = max(1, self.env.ENGINE_ROUTING_WORKER_TTL_SECONDS)
+        self.ewma = self.client.register_script(EWMA_SCRIPT)
+
+    def get_service_time_key(self, inference_engine: str) -> str:
+        return f"inference_service_time:{inference_engine}"
+
+    def get_workers_key(self, inference_engine: str) -> str:
+        return f"inference_workers:{inference_engine}"
+
+    def record_service_time(self, inference_engine: str, seconds_per_image: float) -> None:
+        self.ewma(
+            keys=[self.get_service_time_key(inference_engine)],
+            args=[self.alpha, seconds_per_image],
+        )
+
+    def record_heartbeat(self, inference_engine: str, worker_id: str) -> None:
+        # 최근 worker_ttl초 안에 신호를 보낸 워커를 실행 중인 워커로 간주
+        workers_key = self.get_workers_key(inference_engine)
+        now = time.time()
+        pipeline = self.client.pipeline(transaction=False)
+        pipeline.zadd(workers_key, {worker_id: now})
+        pipeline.zremrangebyscore(workers_key, "-inf", now - self.worker_ttl)
+        pipeline.expire(workers_key, self.worker_ttl * 2)
+        pipeline.execute()
+
+    def get_engine_loads(self, inference_engines: List[str]) -> Dict[str, Dict]:
+        now = time.time()
+        pipeline = self.client.pipeline(transaction=False)
+        for inference_engine in inference_engines:
+            pipeline.get(self.get_service_time_key(inference_engine))
+            pipeline.zcount(
+                self.get_workers_key(inference_engine), now - self.worker_ttl, "+inf"
+            )
+        results = pipeline.execute()
+        loads = {}
+        for idx, inference_engine in enumerate(inference_engines):
+            service_time, workers = results[idx * 2], results[idx * 2 + 1]
+            loads[inference_engine] = {
+                "queue_length": self.queue.get_queue_length(inference_engine),
+                "seconds_per_image": float(service_time) if service_time else None,
+                "workers": int(workers),
+            }
+        return loads
+
+    def estimate_completion_seconds(self, load: Dict, incoming: int) -> float:
+        seconds_per_image = load["seconds_per_image"]
+        if seconds_per_image is None:
+            # 아직 처리 기록이 없는 엔진은 측정되도록 먼저 선택
+            return 0.0
+        return (
+            (load["queue_length"] + incoming)
+            * seconds_per_image
+            / max(load["workers"], 1)
+        )
+
+    def choose_engine(self, inference_engines: List[str], incoming: int = 1) -> str:
+        try:
+            loads = self.get_engine_loads(inference_engines)
+        except Exception as e:
+            logging.error(f"[ERROR] Failed to read engine loads: {e}")
+            return inference_engines[0]
+
+        # 실행 중인 워커가 없는 엔진은 제외 (모든 엔진에 워커가 없으면 전체에서 선택)
+        candidates = [
+            inference_engine
+            for inference_engine in inference_engines
+            if loads[inference_engine]["workers"]
+        ] or inference_engines
+        return min(
+            candidates,
+            key=lambda inference_engine: self.estimate_completion_seconds(
+                loads[inference_engine], incoming
+            ),
+        )
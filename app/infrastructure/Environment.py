@@ -47,6 +47,72 @@ class EnvironmentSettings(BaseSettings):
     SCALITY_ACCESS_KEY_ID: str
     SCALITY_SECRET_ACCESS_KEY: str
     REMOTE_MANAGEMENT_DISABLE: str
+    RESULT_CACHE_TTL_SECONDS: int = 3600
+    EVENT_STREAM_IDLE_TIMEOUT_SECONDS: float = 300.0
+    NEAR_DUPLICATE_ENABLED: bool = False
+    NEAR_DUPLICATE_MAX_DISTANCE: int = 4
+    NEAR_DUPLICATE_MAX_ENTRIES: int = 100000
+    NEAR_DUPLICATE_TTL_SECONDS: int = 86400
+    RESULT_HTTP_MAX_AGE_SECONDS: int = 0
+    RETENTION_CHUNK_SIZE: int = 1000
+    RETENTION_THROTTLE_SECONDS: float = 0.5
+    INFERENCE_LOG_PARTITION_INTERVAL: str = ""
+    INFERENCE_LOG_PARTITION_PREMAKE: int = 7
+    TRACE_EXPORTER: str = "none"
+    TRACE_EXPORT_PATH: str = "traces.jsonl"
+    TRACE_SAMPLE_RATIO: float = 1.0
+    TRACE_RECENT_LIMIT: int = 200
+    DATABASE_URL: str = ""
+    DATABASE_ECHO: bool = True
+    REDIS_BACKEND: str = "redis"
+    OBJECT_STORAGE_BACKEND: str = "zenko"
+    LOCAL_OBJECT_STORAGE_PATH: str = "local_storage"
+    IMAGE_MAX_PIXELS: int = 4096 * 4096
+    TENSOR_INGEST_IMAGE_SIZE: int = 128
+    PREFIX_BATCH_PAGE_SIZE: int = 1000
+    PREFIX_BATCH_MAX_QUEUE_LENGTH: int = 10000
+    PREFIX_BATCH_POLL_SECONDS: float = 1.0
+    S3_MULTIPART_THRESHOLD_BYTES: int = 8 * 1024 * 1024
+    S3_MULTIPART_CHUNK_SIZE_BYTES: int = 8 * 1024 * 1024
+    S3_MULTIPART_CONCURRENCY: int = 4
+    INFERENCE_WORKERS_IN_PROCESS: bool = True
+    INFERENCE_NUM_THREADS: int = 0
+    INFERENCE_PREFETCH_SIZE: int = 8
+    INFERENCE_DECODE_CONCURRENCY: int = 2
+    INFERENCE_BATCH_SIZE: int = 8
+    INFERENCE_DECODE_QUEUE_DEPTH: int = 16
+    INFERENCE_BATCH_QUEUE_DEPTH: int = 32
+    INFERENCE_PERSIST_QUEUE_DEPTH: int = 64
+    ADMISSION_HIGH_WATER_MARK: int = 0
+    ADMISSION_HIGH_WATER_MARKS: str = ""
+    ADMISSION_DRAIN_WINDOW_SECONDS: int = 60
+    ADMISSION_MAX_RETRY_AFTER_SECONDS: int = 300
+    USER_RATE_LIMIT_PER_SECOND: float = 0.0
+    USER_RATE_LIMIT_BURST: int = 100
+    QUEUE_USER_WEIGHTS: str = ""
+    INFERENCE_DEFAULT_DEADLINE_SECONDS: float = 0.0
+    ENGINE_ROUTING_EWMA_ALPHA: float = 0.2
+    ENGINE_ROUTING_WORKER_TTL_SECONDS: int = 30
+    CASCADE_FIRST_ENGINE: str = "tflite"
+    CASCADE_SECOND_ENGINE: str = "onnx"
+    CASCADE_MIN_CONFIDENCE: float = 0.5
+    CASCADE_MIN_MARGIN: float = 0.2
+    QUEUE_BACKEND: str = "redis"
+    PGMQ_VISIBILITY_TIMEOUT_SECONDS: int = 300
+    PGMQ_MAX_DELIVERIES: int = 3
+    MEMORY_QUEUE_JOURNAL_PATH: str = ""
+    MEMORY_QUEUE_JOURNAL_FSYNC: bool = False
+    TENSOR_SHARD_ENABLED: bool = False
+    TENSOR_SHARD_MAX_FRAMES: int = 512
+    TENSOR_SHARD_FLUSH_SECONDS: float = 60.0
+    REPROCESS_ENABLED: bool = False
+    REPROCESS_CHUNK_SIZE: int = 256
+    REPROCESS_DOWNLOAD_CONCURRENCY: int = 8
+    REPROCESS_NUM_THREADS: int = 1
+    REPROCESS_THROTTLE_SECONDS: float = 0.1
+    REPROCESS_MAX_LIVE_QUEUE_LENGTH: int = 100
+    REPROCESS_JOB_LEASE_SECONDS: int = 60
+    REPROCESS_POLL_SECONDS: float = 5.0
 
     model_config = ConfigDict(
         env_file=get_env_filename(), env_file_encoding="utf-8", extra="ignore"
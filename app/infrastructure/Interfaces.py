@@ -1,17 +1,102 @@
-from app.infrastructure.Queue import IQueue, RedisQueue
+from app.infrastructure.Environment import get_environment_variables
+from app.infrastructure.Queue import IQueue, PGMQQueue, RedisQueue, get_memory_queue
 
 
 def get_queue() -> IQueue:
+    queue_backend = get_environment_variables().QUEUE_BACKEND
+    if queue_backend == "pgmq":
+        return PGMQQueue()
+    if queue_backend == "memory":
+        return get_memory_queue()
     return RedisQueue()
 
-
-from app.infrastructure.ObjectStorage import IObjectStorage, ZenkoObjectStorage
+from app.infrastructure.ObjectStorage import (
+    IObjectStorage,
+    LocalObjectStorage,
+    ZenkoObjectStorage,
+)
 
 
 def get_s3_client() -> IObjectStorage:
+    if get_environment_variables().OBJECT_STORAGE_BACKEND == "local":
+        return LocalObjectStorage()
     return ZenkoObjectStorage()
 
 
+# 아래 구성 요소는 QUEUE_BACKEND와 관계없이 Redis를 사용 (단일 프로세스는 fakeredis 가능)
+from app.infrastructure.Notifier import INotifier, RedisNotifier
+
+
+def get_notifier() -> INotifier:
+    return RedisNotifier()
+
+
+from app.infrastructure.ResultCache import IResultCache, RedisResultCache
+
+
+def get_result_cache() -> IResultCache:
+    return RedisResultCache()
+
+
+from app.infrastructure.NearDuplicateIndex import (
+    INearDuplicateIndex,
+    RedisNearDuplicateIndex,
+)
+
+
+def get_near_duplicate_index() -> INearDuplicateIndex:
+    return RedisNearDuplicateIndex()
+
+
+from app.infrastructure.AdmissionControl import (
+    IAdmissionController,
+    RedisAdmissionController,
+)
+
+
+def get_admission_controller() -> IAdmissionController:
+    return RedisAdmissionController(get_queue())
+
+
+from app.infrastructure.EngineRouting import IEngineRouter, RedisEngineRouter
+
+
+def get_engine_router() -> IEngineRouter:
+    return RedisEngineRouter(get_queue())
+
+
+from app.infrastructure.TensorShardStore import (
+    ITensorShardStore,
+    ObjectStorageTensorShardStore,
+)
+
+
+def get_tensor_shard_store() -> ITensorShardStore:
+    return ObjectStorageTensorShardStore(get_s3_client())
+
+
+from functools import lru_cache
+from app.infrastructure.Tracing import (
+    Tracer,
+    FileTraceExporter,
+    InMemoryTraceExporter,
+    NoopTraceExporter,
+)
+
+
+@lru_cache
+def get_tracer() -> Tracer:
+    env = get_environment_variables()
+    if env.TRACE_EXPORTER == "file":
+        exporter = FileTraceExporter(env.TRACE_EXPORT_PATH, env.APP_NAME)
+    elif env.TRACE_EXPORTER == "memory":
+        exporter = InMemoryTraceExporter()
+    else:
+        exporter = NoopTraceExporter()
+    return Tracer(exporter, env.TRACE_SAMPLE_RATIO, env.TRACE_RECENT_LIMIT)
+
+
+from typing import Optional
 from app.infrastructure.VisionModel import (
     IVisionModel,
     TFLiteVisionModel,
@@ -19,11 +104,13 @@ from app.infrastructure.VisionModel import (
 )
 
 
-def get_model_session(inference_engine: str) -> IVisionModel:
+def get_model_session(
+    inference_engine: str, num_threads: Optional[int] = None
+) -> IVisionModel:
     if inference_engine == "tflite":
-        return TFLiteVisionModel()
+        return TFLiteVisionModel(num_threads)
     elif inference_engine == "onnx":
-        return ONNXVisionModel()
+        return ONNXVisionModel(num_threads)
 
 
 from app.infrastructure.Database import SessionLocal
@@ -0,0 +1,125 @@
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+INFERENCE_STAGE_SECONDS = Histogram(
+    "inference_stage_seconds",
+    "Time spent in each stage of the inference worker",
+    ["engine", "stage"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling HTTP requests per route",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+INFERENCE_QUEUE_LENGTH = Gauge(
+    "inference_queue_length",
+    "Number of messages waiting in the inference queue",
+    ["engine"],
+)
+INFERENCE_IN_FLIGHT = Gauge(
+    "inference_in_flight",
+    "Number of messages currently being processed by workers",
+    ["engine"],
+)
+INFERENCE_WORKER_BUSY_SECONDS = Counter(
+    "inference_worker_busy_seconds",
+    "Time workers spent running model inference, rate() gives utilization",
+    ["engine"],
+)
+INFERENCE_PIPELINE_OCCUPANCY = Gauge(
+    "inference_pipeline_occupancy",
+    "Messages in flight (download) or waiting in front of each worker pipeline stage",
+    ["engine", "stage"],
+)
+INFERENCE_BATCH_SIZE = Histogram(
+    "inference_batch_size",
+    "Number of images per model invocation",
+    ["engine"],
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+INFERENCE_COMPLETED = Counter(
+    "inference_completed",
+    "Number of completed inferences",
+    ["engine"],
+)
+INFERENCE_ERRORS = Counter(
+    "inference_errors",
+    "Number of failed inferences per stage",
+    ["engine", "stage"],
+)
+INFERENCE_DROPPED = Counter(
+    "inference_dropped",
+    "Messages dropped by workers before inference",
+    ["engine", "reason"],
+)
+ADMISSION_REJECTED = Counter(
+    "admission_rejected",
+    "Ingest requests rejected by admission control",
+    ["engine", "reason"],
+)
+UPLOAD_REJECTED = Counter(
+    "upload_rejected",
+    "Uploaded images rejected by header validation before storage",
+    ["reason"],
+)
+CASCADE_ESCALATED = Counter(
+    "inference_cascade_escalated",
+    "Cascade requests passed to the second engine because of low confidence",
+    ["engine"],
+)
+NEAR_DUPLICATE_LOOKUPS = Counter(
+    "near_duplicate_lookups",
+    "Perceptual hash lookups by outcome, hit means a stored result was reused",
+    ["result"],
+)
+NEAR_DUPLICATE_LOOKUP_SECONDS = Histogram(
+    "near_duplicate_lookup_seconds",
+    "Time spent looking up the near-duplicate index",
+    buckets=LATENCY_BUCKETS,
+)
+NEAR_DUPLICATE_INDEX_SIZE = Gauge(
+    "near_duplicate_index_size",
+    "Number of image hashes in the near-duplicate index",
+)
+INFERENCE_LOG_PARTITION_END = Gauge(
+    "inference_log_partition_end_timestamp",
+    "End of the last premade inference log partition in unix seconds",
+    ["table"],
+)
+RESULT_CACHE_REQUESTS = Counter(
+    "result_cache_requests",
+    "Result cache lookups by outcome",
+    ["result"],
+)
+
+
+def render_metrics() -> bytes:
+    return generate_latest()
+
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
@@ -0,0 +1,174 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+
+class NearDuplicate(NamedTuple):
+    inference_id: str
+    inference_engine: str
+    distance: int
+
+
+class INearDuplicateIndex(ABC):
+    @abstractmethod
+    def add(
+        self, image_hash: int, user_id: str, inference_engine: str, inference_id: str
+    ) -> None:
+        pass
+
+    @abstractmethod
+    def find(
+        self,
+        image_hash: int,
+        user_id: str,
+        inference_engines: Optional[Iterable[str]] = None,
+    ) -> Optional[NearDuplicate]:
+        """같은 사용자의 결과 중 해밍 거리가 임계값 이하인 가장 가까운 결과를 반환합니다."""
+        pass
+
+    @abstractmethod
+    def size(self) -> int:
+        pass
+
+
+import time
+from app.infrastructure.Environment import get_environment_variables
+from app.infrastructure.Metrics import NEAR_DUPLICATE_LOOKUP_SECONDS
+from app.infrastructure.RedisClient import get_redis_client
+
+IMAGE_HASH_BITS = 64
+
+
+def get_hash_bands(band_count: int) -> List[Tuple[int, int]]:
+    """64비트 해시를 band_count개의 연속 구간 (shift, width)으로 나눕니다."""
+    bands = []
+    shift = 0
+    for band_idx in range(band_count):
+        width = IMAGE_HASH_BITS // band_count + int(
+            band_idx < IMAGE_HASH_BITS % band_count
+        )
+        bands.append((shift, width))
+        shift += width
+    return bands
+
+
+def get_hamming_distance(left: int, right: int) -> int:
+    return bin(left ^ right).count("1")
+
+
+class RedisNearDuplicateIndex(INearDuplicateIndex):
+    """다중 색인 해싱(multi-index hashing)으로 최근 결과의 이미지 해시를 찾는 색인
+
+    해시를 (최대 거리 + 1)개 구간으로 나누면, 거리가 최대 거리 이하인 두 해시는
+    비둘기집 원리에 따라 적어도 한 구간이 정확히 같습니다. 구간 값별 Redis 집합에서
+    후보를 모은 뒤 실제 해밍 거리를 계산하고, 항목은 등록 시각 순 정렬 집합으로
+    개수와 보관 기간을 제한합니다. 다른 사용자의 추론 ID가 노출되지 않도록 구간
+    집합은 사용자별로 나눕니다.
+    """
+
+    def __init__(self):
+        self.env = get_environment_variables()
+        self.client = get_redis_client()
+        self.max_distance = max(0, self.env.NEAR_DUPLICATE_MAX_DISTANCE)
+        self.max_entries = max(1, self.env.NEAR_DUPLICATE_MAX_ENTRIES)
+        self.ttl = self.env.NEAR_DUPLICATE_TTL_SECONDS
+        self.bands = get_hash_bands(min(self.max_distance + 1, IMAGE_HASH_BITS))
+        self.entries_name = "near_duplicate:entries"
+
+    def get_bucket_names(self, image_hash: int, user_id: str) -> List[str]:
+        # 최대 거리가 바뀌면 구간이 달라지므로 구간 수를 키에 포함
+        return [
+            f"near_duplicate:{user_id}:{len(self.bands)}:{band_idx}:"
+            f"{(image_hash >> shift) & ((1 << width) - 1):x}"
+            for band_idx, (shift, width) in enumerate(self.bands)
+        ]
+
+    @staticmethod
+    def make_member(image_hash: int, inference_engine: str, inference_id: str) -> str:
+        return f"{image_hash:016x}:{inference_engine}:{inference_id}"
+
+    @staticmethod
+    def parse_member(member) -> Tuple[int, str, str]:
+        if isinstance(member, bytes):
+            member = member.decode("utf-8")
+        image_hash, inference_engine, inference_id = member.split(":", 2)
+        return int(image_hash, 16), inference_engine, inference_id
+
+    def add(
+        self, image_hash: int, user_id: str, inference_engine: str, inference_id: str
+    ) -> None:
+        member = self.make_member(image_hash, inference_engine, inference_id)
+        now = time.time()
+        pipeline = self.client.pipeline(transaction=False)
+        pipeline.zadd(self.entries_name, {member: now})
+        for bucket_name in self.get_bucket_names(image_hash, user_id):
+            pipeline.sadd(bucket_name, member)
+            pipeline.expire(bucket_name, self.ttl)
+        # 오래되었거나 개수를 넘은 항목은 제거 (구간 집합에서는 조회 시 정리)
+        pipeline.zremrangebyscore(self.entries_name, "-inf", now - self.ttl)
+        pipeline.zremrangebyrank(self.entries_name, 0, -(self.max_entries + 1))
+        pipeline.execute()
+
+    def find(
+        self,
+        image_hash: int,
+        user_id: str,
+        inference_engines: Optional[Iterable[str]] = None,
+    ) -> Optional[NearDuplicate]:
+        start_time = time.perf_counter()
+        try:
+            return self.find_nearest(image_hash, user_id, inference_engines)
+        finally:
+            NEAR_DUPLICATE_LOOKUP_SECONDS.observe(time.perf_counter() - start_time)
+
+    def find_nearest(
+        self,
+        image_hash: int,
+        user_id: str,
+        inference_engines: Optional[Iterable[str]],
+    ) -> Optional[NearDuplicate]:
+        bucket_names = self.get_bucket_names(image_hash, user_id)
+        pipeline = self.client.pipeline(transaction=False)
+        for bucket_name in bucket_names:
+            pipeline.smembers(bucket_name)
+        members = set().union(*pipeline.execute())
+        if inference_engines is not None:
+            inference_engines = set(inference_engines)
+
+        candidates = []
+        for member in members:
+            candidate_hash, inference_engine, inference_id = self.parse_member(member)
+            if inference_engines is not None and (
+                inference_engine not in inference_engines
+            ):
+                continue
+            distance = get_hamming_distance(image_hash, candidate_hash)
+            if distance <= self.max_distance:
+                candidates.append((distance, member, inference_engine, inference_id))
+        if not candidates:
+            return None
+
+        candidates.sort(key=lambda candidate: candidate[0])
+        pipeline = self.client.pipeline(transaction=False)
+        for _, member, _, _ in candidates:
+            pipeline.zscore(self.entries_name, member)
+        added_times = pipeline.execute()
+
+        expired_before = time.time() - self.ttl
+        expired_members = []
+        nearest = None
+        for (distance, member, inference_engine, inference_id), added_at in zip(
+            candidates, added_times
+        ):
+            if added_at is None or added_at < expired_before:
+                expired_members.append(member)
+            elif nearest is None:
+                nearest = NearDuplicate(inference_id, inference_engine, distance)
+        if expired_members:
+            pipeline = self.client.pipeline(transaction=False)
+            for bucket_name in bucket_names:
+                pipeline.srem(bucket_name, *expired_members)
+            pipeline.execute()
+        return nearest
+
+    def size(self) -> int:
+        return self.client.zcard(self.entries_name)
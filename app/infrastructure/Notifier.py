@@ -0,0 +1,96 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Dict, List, Optional
+
+
+class INotifier(ABC):
+    @abstractmethod
+    def publish_completion(self, event: Dict, batch_id: Optional[str] = None) -> None:
+        pass
+
+    @abstractmethod
+    def listen(
+        self,
+        inference_id: Optional[str] = None,
+        batch_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        idle_timeout: float = 15.0,
+    ) -> AsyncIterator[Optional[Dict]]:
+        pass
+
+
+import asyncio
+import json
+import logging
+from app.infrastructure.RedisClient import get_redis_client, get_async_redis_client
+
+
+class RedisNotifier(INotifier):
+    def __init__(self):
+        self.client = get_redis_client()
+        self.channel_prefix = "inference_events"
+
+    def get_channel_names(
+        self,
+        inference_id: Optional[str] = None,
+        batch_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ) -> List[str]:
+        channels = []
+        if inference_id:
+            channels.append(f"{self.channel_prefix}:inference:{inference_id}")
+        if batch_id:
+            channels.append(f"{self.channel_prefix}:batch:{batch_id}")
+        if user_id:
+            channels.append(f"{self.channel_prefix}:user:{user_id}")
+        return channels
+
+    def publish_completion(self, event: Dict, batch_id: Optional[str] = None) -> None:
+        data = event.get("data", {})
+        channels = self.get_channel_names(
+            inference_id=data.get("inference_id"),
+            batch_id=batch_id,
+            user_id=data.get("user_id"),
+        )
+        payload = json.dumps(event)
+        pipeline = self.client.pipeline(transaction=False)
+        for channel in channels:
+            pipeline.publish(channel, payload)
+        pipeline.execute()
+
+    async def listen(
+        self,
+        inference_id: Optional[str] = None,
+        batch_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        idle_timeout: float = 15.0,
+    ) -> AsyncIterator[Optional[Dict]]:
+        """구독한 채널의 이벤트를 반환합니다.
+
+        구독이 완료된 직후와 idle_timeout 동안 이벤트가 없을 때마다 None을 반환하므로,
+        호출자는 첫 번째 None 이후에 이미 완료된 결과를 조회하면 이벤트를 놓치지 않습니다.
+        """
+        channels = self.get_channel_names(inference_id, batch_id, user_id)
+        client = get_async_redis_client()
+        pubsub = client.pubsub()
+        try:
+            await pubsub.subscribe(*channels)
+            yield None
+            loop = asyncio.get_running_loop()
+            idle_since = loop.time()
+            while True:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+                if message and message["type"] == "message":
+                    idle_since = loop.time()
+                    yield json.loads(message["data"])
+                elif loop.time() - idle_since >= idle_timeout:
+                    idle_since = loop.time()
+                    yield None
+        finally:
+            try:
+                await pubsub.unsubscribe()
+                await pubsub.aclose()
+                await client.aclose()
+            except Exception as e:
+                logging.error(f"[ERROR] Failed to close subscription: {e}")
@@ -1,5 +1,5 @@
 import logging
-from typing import Dict
+from typing import BinaryIO, Dict, List, Optional, Tuple
 from abc import ABC, abstractmethod
 
 
@@ -8,11 +8,36 @@ class IObjectStorage(ABC):
     async def upload_file(self, file_name: str, file_data: bytes) -> Dict[str, str]:
         pass
 
+    @abstractmethod
+    async def upload_fileobj(
+        self, file_name: str, file_obj: BinaryIO, file_size: Optional[int] = None
+    ) -> Dict[str, str]:
+        """파일 객체를 청크 단위로 읽어 업로드합니다. (요청당 메모리 사용량이 파일 크기와 무관)"""
+        pass
+
+    @abstractmethod
+    async def delete_files(self, file_names: List[str]) -> int:
+        pass
+
+    @abstractmethod
+    async def list_objects(
+        self,
+        prefix: str,
+        continuation_token: Optional[str] = None,
+        max_keys: int = 1000,
+    ) -> Tuple[List[str], Optional[str]]:
+        """prefix로 시작하는 객체 키를 최대 max_keys개 반환합니다. 다음 페이지 토큰이 없으면 None"""
+        pass
+
 
+import asyncio
 import aioboto3
 from botocore.exceptions import BotoCoreError, ClientError
 from app.infrastructure.Environment import get_environment_variables
 
+# S3 멀티파트 업로드의 마지막 파트를 제외한 최소 파트 크기
+S3_MIN_PART_SIZE = 5 * 1024 * 1024
+
 
 class ZenkoObjectStorage(IObjectStorage):
     def __init__(self):
@@ -40,6 +65,103 @@ class ZenkoObjectStorage(IObjectStorage):
             logging.error(f"[ERROR] Failed to upload file: {e}")
             raise Exception(f"Failed to upload file: {str(e)}")
 
+    async def upload_parts(
+        self,
+        s3_client,
+        file_name: str,
+        upload_id: str,
+        file_obj: BinaryIO,
+        first_chunk: bytes,
+    ) -> List[Dict]:
+        # 파일 읽기는 순서대로, 파트 전송은 병렬로 수행
+        # 동시에 메모리에 올라가는 데이터는 최대 (동시 전송 수 x 파트 크기)
+        chunk_size = len(first_chunk)
+        read_lock = asyncio.Lock()
+        pending = [first_chunk]
+        next_part_number = 1
+        parts = []
+
+        async def read_chunk():
+            nonlocal next_part_number
+            async with read_lock:
+                chunk = (
+                    pending.pop()
+                    if pending
+                    else await asyncio.to_thread(file_obj.read, chunk_size)
+                )
+                part_number = next_part_number
+                next_part_number += 1
+                return part_number, chunk
+
+        async def upload_worker():
+            while True:
+                part_number, chunk = await read_chunk()
+                if not chunk:
+                    return
+                part = await s3_client.upload_part(
+                    Bucket=self.bucket_name,
+                    Key=file_name,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=chunk,
+                )
+                parts.append({"PartNumber": part_number, "ETag": part["ETag"]})
+
+        # 한 파트가 실패하면 TaskGroup이 나머지 전송을 취소하고 끝날 때까지 기다림
+        # (업로드 취소나 파일 정리 이후에 남은 파트가 올라가지 않도록)
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                for _ in range(max(1, self.env.S3_MULTIPART_CONCURRENCY)):
+                    task_group.create_task(upload_worker())
+        except BaseExceptionGroup as e:
+            raise e.exceptions[0]
+        return sorted(parts, key=lambda part: part["PartNumber"])
+
+    async def upload_fileobj(
+        self, file_name: str, file_obj: BinaryIO, file_size: Optional[int] = None
+    ) -> Dict[str, str]:
+        chunk_size = max(self.env.S3_MULTIPART_CHUNK_SIZE_BYTES, S3_MIN_PART_SIZE)
+        first_chunk = await asyncio.to_thread(file_obj.read, chunk_size)
+        if len(first_chunk) < chunk_size:
+            # 파트 하나에 들어가는 크기는 멀티파트 없이 한 번에 업로드
+            return await self.upload_file(file_name, first_chunk)
+
+        try:
+            async with self.session.client(
+                "s3",
+                aws_access_key_id=self.env.S3_SCALITY_ACCESS_KEY_ID,
+                aws_secret_access_key=self.env.S3_SCALITY_SECRET_ACCESS_KEY,
+                endpoint_url=f"http://{self.env.S3_SCALITY_HOSTNAME}:{self.env.S3_SCALITY_PORT}",
+            ) as s3_client:
+
+                multipart_upload = await s3_client.create_multipart_upload(
+                    Bucket=self.bucket_name, Key=file_name
+                )
+                upload_id = multipart_upload["UploadId"]
+                try:
+                    parts = await self.upload_parts(
+                        s3_client, file_name, upload_id, file_obj, first_chunk
+                    )
+                    await s3_client.complete_multipart_upload(
+                        Bucket=self.bucket_name,
+                        Key=file_name,
+                        UploadId=upload_id,
+                        MultipartUpload={"Parts": parts},
+                    )
+                except BaseException:
+                    # 완료되지 않은 파트가 버킷에 남지 않도록 업로드 취소
+                    await s3_client.abort_multipart_upload(
+                        Bucket=self.bucket_name, Key=file_name, UploadId=upload_id
+                    )
+                    raise
+                file_url = (
+                    f"{s3_client.meta.endpoint_url}/{self.bucket_name}/{file_name}"
+                )
+                return {"status": "success", "file_url": file_url}
+        except (BotoCoreError, ClientError) as e:
+            logging.error(f"[ERROR] Failed to upload file: {e}")
+            raise Exception(f"Failed to upload file: {str(e)}")
+
     async def download_file(self, file_path: str) -> bytes:
         try:
             async with self.session.client(
@@ -58,6 +180,225 @@ class ZenkoObjectStorage(IObjectStorage):
             logging.error(f"[ERROR] Failed to download file: {e}")
             raise Exception(f"Failed to download file: {str(e)}")
 
+    async def download_file_range(
+        self, file_path: str, offset: int, length: int
+    ) -> bytes:
+        # 여러 입력을 담은 객체에서 한 항목의 구간만 읽음
+        try:
+            async with self.session.client(
+                "s3",
+                aws_access_key_id=self.env.S3_SCALITY_ACCESS_KEY_ID,
+                aws_secret_access_key=self.env.S3_SCALITY_SECRET_ACCESS_KEY,
+                endpoint_url=f"http://{self.env.S3_SCALITY_HOSTNAME}:{self.env.S3_SCALITY_PORT}",
+            ) as s3_client:
+
+                response = await s3_client.get_object(
+                    Bucket=self.bucket_name,
+                    Key=file_path,
+                    Range=f"bytes={offset}-{offset + length - 1}",
+                )
+                file_data = await response["Body"].read()
+                return file_data
+        except (BotoCoreError, ClientError) as e:
+            logging.error(f"[ERROR] Failed to download file: {e}")
+            raise Exception(f"Failed to download file: {str(e)}")
+
+    async def delete_files(self, file_names: List[str]) -> int:
+        deleted_count = 0
+        try:
+            async with self.session.client(
+                "s3",
+                aws_access_key_id=self.env.S3_SCALITY_ACCESS_KEY_ID,
+                aws_secret_access_key=self.env.S3_SCALITY_SECRET_ACCESS_KEY,
+                endpoint_url=f"http://{self.env.S3_SCALITY_HOSTNAME}:{self.env.S3_SCALITY_PORT}",
+            ) as s3_client:
+
+                # DeleteObjects는 요청당 최대 1000개의 키만 허용
+                for i in range(0, len(file_names), 1000):
+                    keys = file_names[i : i + 1000]
+                    response = await s3_client.delete_objects(
+                        Bucket=self.bucket_name,
+                        Delete={
+                            "Objects": [{"Key": key} for key in keys],
+                            "Quiet": True,
+                        },
+                    )
+                    errors = response.get("Errors", [])
+                    for error in errors:
+                        logging.error(
+                            f"[ERROR] Failed to delete file: {error.get('Key')} {error.get('Message')}"
+                        )
+                    deleted_count += len(keys) - len(errors)
+                return deleted_count
+        except (BotoCoreError, ClientError) as e:
+            logging.error(f"[ERROR] Failed to delete files: {e}")
+            raise Exception(f"Failed to delete files: {str(e)}")
+
+    async def list_objects(
+        self,
+        prefix: str,
+        continuation_token: Optional[str] = None,
+        max_keys: int = 1000,
+    ) -> Tuple[List[str], Optional[str]]:
+        try:
+            async with self.session.client(
+                "s3",
+                aws_access_key_id=self.env.S3_SCALITY_ACCESS_KEY_ID,
+                aws_secret_access_key=self.env.S3_SCALITY_SECRET_ACCESS_KEY,
+                endpoint_url=f"http://{self.env.S3_SCALITY_HOSTNAME}:{self.env.S3_SCALITY_PORT}",
+            ) as s3_client:
+
+                # ListObjectsV2는 요청당 최대 1000개의 키만 반환
+                params = {
+                    "Bucket": self.bucket_name,
+                    "Prefix": prefix,
+                    "MaxKeys": min(max_keys, 1000),
+                }
+                if continuation_token:
+                    params["ContinuationToken"] = continuation_token
+                response = await s3_client.list_objects_v2(**params)
+                object_keys = [
+                    content["Key"]
+                    for content in response.get("Contents", [])
+                    if not content["Key"].endswith("/")
+                ]
+                if response.get("IsTruncated"):
+                    return object_keys, response["NextContinuationToken"]
+                return object_keys, None
+        except (BotoCoreError, ClientError) as e:
+            logging.error(f"[ERROR] Failed to list files: {e}")
+            raise Exception(f"Failed to list files: {str(e)}")
+
+
+import os
+import shutil
+
+
+class LocalObjectStorage(IObjectStorage):
+    """부하 테스트용 : 버킷을 로컬 디렉터리로 대신하는 저장소"""
+
+    def __init__(self):
+        self.env = get_environment_variables()
+        self.bucket_name = self.env.S3_SCALITY_BUCKET
+        self.root_dir = os.path.join(self.env.LOCAL_OBJECT_STORAGE_PATH, self.bucket_name)
+
+    def get_path(self, file_name: str) -> str:
+        path = os.path.abspath(os.path.join(self.root_dir, file_name))
+        if not path.startswith(os.path.abspath(self.root_dir) + os.sep):
+            raise Exception(f"Invalid file name: {file_name}")
+        return path
+
+    def write_file(self, file_name: str, file_data: bytes) -> str:
+        path = self.get_path(file_name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as file:
+            file.write(file_data)
+        return path
+
+    def write_fileobj(self, file_name: str, file_obj: BinaryIO) -> str:
+        path = self.get_path(file_name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as file:
+            shutil.copyfileobj(file_obj, file, self.env.S3_MULTIPART_CHUNK_SIZE_BYTES)
+        return path
+
+    def read_file(self, file_path: str) -> bytes:
+        with open(self.get_path(file_path), "rb") as file:
+            return file.read()
+
+    def read_file_range(self, file_path: str, offset: int, length: int) -> bytes:
+        with open(self.get_path(file_path), "rb") as file:
+            file.seek(offset)
+            return file.read(length)
+
+    def remove_files(self, file_names: List[str]) -> int:
+        deleted_count = 0
+        for file_name in file_names:
+            try:
+                os.remove(self.get_path(file_name))
+                deleted_count += 1
+            except FileNotFoundError:
+                # S3와 동일하게 없는 객체 삭제도 성공으로 처리
+                deleted_count += 1
+            except OSError as e:
+                logging.error(f"[ERROR] Failed to delete file: {file_name} {e}")
+        return deleted_count
+
+    async def upload_file(self, file_name: str, file_data: bytes) -> Dict[str, str]:
+        try:
+            path = await asyncio.to_thread(self.write_file, file_name, file_data)
+            return {"status": "success", "file_url": f"file://{path}"}
+        except OSError as e:
+            logging.error(f"[ERROR] Failed to upload file: {e}")
+            raise Exception(f"Failed to upload file: {str(e)}")
+
+    async def upload_fileobj(
+        self, file_name: str, file_obj: BinaryIO, file_size: Optional[int] = None
+    ) -> Dict[str, str]:
+        try:
+            path = await asyncio.to_thread(self.write_fileobj, file_name, file_obj)
+            return {"status": "success", "file_url": f"file://{path}"}
+        except OSError as e:
+            logging.error(f"[ERROR] Failed to upload file: {e}")
+            raise Exception(f"Failed to upload file: {str(e)}")
+
+    async def download_file(self, file_path: str) -> bytes:
+        try:
+            return await asyncio.to_thread(self.read_file, file_path)
+        except OSError as e:
+            logging.error(f"[ERROR] Failed to download file: {e}")
+            raise Exception(f"Failed to download file: {str(e)}")
+
+    async def download_file_range(
+        self, file_path: str, offset: int, length: int
+    ) -> bytes:
+        try:
+            return await asyncio.to_thread(
+                self.read_file_range, file_path, offset, length
+            )
+        except OSError as e:
+            logging.error(f"[ERROR] Failed to download file: {e}")
+            raise Exception(f"Failed to download file: {str(e)}")
+
+    async def delete_files(self, file_names: List[str]) -> int:
+        return await asyncio.to_thread(self.remove_files, file_names)
+
+    def find_object_keys(
+        self, prefix: str, start_after: Optional[str], max_keys: int
+    ) -> Tuple[List[str], Optional[str]]:
+        # S3와 같이 키 순서로 나열하고, 마지막 키를 다음 페이지 토큰으로 사용
+        root_dir = os.path.abspath(self.root_dir)
+        search_dir = os.path.abspath(os.path.join(root_dir, os.path.dirname(prefix)))
+        if search_dir != root_dir and not search_dir.startswith(root_dir + os.sep):
+            raise Exception(f"Invalid prefix: {prefix}")
+        object_keys = []
+        for dir_path, _, file_names in os.walk(search_dir):
+            for file_name in file_names:
+                object_key = os.path.relpath(
+                    os.path.join(dir_path, file_name), root_dir
+                ).replace(os.sep, "/")
+                if object_key.startswith(prefix) and (
+                    start_after is None or object_key > start_after
+                ):
+                    object_keys.append(object_key)
+        object_keys.sort()
+        if len(object_keys) > max_keys:
+            return object_keys[:max_keys], object_keys[max_keys - 1]
+        return object_keys, None
+
+    async def list_objects(
+        self,
+        prefix: str,
+        continuation_token: Optional[str] = None,
+        max_keys: int = 1000,
+    ) -> Tuple[List[str], Optional[str]]:
+        try:
+            return await asyncio.to_thread(
+                self.find_object_keys, prefix, continuation_token, max(1, max_keys)
+            )
+        except OSError as e:
+            logging.error(f"[ERROR] Failed to list files: {e}")
+            raise Exception(f"Failed to list files: {str(e)}")
 
 """
 class ZenkoObjectStorage(IObjectStorage):
@@ -1,88 +1,947 @@
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Dict, List, Optional
+import asyncio
 import logging
 
+# 앞에 있는 우선순위 클래스가 비어 있을 때만 다음 클래스를 꺼냄
+PRIORITY_CLASSES = ("interactive", "batch")
+
+
+def get_message_priority(message: Dict) -> str:
+    priority = message.get("priority")
+    if priority not in PRIORITY_CLASSES:
+        priority = "batch" if message.get("batch_id") else "interactive"
+    return priority
+
 
 class IQueue(ABC):
+    # 네트워크/디스크 왕복이 있어 워커가 스레드에서 호출해야 하는지 여부
+    blocking_io = True
+    # 확인하지 않은 메시지를 큐가 다시 전달하는지 여부
+    redelivers_unacked = False
+
+    @abstractmethod
+    def enqueue_message(self, message: Dict, inference_engine: str) -> None:
+        pass
+
+    def enqueue_messages(self, messages: List[Dict], inference_engine: str) -> None:
+        """여러 메시지를 한 번에 추가합니다. 기본 구현은 메시지마다 enqueue_message 호출"""
+        for message in messages:
+            self.enqueue_message(message, inference_engine)
+
+    @abstractmethod
+    def dequeue_messages(self, inference_engine: str, max_count: int) -> List[Dict]:
+        pass
+
+    def dequeue_message(self, inference_engine: str) -> Dict:
+        messages = self.dequeue_messages(inference_engine, 1)
+        return messages[0] if messages else {}
+
+    async def wait_for_message(self, inference_engine: str, timeout: float) -> None:
+        """대기열이 비었을 때 워커가 다시 꺼내기 전까지 기다립니다. 기본 구현은 폴링 간격만큼 대기"""
+        await asyncio.sleep(timeout)
+
     @abstractmethod
-    async def enqueue_message(self, message: Dict) -> None:
+    def ack_messages(self, messages: List[Dict]) -> None:
         pass
 
     @abstractmethod
-    async def process_message(self) -> None:
+    def get_queue_length(self, inference_engine: str) -> int:
         pass
 
+    @abstractmethod
+    def get_message_by_inference_id(self, inference_id: str) -> Dict:
+        pass
+
+    @abstractmethod
+    def cancel(
+        self, inference_id: Optional[str] = None, batch_id: Optional[str] = None
+    ) -> int:
+        pass
 
+    @abstractmethod
+    def is_cancelled(self, message: Dict) -> bool:
+        pass
+
+
+from functools import lru_cache
 from pgmq_sqlalchemy import PGMQueue
+from sqlalchemy import text
 from app.infrastructure.Environment import get_environment_variables
 
 
+@lru_cache
+def get_pgmq() -> PGMQueue:
+    # 추론 로그와 같은 데이터베이스와 연결 풀을 사용
+    from app.infrastructure.Database import engine
+
+    pgmq = PGMQueue(engine=engine)
+    with pgmq.session_maker() as session:
+        session.execute(
+            text(
+                "CREATE TABLE IF NOT EXISTS inference_cancellation ("
+                "target_id TEXT PRIMARY KEY, "
+                "cancelled_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+            )
+        )
+        # 상태 조회가 큐 테이블을 모두 뒤지지 않도록 추론 ID별 큐와 메시지 ID를 기록
+        session.execute(
+            text(
+                "CREATE TABLE IF NOT EXISTS inference_queue_index ("
+                "inference_id TEXT PRIMARY KEY, "
+                "queue_name TEXT NOT NULL, "
+                "msg_id BIGINT NOT NULL)"
+            )
+        )
+        session.commit()
+    return pgmq
+
+
 class PGMQQueue(IQueue):
-    def __init__(self) -> None:
+    """Postgres pgmq 확장을 사용하는 큐
+
+    엔진과 우선순위 클래스마다 큐를 두고, 워커는 여러 메시지를 한 번에 읽습니다.
+    읽은 메시지는 visibility timeout 동안 다른 워커에게 보이지 않으며, 결과를 저장한 뒤
+    ack_messages로 아카이브합니다. 처리 중 워커가 종료되면 timeout 이후 다시 전달됩니다.
+    클래스 안에서는 FIFO이며 사용자별 공정 분배는 RedisQueue만 지원합니다.
+    """
+
+    created_queues = set()
+    # 가시성 제한 시간이 지나면 다시 전달하고, PGMQ_MAX_DELIVERIES를 넘으면 실패로 처리
+    redelivers_unacked = True
+
+    def __init__(self, pgmq: Optional[PGMQueue] = None) -> None:
         self.env = get_environment_variables()
-        self.database_url = f"{self.env.DATABASE_DIALECT}://{self.env.DATABASE_USERNAME}:{self.env.DATABASE_PASSWORD}@{self.env.DATABASE_HOSTNAME}:{self.env.DATABASE_PORT}/{self.env.DATABASE_NAME}"
+        self.pgmq = pgmq or get_pgmq()
+        self.visibility_timeout = self.env.PGMQ_VISIBILITY_TIMEOUT_SECONDS
+        self.max_deliveries = self.env.PGMQ_MAX_DELIVERIES
 
-        self.pgmq = PGMQueue(dsn=self.database_url)
-        self.pgmq.create_queue("inference_queue")
+    def get_queue_name(self, inference_engine: str, priority: str) -> str:
+        return f"inference_queue_{inference_engine}_{priority}"
 
-    def enqueue_message(self, message: Dict) -> None:
-        self.pgmq.send("inference_queue", message)
+    def ensure_queue(self, queue_name: str) -> None:
+        if queue_name in self.created_queues:
+            return
+        self.pgmq.create_queue(queue_name)
+        # 상태 조회와 취소가 큐 테이블 전체를 읽지 않도록 색인 추가
+        with self.pgmq.session_maker() as session:
+            for field in ("inference_id", "batch_id"):
+                session.execute(
+                    text(
+                        f"CREATE INDEX IF NOT EXISTS q_{queue_name}_{field}_idx "
+                        f"ON pgmq.q_{queue_name} ((message->>'{field}'))"
+                    )
+                )
+            session.commit()
+        self.created_queues.add(queue_name)
 
-    def process_message(self) -> None:
-        message = self.pgmq.read("inference_queue")
-        if message:
-            try:
-                logging.info(f"[LOG] Processing message: {message.message}")
-            finally:
-                self.pgmq.delete_message(message.id)
+    def get_inference_queue_names(self) -> List[str]:
+        return [
+            queue_name
+            for queue_name in self.pgmq.list_queues()
+            if queue_name.startswith("inference_queue_")
+        ]
+
+    @staticmethod
+    def index_messages(
+        session, queue_name: str, messages: List[Dict], msg_ids: List[int]
+    ) -> None:
+        session.execute(
+            text(
+                "INSERT INTO inference_queue_index (inference_id, queue_name, msg_id) "
+                "VALUES (:inference_id, :queue_name, :msg_id) "
+                "ON CONFLICT (inference_id) DO UPDATE "
+                "SET queue_name = EXCLUDED.queue_name, msg_id = EXCLUDED.msg_id"
+            ),
+            [
+                {
+                    "inference_id": message["inference_id"],
+                    "queue_name": queue_name,
+                    "msg_id": msg_id,
+                }
+                for message, msg_id in zip(messages, msg_ids)
+            ],
+        )
+
+    @staticmethod
+    def unindex_messages(session, queue_name: str, msg_ids: List[int]) -> None:
+        # 같은 추론 ID로 다시 넣은 메시지(cascade)의 색인은 지우지 않도록 메시지 ID로 삭제
+        session.execute(
+            text(
+                "DELETE FROM inference_queue_index "
+                "WHERE queue_name = :queue_name AND msg_id = ANY(:msg_ids)"
+            ),
+            {"queue_name": queue_name, "msg_ids": list(msg_ids)},
+        )
+
+    def enqueue_message(self, message: Dict, inference_engine: str) -> None:
+        inference_engine = message.get("inference_engine", inference_engine)
+        queue_name = self.get_queue_name(
+            inference_engine, get_message_priority(message)
+        )
+        self.ensure_queue(queue_name)
+        # 메시지와 색인을 한 트랜잭션으로 기록
+        with self.pgmq.session_maker() as session:
+            msg_id = self.pgmq.send(queue_name, message, session=session, commit=False)
+            self.index_messages(session, queue_name, [message], [msg_id])
+            session.commit()
+
+    def enqueue_messages(self, messages: List[Dict], inference_engine: str) -> None:
+        messages_by_queue: Dict[str, List[Dict]] = {}
+        for message in messages:
+            queue_name = self.get_queue_name(
+                message.get("inference_engine", inference_engine),
+                get_message_priority(message),
+            )
+            messages_by_queue.setdefault(queue_name, []).append(message)
+        for queue_name, queue_messages in messages_by_queue.items():
+            self.ensure_queue(queue_name)
+            with self.pgmq.session_maker() as session:
+                msg_ids = self.pgmq.send_batch(
+                    queue_name, queue_messages, session=session, commit=False
+                )
+                self.index_messages(session, queue_name, queue_messages, msg_ids)
+                session.commit()
+
+    def dequeue_messages(self, inference_engine: str, max_count: int) -> List[Dict]:
+        messages = []
+        for priority in PRIORITY_CLASSES:
+            if len(messages) >= max_count:
+                break
+            queue_name = self.get_queue_name(inference_engine, priority)
+            self.ensure_queue(queue_name)
+            queue_messages = self.pgmq.read_batch(
+                queue_name, max_count - len(messages), vt=self.visibility_timeout
+            )
+            for queue_message in queue_messages or []:
+                message = dict(queue_message.message)
+                message["queue_name"] = queue_name
+                message["queue_message_id"] = queue_message.msg_id
+                if queue_message.read_ct > self.max_deliveries:
+                    # 처리 중 반복해서 중단된 메시지는 워커가 처리하지 않고 실패로 기록한 뒤
+                    # 확인(보관)하도록 전달 횟수를 표시
+                    message["exceeded_deliveries"] = queue_message.read_ct - 1
+                messages.append(message)
+
+        # 워커가 메시지마다 조회하지 않도록 취소 여부를 한 번에 확인
+        cancelled_ids = self.find_cancelled_ids(
+            [
+                target_id
+                for message in messages
+                for target_id in (message.get("inference_id"), message.get("batch_id"))
+                if target_id
+            ]
+        )
+        for message in messages:
+            message["cancelled"] = bool(
+                {message.get("inference_id"), message.get("batch_id")} & cancelled_ids
+            )
+        return messages
+
+    def ack_messages(self, messages: List[Dict]) -> None:
+        message_ids: Dict[str, List[int]] = {}
+        for message in messages:
+            if message.get("queue_message_id") is not None:
+                message_ids.setdefault(message["queue_name"], []).append(
+                    message["queue_message_id"]
+                )
+        if not message_ids:
+            return
+        with self.pgmq.session_maker() as session:
+            for queue_name, msg_ids in message_ids.items():
+                self.pgmq.archive_batch(
+                    queue_name, msg_ids, session=session, commit=False
+                )
+                self.unindex_messages(session, queue_name, msg_ids)
+            session.commit()
+
+    def get_queue_length(self, inference_engine: str) -> int:
+        queue_length = 0
+        for priority in PRIORITY_CLASSES:
+            queue_name = self.get_queue_name(inference_engine, priority)
+            self.ensure_queue(queue_name)
+            queue_length += self.pgmq.metrics(queue_name).queue_length
+        return queue_length
+
+    def get_message_by_inference_id(self, inference_id: str) -> Dict:
+        with self.pgmq.session_maker() as session:
+            queue_index = session.execute(
+                text(
+                    "SELECT queue_name, msg_id FROM inference_queue_index "
+                    "WHERE inference_id = :inference_id"
+                ),
+                {"inference_id": inference_id},
+            ).first()
+            if queue_index is None:
+                return {}
+            message = session.execute(
+                text(
+                    f"SELECT message FROM pgmq.q_{queue_index.queue_name} "
+                    "WHERE msg_id = :msg_id"
+                ),
+                {"msg_id": queue_index.msg_id},
+            ).scalar()
+        return message or {}
+
+    def find_cancelled_ids(self, target_ids: List[str]) -> set:
+        if not target_ids:
+            return set()
+        with self.pgmq.session_maker() as session:
+            return set(
+                session.execute(
+                    text(
+                        "SELECT target_id FROM inference_cancellation "
+                        "WHERE target_id = ANY(:target_ids) "
+                        "AND cancelled_at > now() - interval '1 day'"
+                    ),
+                    {"target_ids": list(set(target_ids))},
+                ).scalars()
+            )
+
+    def cancel(
+        self, inference_id: Optional[str] = None, batch_id: Optional[str] = None
+    ) -> int:
+        """아직 읽히지 않은 메시지를 삭제하고, 이미 읽힌 메시지와 업로드 중인 ZIP을 위해 취소 표시를 남깁니다."""
+        target_ids = [target_id for target_id in (inference_id, batch_id) if target_id]
+        cancelled = 0
+        with self.pgmq.session_maker() as session:
+            session.execute(
+                text(
+                    "INSERT INTO inference_cancellation (target_id) VALUES (:target_id) "
+                    "ON CONFLICT (target_id) DO UPDATE SET cancelled_at = now()"
+                ),
+                [{"target_id": target_id} for target_id in target_ids],
+            )
+            session.execute(
+                text(
+                    "DELETE FROM inference_cancellation "
+                    "WHERE cancelled_at < now() - interval '1 day'"
+                )
+            )
+            for queue_name in self.get_inference_queue_names():
+                msg_ids = session.execute(
+                    text(
+                        f"DELETE FROM pgmq.q_{queue_name} WHERE vt <= clock_timestamp() "
+                        "AND (message->>'inference_id' = :inference_id "
+                        "OR message->>'batch_id' = :batch_id) RETURNING msg_id"
+                    ),
+                    {"inference_id": inference_id, "batch_id": batch_id},
+                ).scalars().all()
+                if msg_ids:
+                    self.unindex_messages(session, queue_name, msg_ids)
+                cancelled += len(msg_ids)
+            session.commit()
+        return cancelled
+
+    def is_cancelled(self, message: Dict) -> bool:
+        if "cancelled" in message:
+            return message["cancelled"]
+        target_ids = [
+            target_id
+            for target_id in (message.get("inference_id"), message.get("batch_id"))
+            if target_id
+        ]
+        return bool(self.find_cancelled_ids(target_ids))
 
 
 import json
-import redis
-from typing import Dict
-from app.infrastructure.Queue import IQueue
+from app.infrastructure.Queue import IQueue, get_message_priority
 from app.infrastructure.Environment import get_environment_variables
+from app.infrastructure.RedisClient import get_redis_client
+
+# 사용자별 리스트에 넣고, 처음 대기하는 사용자는 현재 가상 시간에서 시작
+ENQUEUE_SCRIPT = """
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+redis.call('LPUSH', KEYS[3], ARGV[1])
+redis.call('INCR', KEYS[5])
+redis.call('HSET', KEYS[6], ARGV[3], ARGV[4])
+if not redis.call('ZSCORE', KEYS[2], ARGV[3]) then
+    local vtime = tonumber(redis.call('GET', KEYS[4]) or '0')
+    redis.call('ZADD', KEYS[2], vtime, ARGV[3])
+end
+if KEYS[7] then
+    redis.call('SADD', KEYS[7], ARGV[1])
+    redis.call('EXPIRE', KEYS[7], ARGV[5])
+end
+"""
+
+# 우선순위 클래스 순서대로, 클래스 안에서는 가상 시간이 가장 작은 사용자의 가장 오래된 메시지를 꺼냄
+# 꺼낼 때마다 사용자의 가상 시간이 1 / weight 만큼 증가 (stride scheduling)
+# 취소되어 메시지 본문이 없는 항목은 가상 시간을 늘리지 않고 건너뜀
+# KEYS[1] : 메시지 해시, KEYS[2] : 사용자 가중치, KEYS[3..] : 대기열마다 users, vtime, length
+# ARGV[1] : 최대 개수, ARGV[2..] : 우선순위 순서의 대기열 이름
+# 사용자별 리스트 키는 users에서 꺼낸 뒤에야 알 수 있어 KEYS로 넘길 수 없으므로
+# Redis Cluster가 아닌 단일 노드(복제/Sentinel 포함)에서만 동작
+DEQUEUE_SCRIPT = """
+local max_count = tonumber(ARGV[1])
+local messages = {}
+for i = 2, #ARGV do
+    local prefix = ARGV[i]
+    local users_key = KEYS[(i - 2) * 3 + 3]
+    local vtime_key = KEYS[(i - 2) * 3 + 4]
+    local length_key = KEYS[(i - 2) * 3 + 5]
+    while #messages < max_count do
+        local head = redis.call('ZRANGE', users_key, 0, 0, 'WITHSCORES')
+        if #head == 0 then
+            break
+        end
+        local user_id = head[1]
+        local pass = tonumber(head[2])
+        local list_key = prefix .. ':user:' .. user_id
+        local inference_id = redis.call('RPOP', list_key)
+        local message = false
+        if inference_id then
+            message = redis.call('HGET', KEYS[1], inference_id)
+        end
+        if message then
+            redis.call('HDEL', KEYS[1], inference_id)
+            redis.call('DECR', length_key)
+            redis.call('SET', vtime_key, tostring(pass))
+            local weight = tonumber(redis.call('HGET', KEYS[2], user_id) or '1')
+            pass = pass + 1 / weight
+        end
+        if redis.call('LLEN', list_key) == 0 then
+            redis.call('ZREM', users_key, user_id)
+        else
+            redis.call('ZADD', users_key, pass, user_id)
+        end
+        if message then
+            table.insert(messages, message)
+        end
+    end
+end
+return messages
+"""
+
+# 메시지 본문을 지워 대기열에 남은 항목을 무효화 (리스트 항목은 꺼낼 때 건너뜀)
+# KEYS[1] : 메시지 해시, KEYS[i + 1] : ARGV[i] 메시지가 들어 있는 대기열의 length 키
+CANCEL_SCRIPT = """
+local cancelled = 0
+for i = 1, #ARGV do
+    if redis.call('HDEL', KEYS[1], ARGV[i]) == 1 then
+        redis.call('DECR', KEYS[i + 1])
+        cancelled = cancelled + 1
+    end
+end
+return cancelled
+"""
+
+
+def parse_user_weights(value: str) -> Dict[str, float]:
+    # "tenant_a=4,tenant_b=0.5"
+    user_weights = {}
+    for entry in value.split(","):
+        if "=" in entry:
+            user_id, weight = entry.split("=", 1)
+            if float(weight) > 0:
+                user_weights[user_id.strip()] = float(weight)
+    return user_weights
 
 
 class RedisQueue(IQueue):
+    """엔진별로 우선순위 클래스를 두고, 클래스 안에서는 사용자 간 가중 공정 분배로 꺼내는 큐
+
+    대용량 ZIP을 올린 사용자가 있어도 단일 이미지 요청은 batch 클래스보다 먼저 처리되며,
+    같은 클래스의 사용자들은 가중치 비율대로 번갈아 처리됩니다.
+    """
+
     def __init__(self):
         self.env = get_environment_variables()
-        self.client = redis.Redis(
-            host=self.env.REDIS_HOST,
-            port=self.env.REDIS_PORT,
-            db=self.env.REDIS_DB,
-            password=self.env.REDIS_PASSWORD,
-        )
+        self.client = get_redis_client()
         self.hash_name = "inference_hash"
+        self.weights_hash_name = "inference_user_weights"
+        self.user_weights = parse_user_weights(self.env.QUEUE_USER_WEIGHTS)
+        # 배치 색인과 취소 표시는 배치가 모두 처리될 만큼 충분히 보관
+        self.cancel_ttl_seconds = 86400
+        self.cancel_chunk_size = 1000
+        self.enqueue_script = self.client.register_script(ENQUEUE_SCRIPT)
+        self.dequeue_script = self.client.register_script(DEQUEUE_SCRIPT)
+        self.cancel_script = self.client.register_script(CANCEL_SCRIPT)
+        self.migrated_engines = set()
 
-    def get_queue_name(self, inference_engine: str) -> str:
+    def get_queue_name(self, inference_engine: str, priority: str) -> str:
+        return f"inference_queue_{inference_engine}:{priority}"
+
+    def get_legacy_queue_name(self, inference_engine: str) -> str:
+        # 우선순위 클래스 도입 전의 단일 리스트
         return f"inference_queue_{inference_engine}"
 
+    def migrate_legacy_queue(self, inference_engine: str) -> int:
+        """이전 버전의 단일 리스트에 남은 메시지를 우선순위 대기열로 옮깁니다."""
+        legacy_name = self.get_legacy_queue_name(inference_engine)
+        lock_name = f"{legacy_name}:migrating"
+        migrated = 0
+        # 여러 워커가 동시에 옮겨 길이가 중복으로 늘지 않도록 한 곳에서만 수행
+        if self.client.set(lock_name, 1, nx=True, ex=60):
+            try:
+                while (inference_id := self.client.lindex(legacy_name, -1)) is not None:
+                    message_data = self.client.hget(self.hash_name, inference_id)
+                    # 새 대기열에 넣은 뒤 리스트에서 빼므로 중간에 중단되어도 유실되지 않음
+                    # (중복 항목은 본문이 먼저 꺼내져 지워지므로 꺼낼 때 건너뜀)
+                    if message_data:
+                        self.call_enqueue_script(json.loads(message_data))
+                        migrated += 1
+                    self.client.rpop(legacy_name)
+            finally:
+                self.client.delete(lock_name)
+            if migrated:
+                logging.info(
+                    f"[LOG] Migrated legacy queue : {legacy_name} ({migrated})"
+                )
+        self.migrated_engines.add(inference_engine)
+        return migrated
+
+    def get_batch_index_name(self, batch_id: str) -> str:
+        return f"inference_batch:{batch_id}"
+
+    def get_cancel_marker_name(self, target_id: str) -> str:
+        return f"inference_cancelled:{target_id}"
+
     def enqueue_message(self, message: Dict, inference_engine: str) -> None:
-        inference_id = message["inference_id"]
-        inference_engine = message.get("inference_engine", "default")
+        self.call_enqueue_script(message)
 
-        queue_name = self.get_queue_name(inference_engine)
+    def enqueue_messages(self, messages: List[Dict], inference_engine: str) -> None:
+        # 스크립트 호출을 파이프라인으로 묶어 왕복 한 번에 추가
+        pipeline = self.client.pipeline(transaction=False)
+        for message in messages:
+            self.call_enqueue_script(message, pipeline)
+        pipeline.execute()
 
-        self.client.lpush(queue_name, inference_id)
+    def call_enqueue_script(self, message: Dict, client=None) -> None:
+        inference_id = message["inference_id"]
+        inference_engine = message.get("inference_engine", "default")
+        user_id = message.get("user_id", "")
+        batch_id = message.get("batch_id")
 
-        self.client.hset(self.hash_name, inference_id, json.dumps(message))
+        queue_name = self.get_queue_name(inference_engine, get_message_priority(message))
+        keys = [
+            self.hash_name,
+            f"{queue_name}:users",
+            f"{queue_name}:user:{user_id}",
+            f"{queue_name}:vtime",
+            f"{queue_name}:length",
+            self.weights_hash_name,
+        ]
+        if batch_id:
+            # 배치 단위 취소 시 대기 중인 항목을 찾기 위한 색인
+            keys.append(self.get_batch_index_name(batch_id))
+        self.enqueue_script(
+            keys=keys,
+            args=[
+                inference_id,
+                json.dumps(message),
+                user_id,
+                self.user_weights.get(user_id, 1.0),
+                self.cancel_ttl_seconds,
+            ],
+            client=client,
+        )
 
-    def dequeue_message(self, inference_engine: str) -> Dict:
-        queue_name = self.get_queue_name(inference_engine)
-        inference_id = self.client.rpop(queue_name)
-        if inference_id:
-            inference_id = inference_id.decode("utf-8")
+    def dequeue_messages(self, inference_engine: str, max_count: int) -> List[Dict]:
+        if inference_engine not in self.migrated_engines:
+            self.migrate_legacy_queue(inference_engine)
+        queue_names = [
+            self.get_queue_name(inference_engine, priority)
+            for priority in PRIORITY_CLASSES
+        ]
+        message_data = self.dequeue_script(
+            keys=[self.hash_name, self.weights_hash_name]
+            + [
+                f"{queue_name}:{suffix}"
+                for queue_name in queue_names
+                for suffix in ("users", "vtime", "length")
+            ],
+            args=[max_count] + queue_names,
+        )
+        return [json.loads(message) for message in message_data]
 
-            message_data = self.client.hget(self.hash_name, inference_id)
-            if message_data:
+    def ack_messages(self, messages: List[Dict]) -> None:
+        # 꺼낼 때 이미 삭제되므로 확인할 것이 없음
+        pass
 
-                self.client.hdel(self.hash_name, inference_id)
-                return json.loads(message_data)
-        return {}
+    def get_queue_length(self, inference_engine: str) -> int:
+        lengths = self.client.mget(
+            [
+                f"{self.get_queue_name(inference_engine, priority)}:length"
+                for priority in PRIORITY_CLASSES
+            ]
+        )
+        return sum(max(int(length), 0) for length in lengths if length)
 
     def get_message_by_inference_id(self, inference_id: str) -> Dict:
         message_data = self.client.hget(self.hash_name, inference_id)
         if message_data:
             return json.loads(message_data)
         return {}
+
+    def cancel(
+        self, inference_id: Optional[str] = None, batch_id: Optional[str] = None
+    ) -> int:
+        """대기 중인 메시지를 취소하고 취소된 개수를 반환합니다.
+
+        이미 워커가 꺼낸 메시지와 아직 대기열에 들어오지 않은 ZIP 이미지도
+        건너뛸 수 있도록 취소 표시를 남깁니다.
+        """
+        target_ids = [target_id for target_id in (inference_id, batch_id) if target_id]
+        pipeline = self.client.pipeline(transaction=False)
+        for target_id in target_ids:
+            pipeline.set(
+                self.get_cancel_marker_name(target_id), 1, ex=self.cancel_ttl_seconds
+            )
+        pipeline.execute()
+
+        inference_ids = [inference_id] if inference_id else []
+        if batch_id:
+            batch_index_name = self.get_batch_index_name(batch_id)
+            inference_ids.extend(
+                member.decode("utf-8")
+                for member in self.client.smembers(batch_index_name)
+            )
+            self.client.delete(batch_index_name)
+
+        cancelled = 0
+        for start in range(0, len(inference_ids), self.cancel_chunk_size):
+            cancelled += self.cancel_messages(
+                inference_ids[start : start + self.cancel_chunk_size]
+            )
+        return cancelled
+
+    def cancel_messages(self, inference_ids: List[str]) -> int:
+        keys = [self.hash_name]
+        args = []
+        for inference_id, message_data in zip(
+            inference_ids, self.client.hmget(self.hash_name, inference_ids)
+        ):
+            if not message_data:
+                continue
+            message = json.loads(message_data)
+            queue_name = self.get_queue_name(
+                message.get("inference_engine", "default"), get_message_priority(message)
+            )
+            keys.append(f"{queue_name}:length")
+            args.append(inference_id)
+        if not args:
+            return 0
+        return int(self.cancel_script(keys=keys, args=args))
+
+    def is_cancelled(self, message: Dict) -> bool:
+        target_ids = [
+            target_id
+            for target_id in (message.get("inference_id"), message.get("batch_id"))
+            if target_id
+        ]
+        if not target_ids:
+            return False
+        return (
+            self.client.exists(
+                *[self.get_cancel_marker_name(target_id) for target_id in target_ids]
+            )
+            > 0
+        )
+
+
+import os
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from app.infrastructure.Queue import IQueue, get_message_priority
+
+
+class InMemoryQueue(IQueue):
+    """API와 워커가 같은 프로세스에서 실행되는 단일 노드 설치용 메모리 큐
+
+    RedisQueue와 같은 우선순위 클래스와 사용자별 가중 공정 분배를 제공하며,
+    메시지가 들어오면 기다리던 워커를 바로 깨워 폴링 지연이 없습니다.
+    journal_path를 지정하면 추가/확인/취소 기록을 JSONL로 남기고,
+    재시작 시 확인되지 않은 메시지를 다시 대기열에 넣습니다.
+    확인은 추가할 때 부여한 메시지 ID로 기록하므로, 같은 추론 ID로 다시 넣은
+    메시지(cascade)는 원래 메시지를 확인해도 남아 있습니다.
+    """
+
+    blocking_io = False
+
+    def __init__(self, journal_path: Optional[str] = None):
+        self.env = get_environment_variables()
+        # API는 이벤트 루프에서, 워커는 스레드에서도 호출할 수 있으므로 잠금으로 보호
+        self.lock = threading.Lock()
+        self.messages: Dict[str, Dict] = {}
+        self.message_ids: Dict[str, int] = {}
+        self.last_message_id = 0
+        self.unacked: Dict[int, Dict] = {}
+        self.user_queues: Dict[tuple, Dict[str, deque]] = {}
+        self.user_passes: Dict[tuple, Dict[str, float]] = {}
+        self.vtimes: Dict[tuple, float] = {}
+        self.lengths: Dict[str, int] = {}
+        self.batch_index: Dict[str, set] = {}
+        self.cancel_markers: Dict[str, float] = {}
+        self.waiters: Dict[str, List[tuple]] = {}
+        self.user_weights = parse_user_weights(self.env.QUEUE_USER_WEIGHTS)
+        self.cancel_ttl_seconds = 86400
+        self.journal_path = journal_path
+        self.journal = None
+        self.journal_records = 0
+        self.journal_compact_threshold = 10000
+        if journal_path:
+            self.recover()
+
+    def push(self, message: Dict, message_id: Optional[int] = None) -> int:
+        inference_id = message["inference_id"]
+        inference_engine = message.get("inference_engine", "default")
+        user_id = message.get("user_id", "")
+        queue_key = (inference_engine, get_message_priority(message))
+        if message_id is None:
+            self.last_message_id += 1
+            message_id = self.last_message_id
+
+        self.messages[inference_id] = message
+        self.message_ids[inference_id] = message_id
+        users = self.user_queues.setdefault(queue_key, {})
+        passes = self.user_passes.setdefault(queue_key, {})
+        if user_id not in users:
+            # 처음 대기하는 사용자는 현재 가상 시간에서 시작
+            users[user_id] = deque()
+            passes[user_id] = self.vtimes.get(queue_key, 0.0)
+        users[user_id].append(inference_id)
+        self.lengths[inference_engine] = self.lengths.get(inference_engine, 0) + 1
+        if message.get("batch_id"):
+            self.batch_index.setdefault(message["batch_id"], set()).add(inference_id)
+        return message_id
+
+    def remove(self, inference_id: str) -> Optional[Dict]:
+        """대기열에서 뺀 메시지에 확인할 때 쓰는 메시지 ID를 붙여 반환합니다."""
+        message = self.messages.pop(inference_id, None)
+        if message is None:
+            return None
+        message_id = self.message_ids.pop(inference_id)
+        inference_engine = message.get("inference_engine", "default")
+        self.lengths[inference_engine] -= 1
+        batch_ids = self.batch_index.get(message.get("batch_id"))
+        if batch_ids is not None:
+            batch_ids.discard(inference_id)
+            if not batch_ids:
+                del self.batch_index[message["batch_id"]]
+        return {**message, "queue_message_id": message_id}
+
+    def enqueue_message(self, message: Dict, inference_engine: str) -> None:
+        with self.lock:
+            message_id = self.push(message)
+            self.write_journal(
+                {"op": "enqueue", "message_id": message_id, "message": message}
+            )
+            waiters = list(
+                self.waiters.get(message.get("inference_engine", "default"), [])
+            )
+        self.wake_waiters(waiters)
+
+    def enqueue_messages(self, messages: List[Dict], inference_engine: str) -> None:
+        inference_engines = set()
+        with self.lock:
+            for message in messages:
+                message_id = self.push(message)
+                self.write_journal(
+                    {"op": "enqueue", "message_id": message_id, "message": message}
+                )
+                inference_engines.add(message.get("inference_engine", "default"))
+            waiters = [
+                waiter
+                for engine in inference_engines
+                for waiter in self.waiters.get(engine, [])
+            ]
+        self.wake_waiters(waiters)
+
+    def dequeue_messages(self, inference_engine: str, max_count: int) -> List[Dict]:
+        messages = []
+        with self.lock:
+            for priority in PRIORITY_CLASSES:
+                queue_key = (inference_engine, priority)
+                users = self.user_queues.get(queue_key)
+                passes = self.user_passes.get(queue_key)
+                while users and len(messages) < max_count:
+                    # 가상 시간이 가장 작은 사용자의 가장 오래된 메시지 (stride scheduling)
+                    user_id = min(users, key=passes.__getitem__)
+                    user_queue = users[user_id]
+                    message = self.remove(user_queue.popleft())
+                    if message is not None:
+                        self.vtimes[queue_key] = passes[user_id]
+                        passes[user_id] += 1 / self.user_weights.get(user_id, 1.0)
+                        if self.journal:
+                            self.unacked[message["queue_message_id"]] = message
+                        messages.append(message)
+                    if not user_queue:
+                        del users[user_id]
+                        del passes[user_id]
+        return messages
+
+    def ack_messages(self, messages: List[Dict]) -> None:
+        if not self.journal:
+            return
+        with self.lock:
+            message_ids = [
+                message["queue_message_id"]
+                for message in messages
+                if message.get("queue_message_id") is not None
+            ]
+            for message_id in message_ids:
+                self.unacked.pop(message_id, None)
+            self.write_journal({"op": "ack", "message_ids": message_ids})
+
+    def get_queue_length(self, inference_engine: str) -> int:
+        return self.lengths.get(inference_engine, 0)
+
+    def get_message_by_inference_id(self, inference_id: str) -> Dict:
+        message = self.messages.get(inference_id)
+        return dict(message) if message else {}
+
+    def cancel(
+        self, inference_id: Optional[str] = None, batch_id: Optional[str] = None
+    ) -> int:
+        now = time.time()
+        with self.lock:
+            self.cancel_markers = {
+                target_id: expires_at
+                for target_id, expires_at in self.cancel_markers.items()
+                if expires_at > now
+            }
+            for target_id in (inference_id, batch_id):
+                if target_id:
+                    self.cancel_markers[target_id] = now + self.cancel_ttl_seconds
+
+            inference_ids = [inference_id] if inference_id else []
+            if batch_id:
+                inference_ids.extend(self.batch_index.get(batch_id, ()))
+            # 대기열의 항목은 꺼낼 때 건너뜀
+            cancelled_messages = [
+                message
+                for inference_id in inference_ids
+                if (message := self.remove(inference_id)) is not None
+            ]
+            if cancelled_messages:
+                self.write_journal(
+                    {
+                        "op": "ack",
+                        "message_ids": [
+                            message["queue_message_id"]
+                            for message in cancelled_messages
+                        ],
+                    }
+                )
+        return len(cancelled_messages)
+
+    def is_cancelled(self, message: Dict) -> bool:
+        now = time.time()
+        return any(
+            self.cancel_markers.get(target_id, 0) > now
+            for target_id in (message.get("inference_id"), message.get("batch_id"))
+            if target_id
+        )
+
+    async def wait_for_message(self, inference_engine: str, timeout: float) -> None:
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        waiter = (loop, event)
+        with self.lock:
+            if self.lengths.get(inference_engine):
+                return
+            self.waiters.setdefault(inference_engine, []).append(waiter)
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self.lock:
+                self.waiters[inference_engine].remove(waiter)
+
+    def wake_waiters(self, waiters: List[tuple]) -> None:
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        for loop, event in waiters:
+            if loop is running_loop:
+                event.set()
+            else:
+                loop.call_soon_threadsafe(event.set)
+
+    def write_journal(self, record: Dict) -> None:
+        if not self.journal:
+            return
+        self.journal.write(json.dumps(record) + "\n")
+        self.journal.flush()
+        if self.env.MEMORY_QUEUE_JOURNAL_FSYNC:
+            os.fsync(self.journal.fileno())
+        self.journal_records += 1
+        pending = len(self.messages) + len(self.unacked)
+        if self.journal_records > max(self.journal_compact_threshold, pending * 2):
+            self.compact_journal()
+
+    def compact_journal(self) -> None:
+        """확인된 기록을 지우고 대기 중이거나 처리 중인 메시지만으로 저널을 다시 작성"""
+        if self.journal:
+            self.journal.close()
+        temp_path = f"{self.journal_path}.tmp"
+        records = [
+            (message_id, message) for message_id, message in self.unacked.items()
+        ] + [
+            (self.message_ids[inference_id], message)
+            for inference_id, message in self.messages.items()
+        ]
+        with open(temp_path, "w", encoding="utf-8") as file:
+            for message_id, message in records:
+                message = {
+                    key: value
+                    for key, value in message.items()
+                    if key != "queue_message_id"
+                }
+                record = {"op": "enqueue", "message_id": message_id, "message": message}
+                file.write(json.dumps(record) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.journal_path)
+        self.journal = open(self.journal_path, "a", encoding="utf-8")
+        self.journal_records = len(self.unacked) + len(self.messages)
+
+    def recover(self) -> None:
+        pending: Dict = {}
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # 비정상 종료로 마지막 줄이 잘린 경우
+                        continue
+                    # 이전 형식의 저널은 메시지 ID 대신 추론 ID로 기록
+                    if record["op"] == "enqueue":
+                        message = record["message"]
+                        message_id = record.get("message_id", message["inference_id"])
+                        pending[message_id] = message
+                    elif record["op"] == "ack":
+                        for message_id in record.get(
+                            "message_ids", record.get("inference_ids", [])
+                        ):
+                            pending.pop(message_id, None)
+        # 같은 추론 ID로 다시 넣은 메시지가 있으면 마지막 메시지만 대기열에 넣음
+        latest: Dict[str, tuple] = {}
+        for message_id, message in pending.items():
+            latest.pop(message["inference_id"], None)
+            latest[message["inference_id"]] = (message_id, message)
+        pending = dict(latest.values())
+        self.last_message_id = max(
+            (message_id for message_id in pending if isinstance(message_id, int)),
+            default=0,
+        )
+        # 처리 중이던 메시지도 결과가 저장되지 않았으므로 다시 대기열에 넣음
+        for message_id, message in pending.items():
+            self.push(message, message_id if isinstance(message_id, int) else None)
+        os.makedirs(os.path.dirname(os.path.abspath(self.journal_path)), exist_ok=True)
+        self.compact_journal()
+        if pending:
+            logging.info(
+                f"[LOG] Recovered {len(pending)} queued messages from {self.journal_path}"
+            )
+
+
+@lru_cache
+def get_memory_queue() -> InMemoryQueue:
+    return InMemoryQueue(get_environment_variables().MEMORY_QUEUE_JOURNAL_PATH or None)
@@ -0,0 +1,42 @@
+from functools import lru_cache
+import redis
+import redis.asyncio as aioredis
+from app.infrastructure.Environment import get_environment_variables
+
+
+@lru_cache
+def get_fake_redis_server():
+    # 부하 테스트용 : 동기/비동기 클라이언트가 같은 메모리 저장소를 공유
+    import fakeredis
+
+    return fakeredis.FakeServer()
+
+
+@lru_cache
+def get_redis_client() -> redis.Redis:
+    env = get_environment_variables()
+    if env.REDIS_BACKEND == "fakeredis":
+        import fakeredis
+
+        return fakeredis.FakeRedis(server=get_fake_redis_server())
+    return redis.Redis(
+        host=env.REDIS_HOST,
+        port=env.REDIS_PORT,
+        db=env.REDIS_DB,
+        password=env.REDIS_PASSWORD,
+    )
+
+
+def get_async_redis_client() -> aioredis.Redis:
+    # 비동기 클라이언트는 이벤트 루프에 묶이므로 캐시하지 않음
+    env = get_environment_variables()
+    if env.REDIS_BACKEND == "fakeredis":
+        import fakeredis
+
+        return fakeredis.FakeAsyncRedis(server=get_fake_redis_server())
+    return aioredis.Redis(
+        host=env.REDIS_HOST,
+        port=env.REDIS_PORT,
+        db=env.REDIS_DB,
+        password=env.REDIS_PASSWORD,
+    )
@@ -0,0 +1,92 @@
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, Dict, Optional
+
+
+class IResultCache(ABC):
+    @abstractmethod
+    def get(self, inference_id: str) -> Optional[str]:
+        pass
+
+    @abstractmethod
+    def set(self, inference_id: str, result_json: str) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, inference_id: str) -> None:
+        pass
+
+    @abstractmethod
+    async def get_or_load(
+        self,
+        inference_id: str,
+        loader: Callable[[], Awaitable[Optional[str]]],
+    ) -> Optional[str]:
+        pass
+
+
+import asyncio
+
+
+class SingleFlight:
+    """같은 키에 대한 동시 조회를 하나의 작업으로 합쳐 결과를 공유합니다."""
+
+    def __init__(self):
+        self.calls: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, loader: Callable[[], Awaitable]):
+        task = self.calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(loader())
+            self.calls[key] = task
+            task.add_done_callback(lambda _: self.calls.pop(key, None))
+        # 먼저 요청한 클라이언트가 끊겨도 나머지 대기자는 결과를 받을 수 있도록 shield
+        return await asyncio.shield(task)
+
+
+from app.infrastructure.Environment import get_environment_variables
+from app.infrastructure.Metrics import RESULT_CACHE_REQUESTS
+from app.infrastructure.RedisClient import get_redis_client
+
+# 프로세스 단위로 공유되어야 하므로 인스턴스가 아닌 모듈 수준에 둠
+result_single_flight = SingleFlight()
+
+
+class RedisResultCache(IResultCache):
+    def __init__(self):
+        self.env = get_environment_variables()
+        self.client = get_redis_client()
+        self.ttl = self.env.RESULT_CACHE_TTL_SECONDS
+
+    def get_key(self, inference_id: str) -> str:
+        return f"inference_result:{inference_id}"
+
+    def get(self, inference_id: str) -> Optional[str]:
+        result_json = self.client.get(self.get_key(inference_id))
+        if result_json:
+            return result_json.decode("utf-8")
+        return None
+
+    def set(self, inference_id: str, result_json: str) -> None:
+        self.client.set(self.get_key(inference_id), result_json, ex=self.ttl)
+
+    def delete(self, inference_id: str) -> None:
+        self.client.delete(self.get_key(inference_id))
+
+    async def get_or_load(
+        self,
+        inference_id: str,
+        loader: Callable[[], Awaitable[Optional[str]]],
+    ) -> Optional[str]:
+        result_json = self.get(inference_id)
+        if result_json:
+            RESULT_CACHE_REQUESTS.labels("hit").inc()
+            return result_json
+        RESULT_CACHE_REQUESTS.labels("miss").inc()
+
+        async def load_and_store() -> Optional[str]:
+            loaded_json = await loader()
+            if loaded_json:
+                self.set(inference_id, loaded_json)
+            return loaded_json
+
+        return await result_single_flight.do(inference_id, load_and_store)
@@ -0,0 +1,156 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Tuple
+
+
+class ITensorShardStore(ABC):
+    @abstractmethod
+    def append(self, inference_id: str, tensor, shard_date: str) -> str:
+        """텐서를 현재 샤드에 추가하고 위치("{object_key}#{row}")를 반환합니다."""
+        pass
+
+    @abstractmethod
+    async def flush(self, force: bool = False) -> int:
+        pass
+
+    @abstractmethod
+    async def load_tensors(self, tensor_paths: List[str]) -> Dict[str, object]:
+        pass
+
+
+import asyncio
+import io
+import json
+import logging
+import time
+import uuid
+import numpy as np
+from app.infrastructure.Environment import get_environment_variables
+from app.infrastructure.ObjectStorage import IObjectStorage
+
+TENSOR_SHARD_PREFIX = "TENSOR_SHARDS/"
+
+
+def parse_tensor_path(tensor_path: str) -> Tuple[str, int]:
+    object_key, row = tensor_path.rsplit("#", 1)
+    return object_key, int(row)
+
+
+def read_npy_frames(object_data: bytes) -> np.ndarray:
+    """NPY 바이트를 복사 없이 (N, H, W, 3) 배열로 봅니다. (np.load보다 빠름)"""
+    stream = io.BytesIO(object_data)
+    version = np.lib.format.read_magic(stream)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(stream)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(stream)
+    if fortran_order or dtype.hasobject:
+        raise ValueError("unsupported tensor layout")
+    array = np.frombuffer(
+        object_data, dtype=dtype, count=int(np.prod(shape)), offset=stream.tell()
+    )
+    return array.reshape((-1,) + tuple(shape[-3:]))
+
+
+class TensorShard:
+    def __init__(self, object_key: str):
+        self.object_key = object_key
+        self.inference_ids: List[str] = []
+        self.tensors: List[np.ndarray] = []
+        self.created_at = time.monotonic()
+
+
+class ObjectStorageTensorShardStore(ITensorShardStore):
+    """전처리된 uint8 텐서를 날짜별 샤드로 묶어 객체 저장소에 저장합니다.
+
+    샤드는 (N, H, W, 3) NPY 파일 하나와 행 순서대로 추론 ID를 담은 JSON 색인으로 구성되어,
+    내려받은 뒤 np.load(mmap_mode="r")로 디코딩 없이 바로 읽을 수 있습니다.
+    """
+
+    def __init__(self, s3_client: IObjectStorage):
+        self.env = get_environment_variables()
+        self.s3_client = s3_client
+        self.max_frames = max(1, self.env.TENSOR_SHARD_MAX_FRAMES)
+        self.flush_seconds = max(1.0, self.env.TENSOR_SHARD_FLUSH_SECONDS)
+        # 여러 워커가 같은 날짜의 샤드를 동시에 써도 키가 겹치지 않도록 구분
+        self.writer_id = uuid.uuid4().hex[:12]
+        self.shard_sequence = 0
+        self.open_shards: Dict[str, TensorShard] = {}
+        self.sealed_shards: List[TensorShard] = []
+
+    def new_shard(self, shard_date: str) -> TensorShard:
+        self.shard_sequence += 1
+        shard_name = f"{self.writer_id}-{self.shard_sequence:06d}"
+        return TensorShard(f"{TENSOR_SHARD_PREFIX}{shard_date}/{shard_name}.npy")
+
+    def append(self, inference_id: str, tensor: np.ndarray, shard_date: str) -> str:
+        shard = self.open_shards.get(shard_date)
+        if shard is None or len(shard.tensors) >= self.max_frames:
+            if shard is not None:
+                self.sealed_shards.append(shard)
+            shard = self.open_shards[shard_date] = self.new_shard(shard_date)
+        shard.inference_ids.append(inference_id)
+        shard.tensors.append(tensor)
+        return f"{shard.object_key}#{len(shard.tensors) - 1}"
+
+    def seal_shards(self, force: bool) -> List[TensorShard]:
+        now = time.monotonic()
+        for shard_date, shard in list(self.open_shards.items()):
+            if (
+                force
+                or len(shard.tensors) >= self.max_frames
+                or now - shard.created_at >= self.flush_seconds
+            ):
+                self.sealed_shards.append(self.open_shards.pop(shard_date))
+        sealed_shards, self.sealed_shards = self.sealed_shards, []
+        return sealed_shards
+
+    @staticmethod
+    def serialize_shard(shard: TensorShard) -> Tuple[bytes, bytes]:
+        buffer = io.BytesIO()
+        np.save(buffer, np.stack(shard.tensors))
+        index = json.dumps({"inference_ids": shard.inference_ids}).encode("utf-8")
+        return buffer.getvalue(), index
+
+    async def flush(self, force: bool = False) -> int:
+        """가득 찼거나 오래된 샤드를 업로드하고, 업로드한 샤드 수를 반환합니다."""
+        uploaded = 0
+        for shard in self.seal_shards(force):
+            try:
+                shard_data, index_data = await asyncio.to_thread(
+                    self.serialize_shard, shard
+                )
+                await self.s3_client.upload_file(shard.object_key, shard_data)
+                await self.s3_client.upload_file(
+                    shard.object_key.removesuffix(".npy") + ".json", index_data
+                )
+                uploaded += 1
+            except Exception as e:
+                # 원본 이미지가 남아 있으므로 샤드 유실은 재추론 시 디코딩 비용만 늘어남
+                logging.error(
+                    f"[ERROR] Failed to upload tensor shard {shard.object_key}: {e}"
+                )
+        return uploaded
+
+    async def load_tensors(self, tensor_paths: List[str]) -> Dict[str, np.ndarray]:
+        """텐서 위치를 객체별로 묶어 한 번씩만 내려받고, 위치별 (H, W, 3) 텐서를 반환합니다.
+
+        샤드와 /tensor-classify로 올라온 TENSORS/ 객체 모두 같은 형식으로 읽습니다.
+        읽지 못한 객체의 위치는 결과에서 빠지므로 호출 측은 원본 이미지를 사용하면 됩니다.
+        """
+        rows_by_key: Dict[str, List[Tuple[str, int]]] = {}
+        for tensor_path in tensor_paths:
+            object_key, row = parse_tensor_path(tensor_path)
+            rows_by_key.setdefault(object_key, []).append((tensor_path, row))
+
+        tensors = {}
+        for object_key, rows in rows_by_key.items():
+            try:
+                object_data = await self.s3_client.download_file(object_key)
+                frames = read_npy_frames(object_data)
+            except Exception as e:
+                logging.error(f"[ERROR] Failed to load tensor shard {object_key}: {e}")
+                continue
+            for tensor_path, row in rows:
+                if row < len(frames):
+                    tensors[tensor_path] = frames[row]
+        return tensors
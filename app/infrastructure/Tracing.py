@@ -0,0 +1,329 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+
+class ITraceExporter(ABC):
+    @abstractmethod
+    def export(self, spans: List[Dict]) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+import atexit
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+
+class NoopTraceExporter(ITraceExporter):
+    def export(self, spans: List[Dict]) -> None:
+        pass
+
+
+class InMemoryTraceExporter(ITraceExporter):
+    """테스트에서 수집기 대신 사용하는 메모리 저장소"""
+
+    def __init__(self, max_spans: int = 10000):
+        self.spans = deque(maxlen=max_spans)
+
+    def export(self, spans: List[Dict]) -> None:
+        self.spans.extend(spans)
+
+
+class FileTraceExporter(ITraceExporter):
+    """OTLP/JSON 형식으로 한 줄씩 기록하므로 OpenTelemetry Collector의 otlpjsonfile 수신기로 읽을 수 있음"""
+
+    def __init__(self, file_path: str, service_name: str, flush_interval: float = 1.0):
+        self.file = open(file_path, "a", encoding="utf-8")
+        self.service_name = service_name
+        self.flush_interval = flush_interval
+        self.last_flush = time.monotonic()
+        self.lock = threading.Lock()
+        # 이후 export가 없어도 버퍼에 남은 스팬이 기록되도록 주기적으로 flush하고,
+        # 종료 시 남은 스팬을 기록 (API는 lifespan 종료 시에도 flush)
+        self.closed = threading.Event()
+        threading.Thread(
+            target=self.flush_periodically, name="trace-flush", daemon=True
+        ).start()
+        atexit.register(self.close)
+
+    def flush_periodically(self) -> None:
+        while not self.closed.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        with self.lock:
+            if not self.file.closed:
+                self.file.flush()
+                self.last_flush = time.monotonic()
+
+    def close(self) -> None:
+        with self.lock:
+            self.closed.set()
+            if not self.file.closed:
+                self.file.close()
+
+    def to_otlp_span(self, span: Dict) -> Dict:
+        otlp_span = {
+            "traceId": span["trace_id"],
+            "spanId": span["span_id"],
+            "name": span["name"],
+            "kind": 1,
+            "startTimeUnixNano": str(span["start_time_ns"]),
+            "endTimeUnixNano": str(span["end_time_ns"]),
+            "attributes": [
+                {"key": key, "value": {"stringValue": str(value)}}
+                for key, value in span["attributes"].items()
+            ],
+            "status": {"code": 2 if span["status"] == "error" else 1},
+        }
+        if span["parent_span_id"]:
+            otlp_span["parentSpanId"] = span["parent_span_id"]
+        return otlp_span
+
+    def export(self, spans: List[Dict]) -> None:
+        line = json.dumps(
+            {
+                "resourceSpans": [
+                    {
+                        "resource": {
+                            "attributes": [
+                                {
+                                    "key": "service.name",
+                                    "value": {"stringValue": self.service_name},
+                                }
+                            ]
+                        },
+                        "scopeSpans": [
+                            {
+                                "scope": {"name": "app"},
+                                "spans": [self.to_otlp_span(span) for span in spans],
+                            }
+                        ],
+                    }
+                ]
+            }
+        )
+        with self.lock:
+            if self.file.closed:
+                return
+            self.file.write(line + "\n")
+            if time.monotonic() - self.last_flush >= self.flush_interval:
+                self.file.flush()
+                self.last_flush = time.monotonic()
+
+
+import contextvars
+import os
+import random
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator, NamedTuple, Optional, Union
+
+
+class SpanContext(NamedTuple):
+    trace_id: str
+    span_id: str
+    sampled: bool
+
+
+current_span_context: contextvars.ContextVar[Optional[SpanContext]] = (
+    contextvars.ContextVar("current_span_context", default=None)
+)
+
+
+def format_traceparent(context: SpanContext) -> str:
+    return f"00-{context.trace_id}-{context.span_id}-{'01' if context.sampled else '00'}"
+
+
+def parse_traceparent(traceparent: Optional[str]) -> Optional[SpanContext]:
+    # W3C Trace Context : version-trace_id-parent_id-flags
+    try:
+        _, trace_id, span_id, flags = traceparent.split("-")
+        if len(trace_id) != 32 or len(span_id) != 16:
+            return None
+        return SpanContext(trace_id, span_id, int(flags, 16) & 1 == 1)
+    except (AttributeError, ValueError):
+        return None
+
+
+class Span:
+    def __init__(
+        self,
+        name: str,
+        context: SpanContext,
+        parent_span_id: Optional[str],
+        start_time_ns: int,
+        attributes: Optional[Dict] = None,
+    ):
+        self.name = name
+        self.context = context
+        self.parent_span_id = parent_span_id
+        self.start_time_ns = start_time_ns
+        self.end_time_ns = start_time_ns
+        self.attributes = dict(attributes or {})
+        self.status = "ok"
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict:
+        return {
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "start_time_ns": self.start_time_ns,
+            "end_time_ns": self.end_time_ns,
+            "duration_ms": (self.end_time_ns - self.start_time_ns) / 1e6,
+            "attributes": self.attributes,
+            "status": self.status,
+        }
+
+
+class Tracer:
+    def __init__(
+        self,
+        exporter: ITraceExporter,
+        sample_ratio: float = 1.0,
+        recent_limit: int = 200,
+        max_spans_per_trace: int = 1000,
+    ):
+        self.exporter = exporter
+        self.sample_ratio = sample_ratio
+        self.recent_limit = recent_limit
+        self.max_spans_per_trace = max_spans_per_trace
+        self.recent_traces: "OrderedDict[str, List[Dict]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def resolve_parent(
+        self, parent: Union[SpanContext, str, None]
+    ) -> Optional[SpanContext]:
+        if isinstance(parent, str):
+            return parse_traceparent(parent)
+        return parent or current_span_context.get()
+
+    def new_context(self, parent: Optional[SpanContext]) -> SpanContext:
+        if parent:
+            return SpanContext(parent.trace_id, os.urandom(8).hex(), parent.sampled)
+        return SpanContext(
+            os.urandom(16).hex(),
+            os.urandom(8).hex(),
+            random.random() < self.sample_ratio,
+        )
+
+    def begin_span(
+        self,
+        name: str,
+        parent: Union[SpanContext, str, None] = None,
+        attributes: Optional[Dict] = None,
+    ) -> Span:
+        """여러 단계에 걸쳐 열려 있는 스팬을 시작합니다. end_span으로 종료해야 합니다."""
+        parent_context = self.resolve_parent(parent)
+        return Span(
+            name,
+            self.new_context(parent_context),
+            parent_context.span_id if parent_context else None,
+            time.time_ns(),
+            attributes,
+        )
+
+    def end_span(self, span: Span, error: Optional[Exception] = None) -> None:
+        if error is not None:
+            span.status = "error"
+            span.set_attribute("error", str(error))
+        span.end_time_ns = time.time_ns()
+        self.record(span)
+
+    @contextmanager
+    def start_span(
+        self,
+        name: str,
+        parent: Union[SpanContext, str, None] = None,
+        attributes: Optional[Dict] = None,
+    ) -> Iterator[Span]:
+        span = self.begin_span(name, parent, attributes)
+        token = current_span_context.set(span.context)
+        error = None
+        try:
+            yield span
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            current_span_context.reset(token)
+            self.end_span(span, error)
+
+    def record_span(
+        self,
+        name: str,
+        start_time_ns: int,
+        end_time_ns: int,
+        parent: Union[SpanContext, str, None] = None,
+        attributes: Optional[Dict] = None,
+    ) -> None:
+        """큐 대기 시간처럼 이미 지나간 구간을 스팬으로 기록합니다."""
+        parent_context = self.resolve_parent(parent)
+        span = Span(
+            name,
+            self.new_context(parent_context),
+            parent_context.span_id if parent_context else None,
+            start_time_ns,
+            attributes,
+        )
+        span.end_time_ns = max(end_time_ns, start_time_ns)
+        self.record(span)
+
+    def get_traceparent(self) -> Optional[str]:
+        context = current_span_context.get()
+        return format_traceparent(context) if context else None
+
+    def record(self, span: Span) -> None:
+        if not span.context.sampled:
+            return
+        span_data = span.to_dict()
+        with self.lock:
+            spans = self.recent_traces.get(span.context.trace_id)
+            if spans is None:
+                spans = self.recent_traces[span.context.trace_id] = []
+                while len(self.recent_traces) > self.recent_limit:
+                    self.recent_traces.popitem(last=False)
+            if len(spans) < self.max_spans_per_trace:
+                spans.append(span_data)
+        try:
+            self.exporter.export([span_data])
+        except Exception as e:
+            logging.error(f"[ERROR] Failed to export span: {e}")
+
+    def flush(self) -> None:
+        try:
+            self.exporter.flush()
+        except Exception as e:
+            logging.error(f"[ERROR] Failed to flush spans: {e}")
+
+    def get_slowest_traces(self, limit: int = 10) -> List[Dict]:
+        with self.lock:
+            traces = [(trace_id, list(spans)) for trace_id, spans in self.recent_traces.items()]
+        summaries = []
+        for trace_id, spans in traces:
+            start_time_ns = min(span["start_time_ns"] for span in spans)
+            end_time_ns = max(span["end_time_ns"] for span in spans)
+            root = next((span for span in spans if not span["parent_span_id"]), spans[0])
+            summaries.append(
+                {
+                    "trace_id": trace_id,
+                    "root": root["name"],
+                    "duration_ms": (end_time_ns - start_time_ns) / 1e6,
+                    "span_count": len(spans),
+                    "spans": sorted(spans, key=lambda span: span["start_time_ns"]),
+                }
+            )
+        summaries.sort(key=lambda summary: summary["duration_ms"], reverse=True)
+        return summaries[:limit]
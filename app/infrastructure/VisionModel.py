@@ -15,11 +15,21 @@ class IVisionModel(ABC):
     def get_top_k_predictions(self, output, ks) -> dict:
         pass
 
+    # 디코딩/리사이즈만 수행한 uint8 RGB (H, W, 3) 텐서를 반환
+    @abstractmethod
+    def decode_image(self, image_data: bytes):
+        pass
+
+    # uint8 RGB (N, H, W, 3) 텐서 배치를 받아 (N, 클래스 수) 출력을 반환
+    @abstractmethod
+    def run_tensor_inference(self, tensors):
+        pass
+
 
 import json
 import tensorflow as tf
 import numpy as np
-from typing import Any
+from typing import Any, Optional
 from PIL import Image
 import io
 from app.infrastructure.Environment import get_environment_variables, get_root_dir
@@ -31,29 +41,44 @@ with open(
 
 
 class TFLiteVisionModel(IVisionModel):
-    def __init__(self):
+    def __init__(self, num_threads: Optional[int] = None):
         self.env = get_environment_variables()
         self.root_dir = get_root_dir()
         self.interpreter = tf.lite.Interpreter(
-            model_path=f"{self.root_dir}{self.env.TFLITE_MODEL_PATH}"
+            model_path=f"{self.root_dir}{self.env.TFLITE_MODEL_PATH}",
+            num_threads=num_threads,
         )
         self.interpreter.allocate_tensors()
         self.input_details = self.interpreter.get_input_details()
         self.output_details = self.interpreter.get_output_details()
+        self.batch_size = int(self.input_details[0]["shape"][0])
+        self.input_size = tuple(int(v) for v in self.input_details[0]["shape"][1:3])
 
-    def preprocess_image(self, image_data: bytes) -> np.ndarray:
+    def decode_image(self, image_data: bytes) -> np.ndarray:
         image = Image.open(io.BytesIO(image_data)).convert("RGB")
-        image = image.resize((128, 128))
-        image_array = np.array(image).astype(np.float32) / 255.0
+        image = image.resize((self.input_size[1], self.input_size[0]))
+        return np.asarray(image, dtype=np.uint8)
+
+    def preprocess_image(self, image_data: bytes) -> np.ndarray:
+        image_array = self.decode_image(image_data).astype(np.float32) / 255.0
         image_array = np.expand_dims(image_array, axis=0)
         return image_array
 
-    def run_inference(self, image_data: bytes) -> np.ndarray:
-        input_data = self.preprocess_image(image_data)
+    def run_tensor_inference(self, tensors: np.ndarray) -> np.ndarray:
+        input_data = tensors.astype(np.float32) / 255.0
+        if input_data.shape[0] != self.batch_size:
+            # 배치 크기가 바뀔 때만 입력 텐서를 다시 할당
+            self.interpreter.resize_tensor_input(
+                self.input_details[0]["index"], list(input_data.shape)
+            )
+            self.interpreter.allocate_tensors()
+            self.batch_size = input_data.shape[0]
         self.interpreter.set_tensor(self.input_details[0]["index"], input_data)
         self.interpreter.invoke()
-        output_data = self.interpreter.get_tensor(self.output_details[0]["index"])
-        return output_data
+        return self.interpreter.get_tensor(self.output_details[0]["index"])
+
+    def run_inference(self, image_data: bytes) -> np.ndarray:
+        return self.run_tensor_inference(self.decode_image(image_data)[np.newaxis])
 
     def get_top_k_predictions(self, output: np.ndarray, k: int = 5) -> dict:
         top_k_indices = np.argsort(-output, axis=1)[:, :k]
@@ -76,35 +101,63 @@ from abc import ABC, abstractmethod
 
 
 # 11/13일자 모델 : ['batch_size', 3, 128, 128] (NCHW)
+# tflite -> onnx 변환 모델 : [1, 128, 128, 3] (NHWC) *N=1이다.
 class ONNXVisionModel(IVisionModel):
-    def __init__(self):
+    def __init__(self, num_threads: Optional[int] = None):
         self.env = get_environment_variables()
         self.root_dir = get_root_dir()
+        session_options = ort.SessionOptions()
+        if num_threads:
+            session_options.intra_op_num_threads = num_threads
+            session_options.inter_op_num_threads = 1
         self.session = ort.InferenceSession(
-            f"{self.root_dir}{self.env.ONNX_MODEL_PATH}"
+            f"{self.root_dir}{self.env.ONNX_MODEL_PATH}", sess_options=session_options
         )
         self.input_name = self.session.get_inputs()[0].name
         self.output_name = self.session.get_outputs()[0].name
         self.input_shape = self.session.get_inputs()[0].shape
+        # 입력 형식에 따라 NCHW / NHWC 모델을 모두 지원
+        self.channels_first = self.input_shape[1] == 3
+        if self.channels_first:
+            self.input_size = (self.input_shape[2], self.input_shape[3])
+        else:
+            self.input_size = (self.input_shape[1], self.input_shape[2])
+        # 배치 차원이 고정된 모델은 고정 크기로 나누어 실행
+        self.max_batch_size = (
+            self.input_shape[0] if isinstance(self.input_shape[0], int) else None
+        )
 
-    def preprocess_image(self, image_data: bytes) -> np.ndarray:
+    def decode_image(self, image_data: bytes) -> np.ndarray:
         np_arr = np.frombuffer(image_data, np.uint8)
         image = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
-        image = cv2.resize(image, (self.input_shape[3], self.input_shape[2]))
-        image = image.astype(np.float32) / 255.0
-        # 이미지 형식 조정 : HWC (높이, 너비, 채널) -> CHW (채널, 높이, 너비)
-        image = np.transpose(image, (2, 0, 1))
-        # 배치 차원 추가: (3, 128, 128) -> (1, 3, 128, 128)
-        image = np.expand_dims(image, axis=0)
-        return image
+        image = cv2.resize(image, (self.input_size[1], self.input_size[0]))
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+    def to_model_input(self, tensors: np.ndarray) -> np.ndarray:
+        images = tensors.astype(np.float32) / 255.0
+        if self.channels_first:
+            # 기존 NCHW 모델 전처리와 동일하게 OpenCV의 BGR 순서로 입력
+            # 이미지 형식 조정 : NHWC (배치, 높이, 너비, 채널) -> NCHW (배치, 채널, 높이, 너비)
+            images = np.transpose(images[..., ::-1], (0, 3, 1, 2))
+        return np.ascontiguousarray(images)
+
+    def preprocess_image(self, image_data: bytes) -> np.ndarray:
+        return self.to_model_input(self.decode_image(image_data)[np.newaxis])
+
+    def run_tensor_inference(self, tensors: np.ndarray) -> np.ndarray:
+        model_input = self.to_model_input(tensors)
+        step = self.max_batch_size or len(model_input)
+        outputs = [
+            self.session.run(
+                [self.output_name], {self.input_name: model_input[i : i + step]}
+            )[0]
+            for i in range(0, len(model_input), step)
+        ]
+        return np.concatenate(outputs, axis=0)
 
     def run_inference(self, image_data: bytes) -> np.ndarray:
         # 이미지를 전처리하고 추론 실행
-        preprocessed_image = self.preprocess_image(image_data)
-        outputs = self.session.run(
-            [self.output_name], {self.input_name: preprocessed_image}
-        )
-        return outputs[0]
+        return self.run_tensor_inference(self.decode_image(image_data)[np.newaxis])
 
     def get_top_k_predictions(self, output, k: int = 5) -> dict:
         # 출력값을 평탄화하고 상위 k개의 예측 결과를 가져옴
@@ -115,36 +168,3 @@ class ONNXVisionModel(IVisionModel):
         return dict(zip(top_k_labels, top_k_scores))
 
 
-"""
-# tflite -> onnx 변환 모델 : [1, 128, 128, 3] (1HWC) *N=1이다.
-class ONNXVisionModel(IVisionModel):
-    def __init__(self):
-        self.env = get_environment_variables()
-        self.root_dir = get_root_dir()
-        self.session = ort.InferenceSession(f"{self.root_dir}{self.env.ONNX_MODEL_PATH}")
-        self.input_name = self.session.get_inputs()[0].name
-        self.output_name = self.session.get_outputs()[0].name
-        self.input_shape = self.session.get_inputs()[0].shape
-
-    def preprocess_image(self, image_data: bytes) -> np.ndarray:
-        np_arr = np.frombuffer(image_data, np.uint8)
-        image = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
-        image = cv2.resize(image, (self.input_shape[2], self.input_shape[1]))
-        image = image.astype(np.float32) / 255.0
-        image = np.expand_dims(image, axis=0)
-        return image
-
-    def run_inference(self, image_data: bytes) -> np.ndarray:
-        preprocessed_image = self.preprocess_image(image_data)
-        outputs = self.session.run(
-            [self.output_name], {self.input_name: preprocessed_image}
-        )
-        return outputs[0]
-
-    def get_top_k_predictions(self, output, k: int = 5) -> dict:
-        output = output.flatten()
-        top_k_indices = output.argsort()[-k:][::-1]
-        top_k_labels = [CIFAR100_CLASSES[i] for i in top_k_indices]
-        top_k_scores = [float(o) for o in output[top_k_indices]]
-        return dict(zip(top_k_labels, top_k_scores))
-"""
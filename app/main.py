@@ -1,14 +1,36 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
+from fastapi.concurrency import run_in_threadpool
 import asyncio
+import logging
+import time
 from contextlib import asynccontextmanager
 from app.infrastructure.Environment import get_environment_variables
 from app.models.BaseModel import init
-from app.routers.v1.ImageClassificationRouter import InferenceRouter
+from app.routers.v1.ImageClassificationRouter import (
+    InferenceRouter,
+    SUPPORTED_INFERENCE_ENGINES,
+)
 from app.routers.v1.InferenceLogRouter import LogRouter
 from app.routers.v1.SchedulerRouter import SchedulerRouter
+from app.routers.v1.InferenceEventRouter import EventRouter
+from app.routers.v1.DebugRouter import DebugRouter
+from app.routers.v1.ReprocessRouter import ReprocessRouter
 
 from app.worker.LogCleanupWorker import LogCleanupWorker
 from app.worker.InferenceWorker import InferenceWorker
+from app.worker.ReprocessWorker import ReprocessWorker
+from app.infrastructure.Interfaces import (
+    get_near_duplicate_index,
+    get_queue,
+    get_tracer,
+)
+from app.infrastructure.Metrics import (
+    HTTP_REQUEST_SECONDS,
+    INFERENCE_QUEUE_LENGTH,
+    METRICS_CONTENT_TYPE,
+    NEAR_DUPLICATE_INDEX_SIZE,
+    render_metrics,
+)
 
 from fastapi.staticfiles import StaticFiles
 
@@ -16,22 +38,43 @@ env = get_environment_variables()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    tflite_inference_worker = InferenceWorker("tflite")
-    app.state.tfflite_inference_worker = tflite_inference_worker
-    asyncio.create_task(tflite_inference_worker.run())
+    inference_workers = []
+    if env.QUEUE_BACKEND == "memory" and not env.INFERENCE_WORKERS_IN_PROCESS:
+        logging.warning(
+            "[WARN] QUEUE_BACKEND=memory only reaches workers running in this process"
+        )
+    # false로 설정하면 추론은 python -m app.worker 프로세스에서만 수행
+    if env.INFERENCE_WORKERS_IN_PROCESS:
+        num_threads = env.INFERENCE_NUM_THREADS or None
+        tflite_inference_worker = InferenceWorker("tflite", num_threads)
+        app.state.tfflite_inference_worker = tflite_inference_worker
+        asyncio.create_task(tflite_inference_worker.run())
 
-    onnx_inference_worker = InferenceWorker("onnx")
-    app.state.onnx_inference_worker = onnx_inference_worker
-    asyncio.create_task(onnx_inference_worker.run())
+        onnx_inference_worker = InferenceWorker("onnx", num_threads)
+        app.state.onnx_inference_worker = onnx_inference_worker
+        asyncio.create_task(onnx_inference_worker.run())
+        inference_workers = [tflite_inference_worker, onnx_inference_worker]
 
     cleanup_worker = LogCleanupWorker()
     app.state.cleanup_worker = cleanup_worker
-    asyncio.create_task(cleanup_worker.run())
+    # set_interval/set_period가 재시작할 때 기존 작업을 취소할 수 있도록 task를 보관
+    cleanup_worker.start()
+
+    reprocess_worker = None
+    # 재추론은 CPU를 많이 쓰므로 기본적으로 python -m app.worker --reprocess 프로세스에서 실행
+    if env.REPROCESS_ENABLED:
+        reprocess_worker = ReprocessWorker(SUPPORTED_INFERENCE_ENGINES)
+        app.state.reprocess_worker = reprocess_worker
+        reprocess_worker.start()
     yield
 
-    tflite_inference_worker.stop()
     cleanup_worker.stop()
-    onnx_inference_worker.stop()
+    if reprocess_worker:
+        reprocess_worker.stop()
+    for inference_worker in inference_workers:
+        inference_worker.stop()
+    # 마지막 요청의 스팬이 버퍼에 남지 않도록 기록
+    get_tracer().flush()
 
 
 app = FastAPI(title=env.APP_NAME, version=env.API_VERSION, lifespan=lifespan)
@@ -39,12 +82,59 @@ app = FastAPI(title=env.APP_NAME, version=env.API_VERSION, lifespan=lifespan)
 # Static files (for UI)
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    start_time = time.perf_counter()
+    # 요청 전체를 루트 스팬으로 기록하고, 클라이언트가 보낸 traceparent가 있으면 이어 붙임
+    with get_tracer().start_span(
+        "http.request", parent=request.headers.get("traceparent")
+    ) as span:
+        response = await call_next(request)
+        # 경로 파라미터별로 라벨이 늘어나지 않도록 라우트 템플릿을 사용
+        route = request.scope.get("route")
+        route_path = route.path if route else "unmatched"
+        span.name = f"{request.method} {route_path}"
+        span.set_attribute("http.status_code", response.status_code)
+    HTTP_REQUEST_SECONDS.labels(
+        request.method,
+        route_path,
+        response.status_code,
+    ).observe(time.perf_counter() - start_time)
+    return response
+
+
 @app.get("/")
 async def server_status():
     return {"message": "welcome"}
 
 
+def collect_backend_metrics() -> None:
+    queue = get_queue()
+    for inference_engine in SUPPORTED_INFERENCE_ENGINES:
+        try:
+            INFERENCE_QUEUE_LENGTH.labels(inference_engine).set(
+                queue.get_queue_length(inference_engine)
+            )
+        except Exception as e:
+            logging.error(f"[ERROR] Failed to read queue length: {e}")
+    if env.NEAR_DUPLICATE_ENABLED:
+        try:
+            NEAR_DUPLICATE_INDEX_SIZE.set(get_near_duplicate_index().size())
+        except Exception as e:
+            logging.error(f"[ERROR] Failed to read near-duplicate index size: {e}")
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    # 대기열 길이와 색인 크기는 Redis/Postgres를 조회하므로 이벤트 루프 밖에서 수집
+    await run_in_threadpool(collect_backend_metrics)
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
 app.include_router(InferenceRouter)
 app.include_router(LogRouter)
 app.include_router(SchedulerRouter)
+app.include_router(EventRouter)
+app.include_router(DebugRouter)
+app.include_router(ReprocessRouter)
 init()
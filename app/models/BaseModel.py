@@ -1,9 +1,213 @@
+from sqlalchemy import inspect, text
 from sqlalchemy.orm import declarative_base
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
+import logging
 from app.infrastructure.Database import engine
+from app.infrastructure.Environment import get_environment_variables
+from app.infrastructure.Metrics import INFERENCE_LOG_PARTITION_END
 
 
 EntityMeta = declarative_base()
 
+PARTITION_INTERVALS = {"daily", "monthly"}
+
 
 def init() -> None:
     EntityMeta.metadata.create_all(bind=engine)
+    add_missing_columns()
+    create_upcoming_partitions()
+
+
+def add_missing_columns() -> None:
+    """create_all은 기존 테이블에 컬럼을 추가하지 않으므로 새로 추가된 nullable 컬럼을 반영"""
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table in EntityMeta.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                connection.execute(
+                    text(
+                        f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'
+                    )
+                )
+                logging.info(f"[LOG] Added column {table.name}.{column.name}")
+
+
+def get_partition_interval() -> Optional[str]:
+    interval = get_environment_variables().INFERENCE_LOG_PARTITION_INTERVAL
+    return interval if interval in PARTITION_INTERVALS else None
+
+
+def get_partition_range(day: date, interval: str) -> Tuple[date, date]:
+    if interval == "daily":
+        return day, day + timedelta(days=1)
+    start = day.replace(day=1)
+    end = (start + timedelta(days=32)).replace(day=1)
+    return start, end
+
+
+def get_partition_name(table_name: str, start: date, interval: str) -> str:
+    suffix = start.strftime("%Y%m%d") if interval == "daily" else start.strftime("%Y%m")
+    return f"{table_name}_p{suffix}"
+
+
+def get_default_partition_name(table_name: str) -> str:
+    # 접미사가 날짜가 아니므로 get_partition_end가 None을 반환하여 만료 대상에서 제외됨
+    return f"{table_name}_pdefault"
+
+
+def get_partition_key(table_name: str) -> str:
+    # "RANGE (created_at)" -> "created_at"
+    partition_by = EntityMeta.metadata.tables[table_name].dialect_options[
+        "postgresql"
+    ]["partition_by"]
+    return partition_by.split("(", 1)[1].rstrip(") ").strip()
+
+
+def get_partition_end(partition_name: str, interval: str) -> Optional[date]:
+    suffix = partition_name.rsplit("_p", 1)[-1]
+    try:
+        if interval == "daily":
+            start = datetime.strptime(suffix, "%Y%m%d").date()
+        else:
+            start = datetime.strptime(suffix, "%Y%m").date()
+    except ValueError:
+        return None
+    return get_partition_range(start, interval)[1]
+
+
+def get_partitioned_table_names() -> List[str]:
+    if engine.dialect.name != "postgresql" or not get_partition_interval():
+        return []
+    with engine.connect() as connection:
+        # create_all은 기존 테이블을 변환하지 않으므로 실제로 파티션된 테이블만 관리
+        partitioned = set(
+            connection.execute(
+                text(
+                    "SELECT c.relname FROM pg_partitioned_table p "
+                    "JOIN pg_class c ON c.oid = p.partrelid"
+                )
+            ).scalars()
+        )
+    table_names = []
+    for table in EntityMeta.metadata.sorted_tables:
+        if not table.dialect_options["postgresql"].get("partition_by"):
+            continue
+        if table.name in partitioned:
+            table_names.append(table.name)
+        else:
+            logging.warning(
+                f"[WARN] {table.name} is not partitioned, recreate it to enable partitioning"
+            )
+    return table_names
+
+
+def create_upcoming_partitions(today: Optional[date] = None) -> None:
+    interval = get_partition_interval()
+    table_names = get_partitioned_table_names()
+    if not table_names:
+        return
+    today = today or date.today()
+    premake = get_environment_variables().INFERENCE_LOG_PARTITION_PREMAKE
+
+    with engine.begin() as connection:
+        for table_name in table_names:
+            # 미리 만든 파티션이 모두 지나도 INSERT가 실패하지 않도록 DEFAULT 파티션을 둠
+            default_name = get_default_partition_name(table_name)
+            connection.execute(
+                text(
+                    f'CREATE TABLE IF NOT EXISTS "{default_name}" '
+                    f'PARTITION OF "{table_name}" DEFAULT'
+                )
+            )
+            start = get_partition_range(today, interval)[0]
+            for _ in range(premake + 1):
+                end = get_partition_range(start, interval)[1]
+                create_partition(connection, table_name, start, end, interval)
+                start = end
+            INFERENCE_LOG_PARTITION_END.labels(table_name).set(
+                datetime.combine(start, datetime.min.time()).timestamp()
+            )
+
+
+def create_partition(
+    connection, table_name: str, start: date, end: date, interval: str
+) -> None:
+    partition_name = get_partition_name(table_name, start, interval)
+    if connection.execute(
+        text("SELECT to_regclass(:name)"), {"name": f'"{partition_name}"'}
+    ).scalar():
+        return
+    default_name = get_default_partition_name(table_name)
+    partition_key = get_partition_key(table_name)
+    bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    range_params = {"start": start, "end": end}
+    range_filter = f'"{partition_key}" >= :start AND "{partition_key}" < :end'
+    has_default_rows = connection.execute(
+        text(f'SELECT EXISTS (SELECT 1 FROM "{default_name}" WHERE {range_filter})'),
+        range_params,
+    ).scalar()
+    if not has_default_rows:
+        connection.execute(
+            text(
+                f'CREATE TABLE "{partition_name}" '
+                f'PARTITION OF "{table_name}" {bounds}'
+            )
+        )
+        return
+
+    # 범위의 행이 DEFAULT 파티션에 있으면 파티션을 바로 만들 수 없으므로
+    # 별도 테이블로 옮긴 뒤 연결
+    logging.error(
+        f"[ERROR] {table_name} rows for {start.isoformat()} were written to "
+        f"{default_name}, partition premaking is falling behind"
+    )
+    connection.execute(
+        text(
+            f'CREATE TABLE "{partition_name}" '
+            f'(LIKE "{table_name}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+        )
+    )
+    connection.execute(
+        text(
+            f'WITH moved AS (DELETE FROM "{default_name}" WHERE {range_filter} '
+            f'RETURNING *) INSERT INTO "{partition_name}" SELECT * FROM moved'
+        ),
+        range_params,
+    )
+    connection.execute(
+        text(f'ALTER TABLE "{table_name}" ATTACH PARTITION "{partition_name}" {bounds}')
+    )
+
+
+def find_expired_partitions(table_name: str, retention_date: datetime) -> List[str]:
+    interval = get_partition_interval()
+    with engine.connect() as connection:
+        partition_names = connection.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE parent.relname = :table_name ORDER BY child.relname"
+            ),
+            {"table_name": table_name},
+        ).scalars()
+        # 파티션의 상한이 보존 기준일 이전인, 전체가 만료된 파티션만 대상
+        return [
+            partition_name
+            for partition_name in partition_names
+            if (end := get_partition_end(partition_name, interval))
+            and end <= retention_date.date()
+        ]
+
+
+def drop_partition(table_name: str, partition_name: str) -> None:
+    with engine.begin() as connection:
+        connection.execute(
+            text(f'ALTER TABLE "{table_name}" DETACH PARTITION "{partition_name}"')
+        )
+        connection.execute(text(f'DROP TABLE "{partition_name}"'))
@@ -1,20 +1,36 @@
-from sqlalchemy import Column, String, DateTime, Float
+from sqlalchemy import Column, String, DateTime, Float, Integer
 from sqlalchemy.sql import func
 import json
-from app.models.BaseModel import EntityMeta
+from app.models.BaseModel import EntityMeta, get_partition_interval
+
+# 파티션 키는 기본 키에 포함되어야 하므로 파티션 사용 시 created_at을 기본 키에 추가
+PARTITIONED = get_partition_interval() is not None
 
 
 class InferenceLogModel(EntityMeta):
     __tablename__ = "inference_log"
+    __table_args__ = (
+        {"postgresql_partition_by": "RANGE (created_at)"} if PARTITIONED else {}
+    )
 
     inference_id = Column(String, primary_key=True, index=True)
     user_id = Column(String, index=True)
     inference_engine = Column(String)
+    # 클라이언트가 요청한 엔진 (auto인 경우 inference_engine은 라우팅으로 선택된 엔진)
+    requested_engine = Column(String, nullable=True)
     image_path = Column(String)
+    # 전처리된 텐서 위치 "{object_key}#{row}" (재추론 시 디코딩 없이 사용)
+    tensor_path = Column(String, nullable=True)
+    # cascade 요청에서 결과를 낸 단계 (1: 첫 번째 엔진, 2: 확신도가 낮아 넘겨받은 엔진)
+    cascade_stage = Column(Integer, nullable=True)
+    # 유사 이미지의 결과를 재사용한 경우 원래 추론 ID (추론하지 않음)
+    duplicate_of = Column(String, nullable=True)
+    # 다운로드/디코딩/추론에 실패한 경우 오류 내용 (결과는 비어 있음)
+    error = Column(String, nullable=True)
     inference_time = Column(Float)
     result = Column(String)
     requested_time = Column(String)
-    created_at = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True), primary_key=PARTITIONED)
     updated_at = Column(DateTime(timezone=True), server_default=func.now())
     removed_at = Column(DateTime(timezone=True), nullable=True)
 
@@ -23,7 +39,14 @@ class InferenceLogModel(EntityMeta):
             "inference_id": str(self.inference_id),
             "user_id": str(self.user_id),
             "inference_engine": str(self.inference_engine),
+            "requested_engine": (
+                str(self.requested_engine) if self.requested_engine else None
+            ),
             "image_path": str(self.image_path),
+            "tensor_path": str(self.tensor_path) if self.tensor_path else None,
+            "cascade_stage": self.cascade_stage,
+            "duplicate_of": str(self.duplicate_of) if self.duplicate_of else None,
+            "error": str(self.error) if self.error else None,
             "inference_time": str(self.inference_time),
             "result": json.loads(self.result.replace("'", '"')),
             "requested_time": str(self.requested_time),
@@ -0,0 +1,81 @@
+from sqlalchemy import Column, String, DateTime, Float, Integer
+from sqlalchemy.sql import func
+import json
+from app.models.BaseModel import EntityMeta
+
+
+class ReprocessJobModel(EntityMeta):
+    __tablename__ = "reprocess_job"
+
+    job_id = Column(String, primary_key=True, index=True)
+    inference_engine = Column(String)
+    # 작업에 사용한 모델 파일 (엔진에 설정된 모델 경로)
+    model_path = Column(String)
+    # 대상 로그 조건
+    user_id = Column(String, nullable=True)
+    start_time = Column(DateTime(timezone=True), nullable=True)
+    end_time = Column(DateTime(timezone=True), nullable=True)
+    # queued / running / paused / completed / cancelled / failed
+    status = Column(String, index=True)
+    total_count = Column(Integer, nullable=True)
+    processed_count = Column(Integer, default=0)
+    failed_count = Column(Integer, default=0)
+    # 마지막으로 처리한 inference_id (이 값 이후부터 재개)
+    checkpoint = Column(String, nullable=True)
+    rate = Column(Float, nullable=True)
+    # 작업을 실행 중인 프로세스와 마지막 진행 시각 (임대 만료 시 다른 프로세스가 이어받음)
+    owner = Column(String, nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    def normalize(self):
+        remaining = (
+            self.total_count - self.processed_count - self.failed_count
+            if self.total_count is not None
+            else None
+        )
+        return {
+            "job_id": str(self.job_id),
+            "inference_engine": str(self.inference_engine),
+            "model_path": str(self.model_path),
+            "user_id": str(self.user_id) if self.user_id else None,
+            "start_time": str(self.start_time) if self.start_time else None,
+            "end_time": str(self.end_time) if self.end_time else None,
+            "status": str(self.status),
+            "total_count": self.total_count,
+            "processed_count": self.processed_count or 0,
+            "failed_count": self.failed_count or 0,
+            "checkpoint": self.checkpoint,
+            "rate": self.rate,
+            "eta_seconds": (
+                remaining / self.rate
+                if remaining is not None and self.rate and self.status == "running"
+                else None
+            ),
+            "error": self.error,
+            "created_at": str(self.created_at) if self.created_at else None,
+            "started_at": str(self.started_at) if self.started_at else None,
+            "finished_at": str(self.finished_at) if self.finished_at else None,
+        }
+
+
+class ReprocessResultModel(EntityMeta):
+    __tablename__ = "reprocess_result"
+
+    job_id = Column(String, primary_key=True)
+    inference_id = Column(String, primary_key=True)
+    inference_engine = Column(String)
+    result = Column(String)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def normalize(self):
+        return {
+            "job_id": str(self.job_id),
+            "inference_id": str(self.inference_id),
+            "inference_engine": str(self.inference_engine),
+            "result": json.loads(self.result.replace("'", '"')),
+            "created_at": str(self.created_at),
+        }
@@ -1,7 +1,7 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, text
 from app.models.InferenceLogModel import InferenceLogModel
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from datetime import datetime
 
 
@@ -16,6 +16,14 @@ class InferenceLogRepository:
             .first()
         )
 
+    def create_inference_log(
+        self, inference_log: InferenceLogModel
+    ) -> InferenceLogModel:
+        self.db.add(inference_log)
+        self.db.commit()
+        self.db.refresh(inference_log)
+        return inference_log
+
     def get_inference_logs(
         self,
         user_id: Optional[str] = None,
@@ -61,3 +69,40 @@ class InferenceLogRepository:
             self.db.commit()
             return True
         return False
+
+    def lock_expired_inference_logs(
+        self, retention_date: datetime, limit: int
+    ) -> List[Tuple[str, str]]:
+        """만료된 로그를 잠그고 반환합니다. delete_inference_logs로 커밋할 때까지 잠금 유지"""
+        # 다른 정리 작업과 겹치더라도 대기하지 않도록 잠긴 행은 건너뜀
+        expired_logs = (
+            self.db.query(InferenceLogModel.inference_id, InferenceLogModel.image_path)
+            .filter(InferenceLogModel.created_at <= retention_date)
+            .order_by(InferenceLogModel.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        if not expired_logs:
+            self.db.rollback()
+            return []
+        return [(inference_id, image_path) for inference_id, image_path in expired_logs]
+
+    def delete_inference_logs(self, inference_ids: List[str]) -> None:
+        self.db.query(InferenceLogModel).filter(
+            InferenceLogModel.inference_id.in_(inference_ids)
+        ).delete(synchronize_session=False)
+        self.db.commit()
+
+    def get_partition_image_paths(
+        self, partition_name: str, after_inference_id: str, limit: int
+    ) -> List[Tuple[str, str]]:
+        rows = self.db.execute(
+            text(
+                f'SELECT inference_id, image_path FROM "{partition_name}" '
+                "WHERE inference_id > :after_inference_id "
+                "ORDER BY inference_id LIMIT :limit"
+            ),
+            {"after_inference_id": after_inference_id, "limit": limit},
+        ).all()
+        return [(inference_id, image_path) for inference_id, image_path in rows]
@@ -0,0 +1,193 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, func, or_
+from app.models.InferenceLogModel import InferenceLogModel
+from app.models.ReprocessJobModel import ReprocessJobModel, ReprocessResultModel
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+
+
+class ReprocessJobRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_job(self, reprocess_job: ReprocessJobModel) -> ReprocessJobModel:
+        self.db.add(reprocess_job)
+        self.db.commit()
+        self.db.refresh(reprocess_job)
+        return reprocess_job
+
+    def get_job_by_id(self, job_id: str) -> Optional[ReprocessJobModel]:
+        return (
+            self.db.query(ReprocessJobModel)
+            .filter(ReprocessJobModel.job_id == job_id)
+            .first()
+        )
+
+    def update_job_status(
+        self, job_id: str, status: str, from_statuses: List[str]
+    ) -> bool:
+        updated = (
+            self.db.query(ReprocessJobModel)
+            .filter(
+                ReprocessJobModel.job_id == job_id,
+                ReprocessJobModel.status.in_(from_statuses),
+            )
+            .update({"status": status}, synchronize_session=False)
+        )
+        self.db.commit()
+        return updated > 0
+
+    def claim_next_job(
+        self, owner: str, lease_expired_before: datetime
+    ) -> Optional[ReprocessJobModel]:
+        # 대기 중인 작업이나, 실행하던 프로세스가 임대를 갱신하지 못한 작업을 가져옴
+        candidates = (
+            self.db.query(ReprocessJobModel)
+            .filter(
+                or_(
+                    ReprocessJobModel.status == "queued",
+                    and_(
+                        ReprocessJobModel.status == "running",
+                        or_(
+                            ReprocessJobModel.heartbeat_at == None,
+                            ReprocessJobModel.heartbeat_at < lease_expired_before,
+                        ),
+                    ),
+                )
+            )
+            .order_by(ReprocessJobModel.created_at)
+            .limit(5)
+            .all()
+        )
+        for candidate in candidates:
+            # 같은 작업을 여러 프로세스가 동시에 가져가지 않도록 이전 상태가 그대로일 때만 갱신
+            claimed = (
+                self.db.query(ReprocessJobModel)
+                .filter(
+                    ReprocessJobModel.job_id == candidate.job_id,
+                    ReprocessJobModel.status == candidate.status,
+                    (
+                        ReprocessJobModel.owner == candidate.owner
+                        if candidate.owner
+                        else ReprocessJobModel.owner == None
+                    ),
+                )
+                .update(
+                    {
+                        "status": "running",
+                        "owner": owner,
+                        "heartbeat_at": datetime.now(),
+                        "started_at": candidate.started_at or datetime.now(),
+                        "error": None,
+                        "finished_at": None,
+                    },
+                    synchronize_session=False,
+                )
+            )
+            self.db.commit()
+            if claimed:
+                return self.get_job_by_id(candidate.job_id)
+        return None
+
+    def filter_target_logs(self, query, reprocess_job: ReprocessJobModel):
+        query = query.filter(InferenceLogModel.removed_at == None)
+        if reprocess_job.user_id:
+            query = query.filter(InferenceLogModel.user_id == reprocess_job.user_id)
+        if reprocess_job.start_time:
+            query = query.filter(InferenceLogModel.created_at >= reprocess_job.start_time)
+        if reprocess_job.end_time:
+            query = query.filter(InferenceLogModel.created_at <= reprocess_job.end_time)
+        return query
+
+    def count_target_logs(self, reprocess_job: ReprocessJobModel) -> int:
+        return self.filter_target_logs(
+            self.db.query(func.count(InferenceLogModel.inference_id)), reprocess_job
+        ).scalar()
+
+    def get_target_logs(
+        self, reprocess_job: ReprocessJobModel, limit: int
+    ) -> List[Tuple[str, str, Optional[str]]]:
+        # inference_id 순서로 체크포인트 이후의 로그를 가져옴 (키셋 페이지네이션)
+        query = self.filter_target_logs(
+            self.db.query(
+                InferenceLogModel.inference_id,
+                InferenceLogModel.image_path,
+                InferenceLogModel.tensor_path,
+            ),
+            reprocess_job,
+        )
+        if reprocess_job.checkpoint:
+            query = query.filter(
+                InferenceLogModel.inference_id > reprocess_job.checkpoint
+            )
+        rows = query.order_by(InferenceLogModel.inference_id).limit(limit).all()
+        return [tuple(row) for row in rows]
+
+    def save_chunk(
+        self,
+        job_id: str,
+        owner: str,
+        results: List[Dict],
+        checkpoint: str,
+        processed_count: int,
+        failed_count: int,
+        rate: Optional[float],
+    ) -> bool:
+        """결과와 체크포인트를 한 트랜잭션으로 기록합니다. 작업을 잃었으면 False를 반환합니다."""
+        updated = (
+            self.db.query(ReprocessJobModel)
+            .filter(
+                ReprocessJobModel.job_id == job_id,
+                ReprocessJobModel.owner == owner,
+                ReprocessJobModel.status == "running",
+            )
+            .update(
+                {
+                    "checkpoint": checkpoint,
+                    "processed_count": ReprocessJobModel.processed_count
+                    + processed_count,
+                    "failed_count": ReprocessJobModel.failed_count + failed_count,
+                    "rate": rate,
+                    "heartbeat_at": datetime.now(),
+                },
+                synchronize_session=False,
+            )
+        )
+        if not updated:
+            # 일시 중지/취소되었거나 다른 프로세스가 이어받은 작업
+            self.db.rollback()
+            return False
+        self.db.bulk_insert_mappings(ReprocessResultModel, results)
+        self.db.commit()
+        return True
+
+    def update_job(self, job_id: str, owner: str, values: Dict) -> bool:
+        # 실행 중인 작업을 가진 프로세스만 상태를 바꿀 수 있음
+        updated = (
+            self.db.query(ReprocessJobModel)
+            .filter(
+                ReprocessJobModel.job_id == job_id,
+                ReprocessJobModel.owner == owner,
+                ReprocessJobModel.status == "running",
+            )
+            .update(values, synchronize_session=False)
+        )
+        self.db.commit()
+        return updated > 0
+
+    def get_results(
+        self, job_id: str, page: int = 1, offset: int = 100
+    ) -> Tuple[List[ReprocessResultModel], int]:
+        query = self.db.query(ReprocessResultModel).filter(
+            ReprocessResultModel.job_id == job_id
+        )
+        total_count = query.with_entities(
+            func.count(ReprocessResultModel.inference_id)
+        ).scalar()
+        results = (
+            query.order_by(ReprocessResultModel.inference_id)
+            .offset((page - 1) * offset)
+            .limit(offset)
+            .all()
+        )
+        return results, total_count
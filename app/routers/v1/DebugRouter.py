@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Query
+from app.schemas.TraceSchema import TraceCommonResponseSchema
+from app.infrastructure.Interfaces import get_tracer
+
+DebugRouter = APIRouter(prefix="/api/v1/debug", tags=["debug"])
+
+
+@DebugRouter.get(
+    "/traces",
+    response_model=TraceCommonResponseSchema,
+    summary="느린 트레이스 조회",
+    description="이 프로세스에서 최근 기록된 트레이스 중 소요 시간이 가장 긴 트레이스를 구간(스팬)별로 반환합니다.",
+    response_description="소요 시간 순으로 정렬된 트레이스 목록을 반환합니다.",
+)
+async def get_slowest_traces(limit: int = Query(10, ge=1, le=100)):
+    return TraceCommonResponseSchema(
+        status={"msg": "success"},
+        data={"traces": get_tracer().get_slowest_traces(limit)},
+    )
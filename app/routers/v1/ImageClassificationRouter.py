@@ -4,31 +4,311 @@ from fastapi import (
     Depends,
     UploadFile,
     Form,
+    Header,
     HTTPException,
     status,
     Query,
     BackgroundTasks,
 )
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import Dict
+from typing import BinaryIO, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
 import zipfile
 from io import BytesIO
 from datetime import datetime
 from app.schemas.ImageClassificationSchema import (
     ImageClassificationCommonResponseSchema,
 )
-from app.services.ImageClassificationService import ImageClassificationService
+from app.models.InferenceLogModel import InferenceLogModel
+from app.schemas.InferenceLogSchema import InferenceLogResponseSchema
+from app.services.ImageClassificationService import (
+    SERVICE_OBJECT_PREFIXES,
+    ImageClassificationService,
+    compute_image_hash,
+    inspect_image_header,
+    inspect_tensor_header,
+    inspect_zip_entries,
+)
 from app.services.InferenceLogService import InferenceLogService
+from app.infrastructure.Environment import get_environment_variables
+from app.infrastructure.Metrics import (
+    ADMISSION_REJECTED,
+    NEAR_DUPLICATE_LOOKUPS,
+    UPLOAD_REJECTED,
+)
+from app.infrastructure.AdmissionControl import AdmissionDecision
+from app.infrastructure.EngineRouting import CASCADE_INFERENCE_ENGINE
 from app.infrastructure.Interfaces import (
+    IAdmissionController,
+    IEngineRouter,
+    INearDuplicateIndex,
     IQueue,
     IObjectStorage,
+    IResultCache,
+    SessionLocal,
+    get_admission_controller,
+    get_engine_router,
+    get_near_duplicate_index,
+    get_notifier,
     get_queue,
     get_db,
+    get_result_cache,
     get_s3_client,
+    get_tracer,
 )
 
 SUPPORTED_INFERENCE_ENGINES = {"tflite", "onnx"}
+# 예상 완료 시간이 가장 짧은 엔진으로 요청마다 라우팅
+AUTO_INFERENCE_ENGINE = "auto"
+# 요청 시점에 실제 엔진이 정해지는 엔진 모드
+ROUTED_INFERENCE_ENGINES = {AUTO_INFERENCE_ENGINE, CASCADE_INFERENCE_ENGINE}
 InferenceRouter = APIRouter(prefix="/api/v1/images", tags=["inference"])
+env = get_environment_variables()
+
+
+def make_result_etag(result_json: str) -> str:
+    return '"' + hashlib.sha256(result_json.encode("utf-8")).hexdigest() + '"'
+
+
+def make_result_cache_headers(result_json: str) -> Dict[str, str]:
+    # 삭제하면 결과가 바뀌므로 공유 캐시에는 저장하지 않고, 클라이언트는 ETag로 재검증
+    max_age = env.RESULT_HTTP_MAX_AGE_SECONDS
+    return {
+        "ETag": make_result_etag(result_json),
+        "Cache-Control": (
+            f"private, max-age={max_age}" if max_age > 0 else "private, no-cache"
+        ),
+    }
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # If-None-Match는 약한 비교를 사용하므로 W/ 접두사는 무시
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def resolve_inference_engine(
+    engine_router: IEngineRouter, inference_engine: str, incoming: int
+) -> Optional[str]:
+    """auto는 라우팅된 엔진으로, cascade는 첫 번째 엔진으로 바꾸고,
+    지원하지 않는 엔진이면 None을 반환합니다."""
+    if inference_engine == AUTO_INFERENCE_ENGINE:
+        return engine_router.choose_engine(sorted(SUPPORTED_INFERENCE_ENGINES), incoming)
+    if inference_engine == CASCADE_INFERENCE_ENGINE:
+        return env.CASCADE_FIRST_ENGINE
+    if inference_engine in SUPPORTED_INFERENCE_ENGINES:
+        return inference_engine
+    return None
+
+
+def get_deadline_at(deadline_seconds: Optional[float]) -> Optional[float]:
+    """요청 시각 기준 처리 마감 시각(epoch 초), 마감이 없으면 None"""
+    if deadline_seconds is None:
+        deadline_seconds = env.INFERENCE_DEFAULT_DEADLINE_SECONDS
+    if deadline_seconds <= 0:
+        return None
+    return time.time() + deadline_seconds
+
+
+def get_upload_size(upload: UploadFile) -> int:
+    if upload.size is not None:
+        return upload.size
+    upload.file.seek(0, os.SEEK_END)
+    size = upload.file.tell()
+    upload.file.seek(0)
+    return size
+
+
+def open_upload_spool(upload: UploadFile) -> BinaryIO:
+    """업로드 임시 파일을 요청이 끝난 뒤에도 읽을 수 있는 별도 핸들로 엽니다.
+
+    큰 업로드는 이미 디스크에 기록되어 있으므로 메모리로 읽거나 복사하지 않고
+    백그라운드 작업에서 청크 단위로 읽어 업로드합니다.
+    """
+    file_descriptor = upload.file.fileno()
+    upload.file.flush()
+    spool = os.fdopen(os.dup(file_descriptor), "rb")
+    spool.seek(0)
+    return spool
+
+
+ADMISSION_MESSAGES = {
+    "queue_full": "inference queue is full",
+    "rate_limited": "too many requests",
+    "burst_exceeded": "request exceeds user rate limit burst",
+}
+
+
+async def run_queue_call(queue: IQueue, func, *args, **kwargs):
+    """Redis/PGMQ처럼 네트워크 왕복이 있는 대기열은 이벤트 루프를 막지 않도록 스레드에서 호출"""
+    if queue.blocking_io:
+        return await run_in_threadpool(func, *args, **kwargs)
+    return func(*args, **kwargs)
+
+
+def decide_admission(
+    admission_controller: IAdmissionController,
+    inference_engine: str,
+    user_id: str,
+    cost: int,
+) -> AdmissionDecision:
+    # 대기열이 가득 찬 경우에는 사용자 토큰을 차감하지 않음
+    decision = admission_controller.check_queue(inference_engine, cost)
+    if decision.allowed:
+        decision = admission_controller.consume_user_tokens(user_id, cost)
+    return decision
+
+
+async def check_admission(
+    admission_controller: IAdmissionController,
+    queue: IQueue,
+    response: Response,
+    inference_engine: str,
+    user_id: str,
+    cost: int,
+) -> Optional[ImageClassificationCommonResponseSchema]:
+    """대기열이 상한을 넘었거나 사용자 요청 한도를 초과하면 거절 응답을 반환합니다."""
+    decision = await run_queue_call(
+        queue, decide_admission, admission_controller, inference_engine, user_id, cost
+    )
+    if decision.allowed:
+        return None
+
+    ADMISSION_REJECTED.labels(inference_engine, decision.reason).inc()
+    if decision.reason == "burst_exceeded":
+        # 재시도해도 통과할 수 없으므로 429 대신 413으로 한도를 알려줌
+        response.status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        return ImageClassificationCommonResponseSchema(
+            status={"msg": ADMISSION_MESSAGES[decision.reason]},
+            data={"limit": decision.limit, "requested": cost},
+        )
+    if decision.retry_after:
+        response.headers["Retry-After"] = str(decision.retry_after)
+    response.status_code = (
+        status.HTTP_503_SERVICE_UNAVAILABLE
+        if decision.reason == "queue_full"
+        else status.HTTP_429_TOO_MANY_REQUESTS
+    )
+    return ImageClassificationCommonResponseSchema(
+        status={"msg": ADMISSION_MESSAGES[decision.reason]},
+        data={"retry_after": decision.retry_after},
+    )
+
+
+def get_reusable_engines(requested_engine: str) -> Optional[List[str]]:
+    # auto와 cascade 요청은 어느 엔진의 결과든 재사용
+    if requested_engine in ROUTED_INFERENCE_ENGINES:
+        return None
+    return [requested_engine]
+
+
+def load_serialized_inference_log(inference_id: str) -> Optional[str]:
+    with SessionLocal() as db:
+        return InferenceLogService(db).find_serialized_inference_log_by_id(inference_id)
+
+
+def save_inference_log(inference_log: InferenceLogModel) -> InferenceLogResponseSchema:
+    with SessionLocal() as db:
+        return InferenceLogService(db).create_inference_log(inference_log)
+
+
+async def find_reusable_result(
+    image_classification_service: ImageClassificationService,
+    result_cache: IResultCache,
+    image_hash: Optional[int],
+    user_id: str,
+    requested_engine: str,
+) -> Optional[Tuple[Dict, int]]:
+    """유사 이미지 색인에서 같은 사용자의 저장된 결과를 찾아 (추론 로그, 해밍 거리)를 반환합니다."""
+    if image_hash is None:
+        return None
+    try:
+        near_duplicate = await run_in_threadpool(
+            image_classification_service.find_near_duplicate,
+            image_hash,
+            user_id,
+            get_reusable_engines(requested_engine),
+        )
+        if near_duplicate is None:
+            NEAR_DUPLICATE_LOOKUPS.labels("miss").inc()
+            return None
+        inference_log_json = await result_cache.get_or_load(
+            near_duplicate.inference_id,
+            lambda: run_in_threadpool(
+                load_serialized_inference_log, near_duplicate.inference_id
+            ),
+        )
+    except Exception as e:
+        # 색인 조회에 실패해도 요청은 평소처럼 대기열로 보냄
+        NEAR_DUPLICATE_LOOKUPS.labels("error").inc()
+        logging.error(f"[ERROR] Failed to look up near-duplicate index: {e}")
+        return None
+
+    inference_log = json.loads(inference_log_json) if inference_log_json else None
+    if (
+        not inference_log
+        or inference_log["removed_at"]
+        or inference_log.get("error")
+        or inference_log["user_id"] != user_id
+    ):
+        # 삭제되었거나 실패한 로그, 다른 사용자의 결과는 재사용하지 않음
+        NEAR_DUPLICATE_LOOKUPS.labels("stale").inc()
+        return None
+    NEAR_DUPLICATE_LOOKUPS.labels("hit").inc()
+    return inference_log, near_duplicate.distance
+
+
+async def upload_and_reuse_result(
+    image_classification_service: ImageClassificationService,
+    image,
+    inference_id: str,
+    user_id: str,
+    requested_engine: str,
+    current_time: str,
+    image_size: int,
+    reused_log: Dict,
+    batch_id: Optional[str] = None,
+):
+    """이미지는 다른 요청과 같이 저장하고, 추론 대신 유사 이미지의 결과로 로그를 기록합니다."""
+    try:
+        image_path = await image_classification_service.upload_image_to_s3_with_id(
+            inference_id, image, image_size
+        )
+    finally:
+        if not isinstance(image, bytes):
+            image.close()
+
+    inference_engine = reused_log["inference_engine"]
+    inference_log = await run_in_threadpool(
+        save_inference_log,
+        InferenceLogModel(
+            inference_id=inference_id,
+            user_id=user_id,
+            inference_engine=inference_engine,
+            requested_engine=(
+                requested_engine if requested_engine != inference_engine else None
+            ),
+            image_path=image_classification_service.get_image_path(image_path),
+            inference_time=0.0,
+            result=str(reused_log["result"]),
+            requested_time=current_time,
+            created_at=datetime.now().replace(microsecond=0),
+            duplicate_of=reused_log["inference_id"],
+        ),
+    )
+    get_result_cache().set(inference_id, inference_log.model_dump_json())
+    get_notifier().publish_completion(
+        {"status": {"msg": "completed"}, "data": inference_log.model_dump(mode="json")},
+        batch_id,
+    )
 
 
 @InferenceRouter.post(
@@ -36,8 +316,8 @@ InferenceRouter = APIRouter(prefix="/api/v1/images", tags=["inference"])
     status_code=status.HTTP_202_ACCEPTED,
     response_model=ImageClassificationCommonResponseSchema,
     summary="단일 이미지 분류",
-    description="단일 이미지를 S3에 업로드하고, 지정된 추론 엔진을 사용하여 추론 대기열에 추가한 후 추론 ID를 반환합니다.",
-    response_description="상태 메시지와 추론 ID를 반환합니다.",
+    description="단일 이미지를 S3에 업로드하고, 지정된 추론 엔진을 사용하여 추론 대기열에 추가한 후 추론 ID를 반환합니다. 유사 이미지 색인이 켜져 있으면 이전에 분류한 유사 이미지의 결과를 대기열 없이 바로 반환합니다.",
+    response_description="상태 메시지와 추론 ID(유사 이미지 결과를 재사용하면 결과와 원래 추론 ID)를 반환합니다.",
 )
 async def classify_single_image(
     background_tasks: BackgroundTasks,
@@ -45,15 +325,54 @@ async def classify_single_image(
     response: Response,
     user_id: str = Form(...),
     inference_engine: str = Form("tflite"),
+    deadline_seconds: Optional[float] = Form(None),
     queue: IQueue = Depends(get_queue),
     s3_client: IObjectStorage = Depends(get_s3_client),
+    admission_controller: IAdmissionController = Depends(get_admission_controller),
+    engine_router: IEngineRouter = Depends(get_engine_router),
+    result_cache: IResultCache = Depends(get_result_cache),
+    near_duplicate_index: INearDuplicateIndex = Depends(get_near_duplicate_index),
 ) -> ImageClassificationCommonResponseSchema:
-    if inference_engine not in SUPPORTED_INFERENCE_ENGINES:
+    requested_engine = inference_engine
+    inference_engine = resolve_inference_engine(engine_router, requested_engine, 1)
+    if inference_engine is None:
         response.status_code = status.HTTP_400_BAD_REQUEST
         return ImageClassificationCommonResponseSchema(
             status={"msg": "not supported inference engine type"}, data={}
         )
 
+    # 저장소 업로드와 대기열 추가 전에 헤더만 읽어 잘못된 이미지를 거절
+    image_header = await run_in_threadpool(
+        inspect_image_header, image.file, env.IMAGE_MAX_PIXELS
+    )
+    if not image_header.valid:
+        UPLOAD_REJECTED.labels(image_header.reason).inc()
+        response.status_code = status.HTTP_400_BAD_REQUEST
+        return ImageClassificationCommonResponseSchema(
+            status={"msg": "invalid image"}, data={"reason": image_header.reason}
+        )
+
+    image_classification_service = ImageClassificationService(
+        queue, s3_client, near_duplicate_index
+    )
+    # 재인코딩되거나 크기만 바뀐 이미지는 저장된 결과로 응답하여 대기열과 추론을 생략
+    # 결과를 재사용하더라도 업로드는 저장되므로 요청 한도는 먼저 확인
+    rejected_response = await check_admission(
+        admission_controller, queue, response, inference_engine, user_id, 1
+    )
+    if rejected_response:
+        return rejected_response
+    image_hash = None
+    if env.NEAR_DUPLICATE_ENABLED:
+        image_hash = await run_in_threadpool(compute_image_hash, image.file)
+    reusable_result = await find_reusable_result(
+        image_classification_service,
+        result_cache,
+        image_hash,
+        user_id,
+        requested_engine,
+    )
+
     async def upload_and_enqueue(
         image_classification_service,
         image,
@@ -61,24 +380,75 @@ async def classify_single_image(
         user_id,
         inference_engine,
         current_time,
+        traceparent,
+        deadline_at,
+        requested_engine,
+        image_size,
+        image_hash,
     ):
-        image_path = await image_classification_service.upload_image_to_s3_with_id(
-            inference_id, image
-        )
+        with get_tracer().start_span(
+            "api.upload_and_enqueue",
+            parent=traceparent,
+            attributes={"inference_id": inference_id},
+        ):
+            try:
+                image_path = (
+                    await image_classification_service.upload_image_to_s3_with_id(
+                        inference_id, image, image_size
+                    )
+                )
+            finally:
+                if not isinstance(image, bytes):
+                    image.close()
 
-        image_classification_service.enqueue_inference(
-            inference_id=inference_id,
-            user_id=user_id,
-            inference_engine=inference_engine,
-            image_path=image_path,
-            requested_time=current_time,
-        )
+            await run_queue_call(
+                queue,
+                image_classification_service.enqueue_inference,
+                inference_id=inference_id,
+                user_id=user_id,
+                inference_engine=inference_engine,
+                image_path=image_path,
+                requested_time=current_time,
+                deadline_at=deadline_at,
+                requested_engine=requested_engine,
+                image_hash=image_hash,
+            )
 
     try:
-        image_classification_service = ImageClassificationService(queue, s3_client)
         current_time = datetime.now().strftime("%Y%m%d%H%M%S%f")
         inference_id = f"SI-{current_time}-{user_id}"
-        image_data = await image.read()
+        image_size = get_upload_size(image)
+        # 큰 이미지는 메모리에 올리지 않고 업로드 임시 파일에서 나누어 전송
+        if image_size > env.S3_MULTIPART_THRESHOLD_BYTES:
+            image_data = open_upload_spool(image)
+        else:
+            image_data = await image.read()
+
+        if reusable_result is not None:
+            reused_log, distance = reusable_result
+            background_tasks.add_task(
+                upload_and_reuse_result,
+                image_classification_service,
+                image_data,
+                inference_id,
+                user_id,
+                requested_engine,
+                current_time,
+                image_size,
+                reused_log,
+            )
+            response.status_code = status.HTTP_200_OK
+            return ImageClassificationCommonResponseSchema(
+                status={"msg": "completed"},
+                data={
+                    "inference_id": inference_id,
+                    "inference_engine": reused_log["inference_engine"],
+                    "result": reused_log["result"],
+                    "duplicate_of": reused_log["inference_id"],
+                    "hamming_distance": distance,
+                },
+            )
+
         background_tasks.add_task(
             upload_and_enqueue,
             image_classification_service,
@@ -87,10 +457,16 @@ async def classify_single_image(
             user_id,
             inference_engine,
             current_time,
+            get_tracer().get_traceparent(),
+            get_deadline_at(deadline_seconds),
+            requested_engine,
+            image_size,
+            image_hash,
         )
 
         return ImageClassificationCommonResponseSchema(
-            status={"msg": "processing"}, data={"inference_id": inference_id}
+            status={"msg": "processing"},
+            data={"inference_id": inference_id, "inference_engine": inference_engine},
         )
     except Exception as e:
         response.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -111,10 +487,19 @@ async def classify_images_from_zip(
     background_tasks: BackgroundTasks,
     user_id: str = Form(...),
     inference_engine: str = Form(...),
+    deadline_seconds: Optional[float] = Form(None),
     queue: IQueue = Depends(get_queue),
     s3_client: IObjectStorage = Depends(get_s3_client),
+    admission_controller: IAdmissionController = Depends(get_admission_controller),
+    engine_router: IEngineRouter = Depends(get_engine_router),
+    result_cache: IResultCache = Depends(get_result_cache),
+    near_duplicate_index: INearDuplicateIndex = Depends(get_near_duplicate_index),
 ) -> ImageClassificationCommonResponseSchema:
-    if inference_engine not in SUPPORTED_INFERENCE_ENGINES:
+    requested_engine = inference_engine
+    if (
+        requested_engine not in ROUTED_INFERENCE_ENGINES
+        and requested_engine not in SUPPORTED_INFERENCE_ENGINES
+    ):
         response.status_code = status.HTTP_400_BAD_REQUEST
         return ImageClassificationCommonResponseSchema(
             status={"msg": "not supported inference engine type"}, data={}
@@ -127,67 +512,467 @@ async def classify_images_from_zip(
         user_id,
         inference_engine,
         current_time,
+        batch_id,
+        deadline_at,
+        image_size,
     ):
+        # 스트리밍으로 올리는 큰 항목은 해시를 계산하지 않고 그대로 대기열에 추가
+        image_hash = None
+        if env.NEAR_DUPLICATE_ENABLED and isinstance(image_data, bytes):
+            image_hash = await run_in_threadpool(
+                compute_image_hash, BytesIO(image_data)
+            )
+            reusable_result = await find_reusable_result(
+                image_classification_service,
+                result_cache,
+                image_hash,
+                user_id,
+                requested_engine,
+            )
+            if reusable_result is not None:
+                await upload_and_reuse_result(
+                    image_classification_service,
+                    image_data,
+                    inference_id,
+                    user_id,
+                    requested_engine,
+                    current_time,
+                    image_size,
+                    reusable_result[0],
+                    batch_id,
+                )
+                return
 
         image_path = await image_classification_service.upload_image_to_s3_with_id(
-            inference_id, image_data
+            inference_id, image_data, image_size
         )
 
-        image_classification_service.enqueue_inference(
+        await run_queue_call(
+            queue,
+            image_classification_service.enqueue_inference,
             inference_id=inference_id,
             user_id=user_id,
             inference_engine=inference_engine,
             image_path=image_path,
             requested_time=current_time,
+            batch_id=batch_id,
+            deadline_at=deadline_at,
+            requested_engine=requested_engine,
+            image_hash=image_hash,
         )
 
+    zip_file_stream = None
     try:
-        image_classification_service = ImageClassificationService(queue, s3_client)
+        image_classification_service = ImageClassificationService(
+            queue, s3_client, near_duplicate_index
+        )
         current_time = datetime.now().strftime("%Y%m%d%H%M%S%f")
-        inference_ids = []
-        zip_file_bytes = await zip_file.read()
-        zip_file_stream = BytesIO(zip_file_bytes)
+        batch_id = f"BI-{current_time}-{user_id}"
+        # 큰 ZIP은 메모리로 읽지 않고 업로드 임시 파일에서 바로 엽니다
+        if get_upload_size(zip_file) > env.S3_MULTIPART_THRESHOLD_BYTES:
+            zip_file_stream = open_upload_spool(zip_file)
+        else:
+            zip_file_stream = BytesIO(await zip_file.read())
 
-        with zipfile.ZipFile(zip_file_stream, "r") as myzip:
-            for idx, file_name in enumerate(myzip.namelist()):
-                if file_name.lower().endswith(("png", "jpg", "jpeg", "webp")):
-                    inference_id = f"BI-{current_time}-{user_id}-{idx}"
-                    inference_ids.append(inference_id)
+        # 헤더 검사를 통과한 이미지만 업로드하고, 거절된 항목은 응답으로 알려줌
+        entries, rejected_entries = await run_in_threadpool(
+            inspect_zip_entries, zip_file_stream, env.IMAGE_MAX_PIXELS
+        )
+        for rejected_entry in rejected_entries:
+            UPLOAD_REJECTED.labels(rejected_entry["reason"]).inc()
+        inference_ids = [f"{batch_id}-{idx}" for idx, _ in entries]
+
+        # ZIP 전체를 하나의 엔진으로 보내므로 이미지 수를 반영하여 선택
+        inference_engine = resolve_inference_engine(
+            engine_router, requested_engine, max(len(inference_ids), 1)
+        )
+
+        rejected_response = await check_admission(
+            admission_controller,
+            queue,
+            response,
+            inference_engine,
+            user_id,
+            max(len(inference_ids), 1),
+        )
+        if rejected_response:
+            zip_file_stream.close()
+            return rejected_response
+
+        traceparent = get_tracer().get_traceparent()
+        deadline_at = get_deadline_at(deadline_seconds)
 
         async def process_zip_file():
-            with zipfile.ZipFile(zip_file_stream, "r") as myzip:
-                for idx, file_name in enumerate(myzip.namelist()):
-                    if file_name.lower().endswith(("png", "jpg", "jpeg", "webp")):
-                        with myzip.open(file_name) as file:
-                            try:
+            with zip_file_stream, get_tracer().start_span(
+                "api.process_zip_file",
+                parent=traceparent,
+                attributes={"batch_id": batch_id},
+            ), zipfile.ZipFile(zip_file_stream, "r") as myzip:
+                for idx, file_name in entries:
+                    # 취소되었거나 마감이 지난 배치는 남은 이미지를 올리지 않음
+                    if (
+                        deadline_at and time.time() > deadline_at
+                    ) or image_classification_service.is_batch_cancelled(batch_id):
+                        break
+                    with myzip.open(file_name) as file:
+                        try:
+                            image_size = myzip.getinfo(file_name).file_size
+                            if image_size > env.S3_MULTIPART_THRESHOLD_BYTES:
+                                # 압축을 풀면서 청크 단위로 업로드
+                                image_data = file
+                            else:
                                 image_data = file.read()
                                 if not isinstance(image_data, bytes):
                                     continue
 
-                                await upload_and_enqueue(
-                                    image_classification_service,
-                                    image_data,
-                                    f"BI-{current_time}-{user_id}-{idx}",
-                                    user_id,
-                                    inference_engine,
-                                    current_time,
-                                )
-                            except Exception as e:
-                                print(
-                                    f"[Error] processing message: {file_name} {str(e)}"
-                                )
+                            await upload_and_enqueue(
+                                image_classification_service,
+                                image_data,
+                                f"{batch_id}-{idx}",
+                                user_id,
+                                inference_engine,
+                                current_time,
+                                batch_id,
+                                deadline_at,
+                                image_size,
+                            )
+                        except Exception as e:
+                            print(f"[Error] processing message: {file_name} {str(e)}")
 
         background_tasks.add_task(process_zip_file)
 
         return ImageClassificationCommonResponseSchema(
-            status={"msg": "processing"}, data={"inference_ids": inference_ids}
+            status={"msg": "processing"},
+            data={
+                "batch_id": batch_id,
+                "inference_ids": inference_ids,
+                "inference_engine": inference_engine,
+                "rejected": rejected_entries,
+            },
         )
 
     except Exception as e:
+        if zip_file_stream is not None:
+            zip_file_stream.close()
         response.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
         return ImageClassificationCommonResponseSchema(status={"msg": str(e)}, data={})
 
 
+@InferenceRouter.post(
+    "/tensor-classify",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=ImageClassificationCommonResponseSchema,
+    summary="디코딩된 텐서 분류",
+    description="uint8 RGB 텐서(NPY, (H, W, 3) 또는 (N, H, W, 3))를 S3에 업로드하고, 이미지 디코딩과 리사이즈 없이 추론 대기열에 추가한 후 추론 ID를 반환합니다.",
+    response_description="상태 메시지와 추론 ID(여러 장이면 배치 ID와 추론 ID 목록)를 반환합니다.",
+)
+async def classify_tensors(
+    response: Response,
+    tensor: UploadFile,
+    background_tasks: BackgroundTasks,
+    user_id: str = Form(...),
+    inference_engine: str = Form("tflite"),
+    deadline_seconds: Optional[float] = Form(None),
+    queue: IQueue = Depends(get_queue),
+    s3_client: IObjectStorage = Depends(get_s3_client),
+    admission_controller: IAdmissionController = Depends(get_admission_controller),
+    engine_router: IEngineRouter = Depends(get_engine_router),
+) -> ImageClassificationCommonResponseSchema:
+    requested_engine = inference_engine
+    if (
+        requested_engine not in ROUTED_INFERENCE_ENGINES
+        and requested_engine not in SUPPORTED_INFERENCE_ENGINES
+    ):
+        response.status_code = status.HTTP_400_BAD_REQUEST
+        return ImageClassificationCommonResponseSchema(
+            status={"msg": "not supported inference engine type"}, data={}
+        )
+
+    tensor_size = get_upload_size(tensor)
+    tensor_header = await run_in_threadpool(
+        inspect_tensor_header, tensor.file, tensor_size, env.TENSOR_INGEST_IMAGE_SIZE
+    )
+    if not tensor_header.valid:
+        UPLOAD_REJECTED.labels(tensor_header.reason).inc()
+        response.status_code = status.HTTP_400_BAD_REQUEST
+        return ImageClassificationCommonResponseSchema(
+            status={"msg": "invalid tensor"}, data={"reason": tensor_header.reason}
+        )
+
+    # (H, W, 3)은 단일 요청, (N, H, W, 3)은 ZIP 일괄 요청과 같은 배치로 처리
+    is_batch = len(tensor_header.shape) == 4
+    frame_shape = list(tensor_header.shape[-3:])
+    frame_count = tensor_header.shape[0] if is_batch else 1
+    frame_bytes = frame_shape[0] * frame_shape[1] * frame_shape[2]
+
+    inference_engine = resolve_inference_engine(
+        engine_router, requested_engine, frame_count
+    )
+    rejected_response = await check_admission(
+        admission_controller, queue, response, inference_engine, user_id, frame_count
+    )
+    if rejected_response:
+        return rejected_response
+
+    async def upload_and_enqueue(
+        image_classification_service,
+        tensor_data,
+        object_key,
+        inference_ids,
+        batch_id,
+        current_time,
+        traceparent,
+        deadline_at,
+    ):
+        with get_tracer().start_span(
+            "api.upload_and_enqueue",
+            parent=traceparent,
+            attributes={"object_key": object_key},
+        ):
+            try:
+                # 여러 장의 텐서를 객체 하나로 올리고, 각 추론은 자기 구간만 읽음
+                tensor_path = await image_classification_service.upload_tensor_to_s3(
+                    object_key, tensor_data, tensor_size
+                )
+            finally:
+                if not isinstance(tensor_data, bytes):
+                    tensor_data.close()
+
+            for idx, inference_id in enumerate(inference_ids):
+                if batch_id and (
+                    (deadline_at and time.time() > deadline_at)
+                    or image_classification_service.is_batch_cancelled(batch_id)
+                ):
+                    break
+                await run_queue_call(
+                    queue,
+                    image_classification_service.enqueue_inference,
+                    inference_id=inference_id,
+                    user_id=user_id,
+                    inference_engine=inference_engine,
+                    image_path=tensor_path,
+                    requested_time=current_time,
+                    batch_id=batch_id,
+                    deadline_at=deadline_at,
+                    requested_engine=requested_engine,
+                    object_key=object_key,
+                    tensor_offset=tensor_header.data_offset + idx * frame_bytes,
+                    tensor_shape=frame_shape,
+                    tensor_index=idx,
+                )
+
+    try:
+        image_classification_service = ImageClassificationService(queue, s3_client)
+        current_time = datetime.now().strftime("%Y%m%d%H%M%S%f")
+        if is_batch:
+            batch_id = f"BI-{current_time}-{user_id}"
+            inference_ids = [f"{batch_id}-{idx}" for idx in range(frame_count)]
+            object_key = f"TENSORS/{batch_id}.npy"
+        else:
+            batch_id = None
+            inference_ids = [f"SI-{current_time}-{user_id}"]
+            object_key = f"TENSORS/{inference_ids[0]}.npy"
+
+        # 큰 텐서는 메모리에 올리지 않고 업로드 임시 파일에서 나누어 전송
+        if tensor_size > env.S3_MULTIPART_THRESHOLD_BYTES:
+            tensor_data = open_upload_spool(tensor)
+        else:
+            tensor_data = await tensor.read()
+        background_tasks.add_task(
+            upload_and_enqueue,
+            image_classification_service,
+            tensor_data,
+            object_key,
+            inference_ids,
+            batch_id,
+            current_time,
+            get_tracer().get_traceparent(),
+            get_deadline_at(deadline_seconds),
+        )
+
+        data = {"inference_engine": inference_engine}
+        if is_batch:
+            data.update({"batch_id": batch_id, "inference_ids": inference_ids})
+        else:
+            data["inference_id"] = inference_ids[0]
+        return ImageClassificationCommonResponseSchema(
+            status={"msg": "processing"}, data=data
+        )
+    except Exception as e:
+        response.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+        return ImageClassificationCommonResponseSchema(status={"msg": str(e)}, data={})
+
+
+@InferenceRouter.post(
+    "/prefix-classify",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=ImageClassificationCommonResponseSchema,
+    summary="버킷 경로(prefix) 일괄 분류",
+    description="버킷에 이미 있는 이미지를 prefix로 나열하거나 매니페스트 객체(한 줄에 하나씩 prefix 기준 키)로 지정하여, 이미지를 API로 다시 올리지 않고 페이지 단위로 추론 대기열에 추가합니다. 워커는 각 객체를 원래 키에서 바로 읽으며, 대기열이 밀려 있으면 다음 페이지 추가를 미룹니다.",
+    response_description="상태 메시지와 배치 ID를 반환합니다. 추론 ID는 나열 순서대로 {batch_id}-{index}이며, 모두 추가되면 배치 이벤트로 enqueued 메시지가 전달됩니다.",
+)
+async def classify_images_from_prefix(
+    response: Response,
+    background_tasks: BackgroundTasks,
+    user_id: str = Form(...),
+    inference_engine: str = Form(...),
+    prefix: str = Form(""),
+    manifest_key: Optional[str] = Form(None),
+    deadline_seconds: Optional[float] = Form(None),
+    queue: IQueue = Depends(get_queue),
+    s3_client: IObjectStorage = Depends(get_s3_client),
+    admission_controller: IAdmissionController = Depends(get_admission_controller),
+    engine_router: IEngineRouter = Depends(get_engine_router),
+) -> ImageClassificationCommonResponseSchema:
+    requested_engine = inference_engine
+    if (
+        requested_engine not in ROUTED_INFERENCE_ENGINES
+        and requested_engine not in SUPPORTED_INFERENCE_ENGINES
+    ):
+        response.status_code = status.HTTP_400_BAD_REQUEST
+        return ImageClassificationCommonResponseSchema(
+            status={"msg": "not supported inference engine type"}, data={}
+        )
+    if not prefix and not manifest_key:
+        response.status_code = status.HTTP_400_BAD_REQUEST
+        return ImageClassificationCommonResponseSchema(
+            status={"msg": "prefix or manifest_key is required"}, data={}
+        )
+    # 서비스가 올린 객체는 로그 보관 기간이 지나면 삭제되므로 입력으로 받지 않음
+    if prefix.startswith(SERVICE_OBJECT_PREFIXES):
+        response.status_code = status.HTTP_400_BAD_REQUEST
+        return ImageClassificationCommonResponseSchema(
+            status={"msg": "prefix points to service-managed objects"}, data={}
+        )
+
+    # 전체 개수는 나열이 끝나야 알 수 있으므로 한 페이지 크기로 엔진을 고르고,
+    # 이후 페이지는 대기열 길이를 보며 추가하여 대기열 상한을 넘지 않도록 함
+    inference_engine = resolve_inference_engine(
+        engine_router, requested_engine, max(1, env.PREFIX_BATCH_PAGE_SIZE)
+    )
+    # 전체 개수를 모르므로 여기서는 첫 객체분만 차감하고, 나머지는 페이지마다 차감
+    rejected_response = await check_admission(
+        admission_controller, queue, response, inference_engine, user_id, 1
+    )
+    if rejected_response:
+        return rejected_response
+
+    image_classification_service = ImageClassificationService(queue, s3_client)
+    current_time = datetime.now().strftime("%Y%m%d%H%M%S%f")
+    batch_id = f"BI-{current_time}-{user_id}"
+    traceparent = get_tracer().get_traceparent()
+    deadline_at = get_deadline_at(deadline_seconds)
+
+    def is_stopped() -> bool:
+        return bool(
+            deadline_at and time.time() > deadline_at
+        ) or image_classification_service.is_batch_cancelled(batch_id)
+
+    async def wait_for_queue() -> bool:
+        # 대기열이 밀려 있으면 워커가 따라잡을 때까지 다음 페이지를 미룸
+        while not is_stopped():
+            queue_length = await run_in_threadpool(
+                queue.get_queue_length, inference_engine
+            )
+            if queue_length <= env.PREFIX_BATCH_MAX_QUEUE_LENGTH:
+                return True
+            await asyncio.sleep(env.PREFIX_BATCH_POLL_SECONDS)
+        return False
+
+    prepaid_count = 1
+
+    async def charge_user_tokens(object_keys: List[str]) -> Tuple[List[str], str]:
+        """페이지의 객체 수만큼 사용자 토큰을 차감하고, 차감된 앞부분만 반환합니다."""
+        nonlocal prepaid_count
+        charged_count = min(prepaid_count, len(object_keys))
+        prepaid_count -= charged_count
+        chunk_size = len(object_keys)
+        while charged_count < len(object_keys):
+            cost = min(chunk_size, len(object_keys) - charged_count)
+            decision = await run_in_threadpool(
+                admission_controller.consume_user_tokens, user_id, cost
+            )
+            if decision.allowed:
+                charged_count += cost
+            elif decision.reason == "burst_exceeded" and 0 < decision.limit < cost:
+                # 페이지가 버스트보다 크면 버스트 크기로 나누어 차감
+                chunk_size = decision.limit
+            else:
+                ADMISSION_REJECTED.labels(inference_engine, decision.reason).inc()
+                return object_keys[:charged_count], decision.reason
+        return object_keys, ""
+
+    async def enqueue_object_pages():
+        enqueued_count = 0
+        stop_reason = ""
+        with get_tracer().start_span(
+            "api.enqueue_object_pages",
+            parent=traceparent,
+            attributes={"batch_id": batch_id},
+        ):
+            try:
+                async for object_keys in image_classification_service.list_object_pages(
+                    prefix, manifest_key, env.PREFIX_BATCH_PAGE_SIZE
+                ):
+                    if not await wait_for_queue():
+                        break
+                    # 토큰이 바닥나면 차감된 객체까지만 넣고 나열을 멈춤
+                    object_keys, stop_reason = await charge_user_tokens(object_keys)
+                    messages = [
+                        image_classification_service.make_inference_message(
+                            inference_id=f"{batch_id}-{enqueued_count + idx}",
+                            user_id=user_id,
+                            inference_engine=inference_engine,
+                            image_path=f"/{env.S3_SCALITY_BUCKET}/{object_key}",
+                            requested_time=current_time,
+                            batch_id=batch_id,
+                            deadline_at=deadline_at,
+                            requested_engine=requested_engine,
+                            object_key=object_key,
+                        )
+                        for idx, object_key in enumerate(object_keys)
+                    ]
+                    if messages:
+                        await run_in_threadpool(
+                            image_classification_service.enqueue_inferences,
+                            messages,
+                            inference_engine,
+                        )
+                    enqueued_count += len(messages)
+                    if stop_reason:
+                        break
+            except Exception as e:
+                logging.error(f"[ERROR] Failed to enqueue objects: {batch_id} {e}")
+
+        logging.info(f"[LOG] Prefix batch enqueued : {batch_id} ({enqueued_count})")
+        try:
+            get_notifier().publish_completion(
+                {
+                    "status": {"msg": "enqueued"},
+                    "data": {
+                        "batch_id": batch_id,
+                        "inference_engine": inference_engine,
+                        "enqueued_count": enqueued_count,
+                        "stop_reason": stop_reason or None,
+                    },
+                },
+                batch_id,
+            )
+        except Exception as e:
+            logging.error(f"[ERROR] Failed to publish batch event: {e}")
+
+    background_tasks.add_task(enqueue_object_pages)
+    return ImageClassificationCommonResponseSchema(
+        status={"msg": "processing"},
+        data={
+            "batch_id": batch_id,
+            "inference_engine": inference_engine,
+            "prefix": prefix,
+            "manifest_key": manifest_key,
+        },
+    )
+
+
 @InferenceRouter.get(
     "/classify/{inference_id}",
     status_code=status.HTTP_202_ACCEPTED,
@@ -201,32 +986,118 @@ async def get_inference_status(
     response: Response,
     db: Session = Depends(get_db),
     queue: IQueue = Depends(get_queue),
+    result_cache: IResultCache = Depends(get_result_cache),
+    if_none_match: Optional[str] = Header(None),
 ) -> ImageClassificationCommonResponseSchema:
     try:
+        # 조건부 요청은 캐시된 결과와 먼저 비교하여, 같으면 대기열과 DB를 조회하지 않음
+        if if_none_match:
+            cached_log = await run_in_threadpool(result_cache.get, inference_id)
+            if cached_log:
+                cache_headers = make_result_cache_headers(cached_log)
+                if etag_matches(if_none_match, cache_headers["ETag"]):
+                    return Response(
+                        status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers
+                    )
+
         image_classification_service = ImageClassificationService(queue, None)
         inference_log_service = InferenceLogService(db)
-        inference_queue_log = image_classification_service.find_inference_queue_by_id(
-            inference_id
+        inference_queue_log = await run_queue_call(
+            queue, image_classification_service.find_inference_queue_by_id, inference_id
         )
         if inference_queue_log:
             response.status_code = status.HTTP_202_ACCEPTED
+            response.headers["Cache-Control"] = "no-store"
             return ImageClassificationCommonResponseSchema(
                 status={"msg": "processing"}, data=inference_queue_log
             )
 
-        inference_finish_log = inference_log_service.find_inference_log_by_id(
-            inference_id
+        # 완료된 결과는 Redis 캐시에서 응답하고, 캐시 미스 시 동시 조회를 하나로 합쳐 DB를 조회
+        inference_finish_log = await result_cache.get_or_load(
+            inference_id,
+            lambda: run_in_threadpool(
+                inference_log_service.find_serialized_inference_log_by_id,
+                inference_id,
+            ),
         )
         if inference_finish_log:
+            # 삭제 시 removed_at이 바뀌어 ETag도 변경됨
+            cache_headers = make_result_cache_headers(inference_finish_log)
+            if etag_matches(if_none_match, cache_headers["ETag"]):
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers
+                )
             response.status_code = status.HTTP_200_OK
+            response.headers.update(cache_headers)
+            inference_finish_log = json.loads(inference_finish_log)
+            # 워커가 처리하지 못한 추론은 오류 내용과 함께 failed로 응답
+            result_status = "failed" if inference_finish_log.get("error") else "completed"
             return ImageClassificationCommonResponseSchema(
-                status={"msg": "completed"}, data=inference_finish_log
+                status={"msg": result_status}, data=inference_finish_log
             )
 
         response.status_code = status.HTTP_200_OK
+        response.headers["Cache-Control"] = "no-store"
         return ImageClassificationCommonResponseSchema(
             status={"msg": "no data"}, data={}
         )
+    except Exception as e:
+        response.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+        response.headers["Cache-Control"] = "no-store"
+        return ImageClassificationCommonResponseSchema(status={"msg": str(e)}, data={})
+
+
+@InferenceRouter.delete(
+    "/classify/{inference_id}",
+    status_code=status.HTTP_200_OK,
+    response_model=ImageClassificationCommonResponseSchema,
+    summary="추론 작업 취소",
+    description="대기 중인 추론 작업을 취소합니다. 이미 워커가 가져간 작업도 추론 전이라면 처리하지 않습니다.",
+    response_description="대기열에서 제거된 작업 수를 반환합니다.",
+)
+async def cancel_inference(
+    inference_id: str,
+    response: Response,
+    queue: IQueue = Depends(get_queue),
+) -> ImageClassificationCommonResponseSchema:
+    try:
+        image_classification_service = ImageClassificationService(queue, None)
+        cancelled = await run_in_threadpool(
+            image_classification_service.cancel_inference, inference_id=inference_id
+        )
+        response.status_code = status.HTTP_200_OK
+        return ImageClassificationCommonResponseSchema(
+            status={"msg": "cancelled"},
+            data={"inference_id": inference_id, "cancelled": cancelled},
+        )
+    except Exception as e:
+        response.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+        return ImageClassificationCommonResponseSchema(status={"msg": str(e)}, data={})
+
+
+@InferenceRouter.delete(
+    "/batch-classify/{batch_id}",
+    status_code=status.HTTP_200_OK,
+    response_model=ImageClassificationCommonResponseSchema,
+    summary="일괄 추론 작업 취소",
+    description="배치 ID에 속한 대기 중인 추론 작업을 한 번에 취소하고, 아직 업로드되지 않은 ZIP 내 이미지는 대기열에 추가하지 않습니다.",
+    response_description="대기열에서 제거된 작업 수를 반환합니다.",
+)
+async def cancel_batch_inference(
+    batch_id: str,
+    response: Response,
+    queue: IQueue = Depends(get_queue),
+) -> ImageClassificationCommonResponseSchema:
+    try:
+        image_classification_service = ImageClassificationService(queue, None)
+        cancelled = await run_in_threadpool(
+            image_classification_service.cancel_inference, batch_id=batch_id
+        )
+        response.status_code = status.HTTP_200_OK
+        return ImageClassificationCommonResponseSchema(
+            status={"msg": "cancelled"},
+            data={"batch_id": batch_id, "cancelled": cancelled},
+        )
     except Exception as e:
         response.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
         return ImageClassificationCommonResponseSchema(status={"msg": str(e)}, data={})
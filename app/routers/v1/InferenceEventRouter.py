@@ -0,0 +1,208 @@
+from fastapi import (
+    APIRouter,
+    Depends,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, Optional
+import json
+import logging
+import time
+from app.schemas.ImageClassificationSchema import (
+    ImageClassificationCommonResponseSchema,
+)
+from app.services.InferenceLogService import InferenceLogService
+from app.infrastructure.Environment import get_environment_variables
+from app.infrastructure.Interfaces import (
+    INotifier,
+    IResultCache,
+    get_db,
+    get_notifier,
+    get_result_cache,
+)
+
+EventRouter = APIRouter(prefix="/api/v1/events", tags=["event"])
+env = get_environment_variables()
+# keep-alive 간격 (유휴 제한 시간이 더 짧으면 그 간격으로 확인)
+KEEP_ALIVE_SECONDS = 15.0
+
+
+async def find_completed_event(
+    db: Session, result_cache: IResultCache, inference_id: str
+) -> Optional[Dict]:
+    inference_log_service = InferenceLogService(db)
+    inference_finish_log = await result_cache.get_or_load(
+        inference_id,
+        lambda: run_in_threadpool(
+            inference_log_service.find_serialized_inference_log_by_id, inference_id
+        ),
+    )
+    if inference_finish_log:
+        inference_finish_log = json.loads(inference_finish_log)
+        result_status = "failed" if inference_finish_log.get("error") else "completed"
+        return {"status": {"msg": result_status}, "data": inference_finish_log}
+    return None
+
+
+async def open_subscription(
+    notifier: INotifier,
+    result_cache: IResultCache,
+    db: Session,
+    inference_id: Optional[str],
+    batch_id: Optional[str],
+    user_id: Optional[str],
+):
+    events = notifier.listen(
+        inference_id=inference_id,
+        batch_id=batch_id,
+        user_id=user_id,
+        idle_timeout=min(KEEP_ALIVE_SECONDS, env.EVENT_STREAM_IDLE_TIMEOUT_SECONDS),
+    )
+    # 구독이 완료된 뒤에 기존 결과를 조회해야 그 사이에 끝난 추론을 놓치지 않음
+    try:
+        await anext(events)
+        completed_event = None
+        if inference_id:
+            completed_event = await find_completed_event(
+                db, result_cache, inference_id
+            )
+    except BaseException:
+        await events.aclose()
+        raise
+    return events, completed_event
+
+
+async def iterate_events(
+    events: AsyncIterator[Optional[Dict]],
+    completed_event: Optional[Dict],
+    inference_id: Optional[str],
+    single_target: bool,
+) -> AsyncIterator[Optional[Dict]]:
+    async with aclosing(events):
+        if completed_event:
+            yield completed_event
+            if single_target:
+                return
+        # 이벤트가 오지 않는 구독이 keep-alive만 받으며 끝없이 열려 있지 않도록 종료
+        idle_since = time.monotonic()
+        idle_timeout = env.EVENT_STREAM_IDLE_TIMEOUT_SECONDS
+        async for event in events:
+            if event is None:
+                if time.monotonic() - idle_since >= idle_timeout:
+                    yield {"status": {"msg": "timeout"}, "data": {}}
+                    return
+            else:
+                idle_since = time.monotonic()
+            yield event
+            if (
+                event
+                and single_target
+                and event["data"].get("inference_id") == inference_id
+            ):
+                return
+
+
+@EventRouter.get(
+    "/classify",
+    summary="추론 완료 이벤트 구독 (SSE)",
+    description="추론 ID, 배치 ID 또는 사용자 ID로 구독하여 추론이 완료되는 즉시 Server-Sent Events로 결과를 수신합니다.",
+    response_description="text/event-stream 형식의 완료 이벤트 스트림을 반환합니다.",
+)
+async def stream_inference_events(
+    request: Request,
+    response: Response,
+    inference_id: Optional[str] = Query(None),
+    batch_id: Optional[str] = Query(None),
+    user_id: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+    notifier: INotifier = Depends(get_notifier),
+    result_cache: IResultCache = Depends(get_result_cache),
+):
+    if not (inference_id or batch_id or user_id):
+        response.status_code = status.HTTP_400_BAD_REQUEST
+        return ImageClassificationCommonResponseSchema(
+            status={"msg": "inference_id, batch_id or user_id is required"}, data={}
+        )
+
+    try:
+        events, completed_event = await open_subscription(
+            notifier, result_cache, db, inference_id, batch_id, user_id
+        )
+    except Exception as e:
+        logging.error(f"[ERROR] Failed to subscribe to inference events: {e}")
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return ImageClassificationCommonResponseSchema(
+            status={"msg": "event stream unavailable"}, data={}
+        )
+    single_target = bool(inference_id) and not (batch_id or user_id)
+
+    async def event_source():
+        async with aclosing(
+            iterate_events(events, completed_event, inference_id, single_target)
+        ) as stream:
+            async for event in stream:
+                if await request.is_disconnected():
+                    break
+                if event is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield f"event: {event['status']['msg']}\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@EventRouter.websocket("/ws")
+async def websocket_inference_events(
+    websocket: WebSocket,
+    inference_id: Optional[str] = Query(None),
+    batch_id: Optional[str] = Query(None),
+    user_id: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+    notifier: INotifier = Depends(get_notifier),
+    result_cache: IResultCache = Depends(get_result_cache),
+):
+    await websocket.accept()
+    if not (inference_id or batch_id or user_id):
+        await websocket.send_json(
+            {"status": {"msg": "inference_id, batch_id or user_id is required"}, "data": {}}
+        )
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    try:
+        events, completed_event = await open_subscription(
+            notifier, result_cache, db, inference_id, batch_id, user_id
+        )
+    except Exception as e:
+        logging.error(f"[ERROR] Failed to subscribe to inference events: {e}")
+        await websocket.send_json(
+            {"status": {"msg": "event stream unavailable"}, "data": {}}
+        )
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+        return
+    single_target = bool(inference_id) and not (batch_id or user_id)
+
+    try:
+        async with aclosing(
+            iterate_events(events, completed_event, inference_id, single_target)
+        ) as stream:
+            async for event in stream:
+                # 유휴 상태에서도 전송을 시도해야 끊어진 연결을 감지할 수 있음
+                await websocket.send_json(
+                    event if event is not None else {"status": {"msg": "keep-alive"}}
+                )
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
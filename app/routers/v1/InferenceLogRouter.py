@@ -5,7 +5,7 @@ from app.schemas.InferenceLogSchema import (
     InferenceLogCommonResponseSchema,
 )
 from app.services.InferenceLogService import InferenceLogService
-from app.infrastructure.Interfaces import get_db
+from app.infrastructure.Interfaces import IResultCache, get_db, get_result_cache
 
 LogRouter = APIRouter(prefix="/api/v1/logs", tags=["log"])
 
@@ -45,7 +45,10 @@ async def get_inference_log(
     response_description="로그가 삭제되었을 경우 성공 메시지를 반환하며, 존재하지 않을 경우 오류 메시지를 반환합니다.",
 )
 async def delete_inference_log(
-    inference_id: str, response: Response, db: Session = Depends(get_db)
+    inference_id: str,
+    response: Response,
+    db: Session = Depends(get_db),
+    result_cache: IResultCache = Depends(get_result_cache),
 ):
     try:
         inference_log_service = InferenceLogService(db)
@@ -64,6 +67,7 @@ async def delete_inference_log(
             )
 
         is_deleted = inference_log_service.delete_inference_log_by_id(inference_id)
+        result_cache.delete(inference_id)
 
         if not is_deleted:
             response.status_code = status.HTTP_404_NOT_FOUND
@@ -0,0 +1,139 @@
+from fastapi import APIRouter, Depends, Query, status, Response
+from sqlalchemy.orm import Session
+from app.schemas.ReprocessJobSchema import (
+    ReprocessJobRequestSchema,
+    ReprocessJobCommonResponseSchema,
+)
+from app.services.ReprocessJobService import ReprocessJobService
+from app.infrastructure.Interfaces import get_db
+from app.routers.v1.ImageClassificationRouter import SUPPORTED_INFERENCE_ENGINES
+
+ReprocessRouter = APIRouter(prefix="/api/v1/reprocess", tags=["reprocess"])
+
+
+@ReprocessRouter.post(
+    "/jobs",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=ReprocessJobCommonResponseSchema,
+    summary="재추론 작업 생성",
+    description="사용자/기간 조건에 맞는 추론 로그를 지정한 엔진으로 다시 추론하는 작업을 생성합니다. 작업은 백그라운드에서 실시간 요청을 방해하지 않도록 속도를 조절하며 실행됩니다.",
+    response_description="생성된 작업과 대상 로그 수를 반환합니다.",
+)
+async def create_reprocess_job(
+    request: ReprocessJobRequestSchema,
+    response: Response,
+    db: Session = Depends(get_db),
+):
+    if request.inference_engine not in SUPPORTED_INFERENCE_ENGINES:
+        response.status_code = status.HTTP_400_BAD_REQUEST
+        return ReprocessJobCommonResponseSchema(
+            status={"msg": "not supported inference engine type"}, data={}
+        )
+    try:
+        reprocess_job = ReprocessJobService(db).create_job(request)
+        return ReprocessJobCommonResponseSchema(
+            status={"msg": "queued"}, data={"job": reprocess_job}
+        )
+    except Exception as e:
+        response.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+        return ReprocessJobCommonResponseSchema(status={"msg": str(e)}, data={})
+
+
+@ReprocessRouter.get(
+    "/jobs/{job_id}",
+    response_model=ReprocessJobCommonResponseSchema,
+    summary="재추론 작업 조회",
+    description="작업 상태, 처리/실패 건수, 처리 속도(건/초), 예상 남은 시간과 체크포인트를 조회합니다.",
+    response_description="작업 진행 상황을 반환합니다.",
+)
+async def get_reprocess_job(
+    job_id: str,
+    response: Response,
+    db: Session = Depends(get_db),
+):
+    reprocess_job = ReprocessJobService(db).find_job_by_id(job_id)
+    if not reprocess_job:
+        response.status_code = status.HTTP_404_NOT_FOUND
+        return ReprocessJobCommonResponseSchema(
+            status={"msg": "error"}, data={"job": "no data"}
+        )
+    return ReprocessJobCommonResponseSchema(
+        status={"msg": "success"}, data={"job": reprocess_job}
+    )
+
+
+@ReprocessRouter.get(
+    "/jobs/{job_id}/results",
+    response_model=ReprocessJobCommonResponseSchema,
+    summary="재추론 결과 조회",
+    description="작업이 기록한 새 추론 결과를 inference_id 순서로 조회합니다.",
+    response_description="결과와 총 항목 수를 반환합니다.",
+)
+async def get_reprocess_results(
+    job_id: str,
+    page: int = Query(1, ge=1),
+    offset: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+):
+    results, total_count = ReprocessJobService(db).find_results(job_id, page, offset)
+    return ReprocessJobCommonResponseSchema(
+        status={"msg": "success"},
+        data={"total_count": total_count, "results": results},
+    )
+
+
+async def change_reprocess_job_status(
+    job_id: str, new_status: str, response: Response, db: Session
+) -> ReprocessJobCommonResponseSchema:
+    reprocess_job_service = ReprocessJobService(db)
+    if not reprocess_job_service.change_job_status(job_id, new_status):
+        reprocess_job = reprocess_job_service.find_job_by_id(job_id)
+        response.status_code = (
+            status.HTTP_409_CONFLICT if reprocess_job else status.HTTP_404_NOT_FOUND
+        )
+        return ReprocessJobCommonResponseSchema(
+            status={"msg": "error"}, data={"job": reprocess_job or "no data"}
+        )
+    return ReprocessJobCommonResponseSchema(
+        status={"msg": new_status},
+        data={"job": reprocess_job_service.find_job_by_id(job_id)},
+    )
+
+
+@ReprocessRouter.put(
+    "/jobs/{job_id}/pause",
+    response_model=ReprocessJobCommonResponseSchema,
+    summary="재추론 작업 일시 중지",
+    description="실행 중인 작업을 현재 청크가 끝난 뒤 멈춥니다. 마지막 체크포인트부터 다시 시작할 수 있습니다.",
+    response_description="변경된 작업 상태를 반환합니다.",
+)
+async def pause_reprocess_job(
+    job_id: str, response: Response, db: Session = Depends(get_db)
+):
+    return await change_reprocess_job_status(job_id, "paused", response, db)
+
+
+@ReprocessRouter.put(
+    "/jobs/{job_id}/resume",
+    response_model=ReprocessJobCommonResponseSchema,
+    summary="재추론 작업 재개",
+    description="일시 중지되었거나 실패한 작업을 마지막 체크포인트부터 다시 실행합니다.",
+    response_description="변경된 작업 상태를 반환합니다.",
+)
+async def resume_reprocess_job(
+    job_id: str, response: Response, db: Session = Depends(get_db)
+):
+    return await change_reprocess_job_status(job_id, "queued", response, db)
+
+
+@ReprocessRouter.delete(
+    "/jobs/{job_id}",
+    response_model=ReprocessJobCommonResponseSchema,
+    summary="재추론 작업 취소",
+    description="작업을 취소합니다. 이미 기록된 결과는 유지됩니다.",
+    response_description="변경된 작업 상태를 반환합니다.",
+)
+async def cancel_reprocess_job(
+    job_id: str, response: Response, db: Session = Depends(get_db)
+):
+    return await change_reprocess_job_status(job_id, "cancelled", response, db)
@@ -16,7 +16,12 @@ class InferenceLogResponseSchema(BaseModel):
     inference_id: str
     user_id: str
     inference_engine: str
+    requested_engine: Optional[str] = None
     image_path: str
+    tensor_path: Optional[str] = None
+    cascade_stage: Optional[int] = None
+    duplicate_of: Optional[str] = None
+    error: Optional[str] = None
     inference_time: float
     result: Dict[str, float]
     requested_time: str
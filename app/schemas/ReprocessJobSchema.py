@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+from typing import Any, Optional
+
+
+class ReprocessJobRequestSchema(BaseModel):
+    inference_engine: str = Field(..., description="Engine (model) to re-run with")
+    user_id: Optional[str] = Field(None, description="Only logs of this user")
+    start_time: Optional[str] = Field(None, description="Start time in ISO format")
+    end_time: Optional[str] = Field(None, description="End time in ISO format")
+
+
+class ReprocessJobCommonResponseSchema(BaseModel):
+    data: Any
+    status: Any
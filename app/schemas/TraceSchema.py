@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+from typing import Any
+
+
+class TraceCommonResponseSchema(BaseModel):
+    data: Any
+    status: Any
@@ -1,42 +1,351 @@
-from typing import List
+from typing import (
+    AsyncIterator,
+    BinaryIO,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+from app.infrastructure.NearDuplicateIndex import INearDuplicateIndex, NearDuplicate
 from app.infrastructure.ObjectStorage import IObjectStorage
 from app.infrastructure.Queue import IQueue
+from app.infrastructure.Interfaces import get_tracer
+from app.infrastructure.Environment import get_environment_variables
 from datetime import datetime
+from PIL import Image
+import numpy as np
+import time
+import warnings
+import zipfile
+
+IMAGE_EXTENSIONS = ("png", "jpg", "jpeg", "webp")
+# 서비스가 직접 올린 객체 (로그 보관 기간이 지나면 삭제되므로 다른 배치의 입력으로 쓰지 않음)
+SERVICE_OBJECT_PREFIXES = ("IMAGES/", "TENSORS/", "TENSOR_SHARDS/")
+# 파일 앞부분의 매직 바이트로 형식을 판별 (WEBP는 RIFF 컨테이너 안의 형식 식별자로 판별)
+# 단일 이미지 요청은 워커(cv2)가 디코딩할 수 있는 BMP, TIFF도 받음
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", "JPEG"),
+    (b"\x89PNG\r\n\x1a\n", "PNG"),
+    (b"BM", "BMP"),
+    (b"II*\x00", "TIFF"),
+    (b"MM\x00*", "TIFF"),
+)
+
+
+class ImageHeader(NamedTuple):
+    valid: bool
+    reason: str = ""
+    image_format: Optional[str] = None
+    width: int = 0
+    height: int = 0
+
+
+def sniff_image_format(header: bytes) -> Optional[str]:
+    for signature, image_format in IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return image_format
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "WEBP"
+    return None
+
+
+def inspect_image_header(file_obj: BinaryIO, max_pixels: int) -> ImageHeader:
+    """이미지를 디코딩하지 않고 헤더만 읽어 형식과 크기를 검사합니다.
+
+    검사 후 파일 위치는 처음으로 되돌립니다.
+    """
+    image_format = None
+    try:
+        header = file_obj.read(12)
+        if not header:
+            return ImageHeader(False, "empty")
+        image_format = sniff_image_format(header)
+        if image_format is None:
+            return ImageHeader(False, "unsupported_format")
+        file_obj.seek(0)
+        # Image.open은 헤더만 읽고 픽셀 데이터는 load() 전까지 디코딩하지 않음
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+            with Image.open(file_obj, formats=[image_format]) as image:
+                width, height = image.size
+    except Image.DecompressionBombError:
+        return ImageHeader(False, "too_many_pixels", image_format)
+    except Exception:
+        return ImageHeader(False, "corrupt_header", image_format)
+    finally:
+        file_obj.seek(0)
+
+    if width <= 0 or height <= 0:
+        return ImageHeader(False, "corrupt_header", image_format)
+    # 압축 폭탄 방지 : 디코딩 시 메모리 사용량은 픽셀 수에 비례
+    if max_pixels > 0 and width * height > max_pixels:
+        return ImageHeader(False, "too_many_pixels", image_format, width, height)
+    return ImageHeader(True, "", image_format, width, height)
+
+
+def compute_image_hash(file_obj: BinaryIO) -> Optional[int]:
+    """64비트 차이 해시(dHash)를 계산합니다. 디코딩할 수 없으면 None을 반환합니다.
+
+    9x8 흑백 축소 이미지에서 가로로 이웃한 픽셀의 밝기 비교 결과를 비트로 사용하므로,
+    재인코딩이나 크기 변경으로는 몇 비트만 바뀝니다. 계산 후 파일 위치는 처음으로 되돌립니다.
+    """
+    try:
+        with Image.open(file_obj) as image:
+            # JPEG는 DCT 단계에서 축소하여 전체 해상도 디코딩을 피함
+            image.draft("L", (64, 64))
+            pixels = np.asarray(
+                image.convert("L").resize((9, 8), Image.Resampling.BOX),
+                dtype=np.int16,
+            )
+    except Exception:
+        return None
+    finally:
+        file_obj.seek(0)
+    bits = np.packbits(pixels[:, 1:] > pixels[:, :-1])
+    return int.from_bytes(bits.tobytes(), "big")
+
+
+def inspect_zip_entries(
+    zip_file_stream: BinaryIO, max_pixels: int
+) -> Tuple[List[Tuple[int, str]], List[Dict[str, str]]]:
+    """ZIP 내 이미지 항목의 헤더를 검사하여 (순번, 파일명) 목록과 거절된 항목 목록을 반환합니다.
+
+    이미지 확장자가 아닌 항목은 어느 쪽에도 포함하지 않습니다.
+    """
+    entries, rejected_entries = [], []
+    with zipfile.ZipFile(zip_file_stream, "r") as myzip:
+        for idx, zip_info in enumerate(myzip.infolist()):
+            file_name = zip_info.filename
+            if zip_info.is_dir() or not file_name.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            try:
+                with myzip.open(zip_info) as file:
+                    header = inspect_image_header(file, max_pixels)
+            except Exception:
+                # 암호화되었거나 지원하지 않는 압축 방식의 항목
+                header = ImageHeader(False, "unreadable_entry")
+            if header.valid:
+                entries.append((idx, file_name))
+            else:
+                rejected_entries.append(
+                    {"file_name": file_name, "reason": header.reason}
+                )
+    return entries, rejected_entries
+
+
+class TensorHeader(NamedTuple):
+    valid: bool
+    reason: str = ""
+    shape: Tuple[int, ...] = ()
+    data_offset: int = 0
+
+
+def inspect_tensor_header(
+    file_obj: BinaryIO, file_size: int, image_size: int
+) -> TensorHeader:
+    """NPY 헤더만 읽어 uint8 RGB (H, W, 3) 또는 (N, H, W, 3) 텐서인지 검사합니다.
+
+    배열 데이터는 읽지 않으며, 검사 후 파일 위치는 처음으로 되돌립니다.
+    """
+    try:
+        version = np.lib.format.read_magic(file_obj)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file_obj)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file_obj)
+        data_offset = file_obj.tell()
+    except Exception:
+        return TensorHeader(False, "not_npy")
+    finally:
+        file_obj.seek(0)
+
+    if dtype != np.uint8 or fortran_order:
+        return TensorHeader(False, "unsupported_dtype")
+    frame_shape = (image_size, image_size, 3)
+    if tuple(shape[-3:]) != frame_shape or len(shape) not in (3, 4):
+        return TensorHeader(False, "unsupported_shape")
+    if len(shape) == 4 and shape[0] < 1:
+        return TensorHeader(False, "unsupported_shape")
+    if file_size != data_offset + int(np.prod(shape)):
+        return TensorHeader(False, "size_mismatch")
+    return TensorHeader(True, "", tuple(shape), data_offset)
 
 
 class ImageClassificationService:
     queue: IQueue
     s3_client: IObjectStorage
 
-    def __init__(self, queue: IQueue, s3_client: IObjectStorage):
+    def __init__(
+        self,
+        queue: IQueue,
+        s3_client: IObjectStorage,
+        near_duplicate_index: Optional[INearDuplicateIndex] = None,
+    ):
         self.queue = queue
         self.s3_client = s3_client
+        self.near_duplicate_index = near_duplicate_index
 
-    async def upload_image_to_s3_with_id(self, inference_id, upload_file):
-        image_upload = await self.s3_client.upload_file(
-            f"IMAGES/{inference_id}", upload_file
-        )
+    @staticmethod
+    def get_image_path(file_url: str) -> str:
+        # 엔드포인트나 로컬 경로 앞부분만 떼고 "/{버킷}/{객체 키}"를 그대로 남김
+        # (객체 키 안에 버킷 이름이 들어 있어도 잘리지 않도록 첫 위치에서 자름)
+        bucket_prefix = f"/{get_environment_variables().S3_SCALITY_BUCKET}/"
+        return file_url[file_url.index(bucket_prefix) :]
+
+    async def upload_image_to_s3_with_id(
+        self, inference_id, upload_file, file_size: Optional[int] = None
+    ):
+        with get_tracer().start_span("s3.upload", attributes={"inference_id": inference_id}):
+            if isinstance(upload_file, bytes):
+                image_upload = await self.s3_client.upload_file(
+                    f"IMAGES/{inference_id}", upload_file
+                )
+            else:
+                # 큰 업로드는 메모리에 올리지 않고 파일 객체에서 나누어 전송
+                image_upload = await self.s3_client.upload_fileobj(
+                    f"IMAGES/{inference_id}", upload_file, file_size
+                )
         return image_upload["file_url"]
 
-    def enqueue_inference(
+    def make_inference_message(
         self,
         inference_id: str,
         user_id: str,
         inference_engine: str,
         image_path: str,
         requested_time: datetime,
-    ):
+        batch_id: Optional[str] = None,
+        priority: Optional[str] = None,
+        deadline_at: Optional[float] = None,
+        requested_engine: Optional[str] = None,
+        object_key: Optional[str] = None,
+        tensor_offset: Optional[int] = None,
+        tensor_shape: Optional[List[int]] = None,
+        tensor_index: Optional[int] = None,
+        image_hash: Optional[int] = None,
+    ) -> Dict:
+        message = {
+            "inference_id": inference_id,
+            "user_id": user_id,
+            "inference_engine": inference_engine,
+            "image_path": self.get_image_path(image_path),
+            "requested_time": requested_time,
+        }
+        if batch_id:
+            message["batch_id"] = batch_id
+        # ZIP 일괄 요청은 단일 이미지 요청보다 뒤에 처리
+        message["priority"] = priority or ("batch" if batch_id else "interactive")
+        if requested_engine and requested_engine != inference_engine:
+            message["requested_engine"] = requested_engine
+        if deadline_at:
+            # 이 시각이 지나면 워커가 처리하지 않고 버림
+            message["deadline_at"] = deadline_at
+        if object_key:
+            # 기본 위치(IMAGES/{inference_id})가 아닌 객체에서 입력을 읽음
+            message["object_key"] = object_key
+        if tensor_offset is not None:
+            # 디코딩된 텐서 : 워커가 객체의 해당 구간만 읽어 디코딩 없이 추론
+            message["tensor_offset"] = tensor_offset
+            message["tensor_shape"] = list(tensor_shape)
+            message["tensor_index"] = tensor_index or 0
+        if image_hash is not None:
+            # 워커가 결과를 저장한 뒤 유사 이미지 색인에 등록
+            message["image_hash"] = f"{image_hash:016x}"
+        return message
 
-        self.queue.enqueue_message(
-            {
-                "inference_id": inference_id,
-                "user_id": user_id,
-                "inference_engine": inference_engine,
-                "image_path": "/bucketimg" + image_path.split("/bucketimg")[1],
-                "requested_time": requested_time,
-            },
-            inference_engine,
+    def enqueue_inference(self, inference_id: str, inference_engine: str, **kwargs):
+        message = self.make_inference_message(
+            inference_id=inference_id, inference_engine=inference_engine, **kwargs
         )
+        tracer = get_tracer()
+        with tracer.start_span("queue.enqueue", attributes={"inference_id": inference_id}):
+            # 워커가 같은 트레이스에 스팬을 이어 붙이고 큐 대기 시간을 계산할 수 있도록 전달
+            message["traceparent"] = tracer.get_traceparent()
+            message["enqueued_at"] = time.time()
+            self.queue.enqueue_message(message, inference_engine)
+
+    def enqueue_inferences(self, messages: List[Dict], inference_engine: str):
+        tracer = get_tracer()
+        with tracer.start_span("queue.enqueue", attributes={"count": len(messages)}):
+            traceparent = tracer.get_traceparent()
+            enqueued_at = time.time()
+            for message in messages:
+                message["traceparent"] = traceparent
+                message["enqueued_at"] = enqueued_at
+            self.queue.enqueue_messages(messages, inference_engine)
+
+    async def list_object_pages(
+        self, prefix: str, manifest_key: Optional[str], page_size: int
+    ) -> AsyncIterator[List[str]]:
+        """버킷의 객체 키를 페이지 단위로 반환합니다.
+
+        manifest_key가 있으면 그 객체에 한 줄에 하나씩 적힌 키(prefix 기준 상대 경로)를
+        사용하고, 없으면 prefix 아래의 이미지 객체를 나열합니다.
+        """
+        page_size = max(1, page_size)
+        if manifest_key:
+            manifest = await self.s3_client.download_file(manifest_key)
+            object_keys = [
+                prefix + line.strip()
+                for line in manifest.decode("utf-8").splitlines()
+                if line.strip()
+            ]
+            object_keys = [
+                object_key
+                for object_key in object_keys
+                if not object_key.startswith(SERVICE_OBJECT_PREFIXES)
+            ]
+            for idx in range(0, len(object_keys), page_size):
+                yield object_keys[idx : idx + page_size]
+            return
+
+        continuation_token = None
+        while True:
+            object_keys, continuation_token = await self.s3_client.list_objects(
+                prefix, continuation_token, page_size
+            )
+            object_keys = [
+                object_key
+                for object_key in object_keys
+                if object_key.lower().endswith(IMAGE_EXTENSIONS)
+                and not object_key.startswith(SERVICE_OBJECT_PREFIXES)
+            ]
+            if object_keys:
+                yield object_keys
+            if continuation_token is None:
+                return
+
+    async def upload_tensor_to_s3(self, object_key, upload_file, file_size: int):
+        with get_tracer().start_span("s3.upload", attributes={"object_key": object_key}):
+            if isinstance(upload_file, bytes):
+                tensor_upload = await self.s3_client.upload_file(
+                    object_key, upload_file
+                )
+            else:
+                tensor_upload = await self.s3_client.upload_fileobj(
+                    object_key, upload_file, file_size
+                )
+        return tensor_upload["file_url"]
+
+    def find_near_duplicate(
+        self,
+        image_hash: Optional[int],
+        user_id: str,
+        inference_engines: Optional[Iterable[str]],
+    ) -> Optional[NearDuplicate]:
+        if self.near_duplicate_index is None or image_hash is None:
+            return None
+        return self.near_duplicate_index.find(image_hash, user_id, inference_engines)
 
     def find_inference_queue_by_id(self, inference_id: str):
         return self.queue.get_message_by_inference_id(inference_id)
+
+    def cancel_inference(
+        self, inference_id: Optional[str] = None, batch_id: Optional[str] = None
+    ) -> int:
+        return self.queue.cancel(inference_id=inference_id, batch_id=batch_id)
+
+    def is_batch_cancelled(self, batch_id: str) -> bool:
+        return self.queue.is_cancelled({"batch_id": batch_id})
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from typing import List, Optional, Tuple
 from datetime import datetime
+from app.models.InferenceLogModel import InferenceLogModel
 from app.repositories.InferenceLogRepository import InferenceLogRepository
 from app.schemas.InferenceLogSchema import (
     InferenceLogResponseSchema,
@@ -22,6 +23,18 @@ class InferenceLogService:
             return InferenceLogResponseSchema.model_validate(inference_log.normalize())
         return None
 
+    def create_inference_log(
+        self, inference_log: InferenceLogModel
+    ) -> InferenceLogResponseSchema:
+        inference_log = self.inference_log_repo.create_inference_log(inference_log)
+        return InferenceLogResponseSchema.model_validate(inference_log.normalize())
+
+    def find_serialized_inference_log_by_id(self, inference_id: str) -> Optional[str]:
+        inference_log = self.find_inference_log_by_id(inference_id)
+        if inference_log:
+            return inference_log.model_dump_json()
+        return None
+
     def find_inference_logs(
         self, request: InferenceLogRequestSchema
     ) -> Tuple[List[InferenceLogResponseSchema], int]:
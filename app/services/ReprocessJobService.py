@@ -0,0 +1,61 @@
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+from app.infrastructure.Environment import get_environment_variables
+from app.models.ReprocessJobModel import ReprocessJobModel
+from app.repositories.ReprocessJobRepository import ReprocessJobRepository
+from app.schemas.ReprocessJobSchema import ReprocessJobRequestSchema
+
+MODEL_PATH_SETTINGS = {"tflite": "TFLITE_MODEL_PATH", "onnx": "ONNX_MODEL_PATH"}
+# 상태 변경 요청별로 허용되는 현재 상태
+STATUS_TRANSITIONS = {
+    "paused": ["queued", "running"],
+    "queued": ["paused", "failed"],
+    "cancelled": ["queued", "running", "paused", "failed"],
+}
+
+
+class ReprocessJobService:
+    reprocess_job_repo: ReprocessJobRepository
+
+    def __init__(self, db: Session):
+        self.reprocess_job_repo = ReprocessJobRepository(db)
+
+    def create_job(self, request: ReprocessJobRequestSchema) -> Dict:
+        env = get_environment_variables()
+        current_time = datetime.now().strftime("%Y%m%d%H%M%S%f")
+        reprocess_job = ReprocessJobModel(
+            job_id=f"RJ-{current_time}-{request.inference_engine}",
+            inference_engine=request.inference_engine,
+            model_path=getattr(env, MODEL_PATH_SETTINGS[request.inference_engine]),
+            user_id=request.user_id,
+            start_time=(
+                datetime.fromisoformat(request.start_time) if request.start_time else None
+            ),
+            end_time=(
+                datetime.fromisoformat(request.end_time) if request.end_time else None
+            ),
+            status="queued",
+            processed_count=0,
+            failed_count=0,
+        )
+        # 진행률 계산을 위해 생성 시점의 대상 로그 수를 기록
+        reprocess_job.total_count = self.reprocess_job_repo.count_target_logs(
+            reprocess_job
+        )
+        return self.reprocess_job_repo.create_job(reprocess_job).normalize()
+
+    def find_job_by_id(self, job_id: str) -> Optional[Dict]:
+        reprocess_job = self.reprocess_job_repo.get_job_by_id(job_id)
+        return reprocess_job.normalize() if reprocess_job else None
+
+    def change_job_status(self, job_id: str, status: str) -> bool:
+        return self.reprocess_job_repo.update_job_status(
+            job_id, status, STATUS_TRANSITIONS[status]
+        )
+
+    def find_results(
+        self, job_id: str, page: int, offset: int
+    ) -> Tuple[List[Dict], int]:
+        results, total_count = self.reprocess_job_repo.get_results(job_id, page, offset)
+        return [result.normalize() for result in results], total_count
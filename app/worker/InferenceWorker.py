@@ -1,74 +1,742 @@
 from datetime import datetime
 import asyncio
-import signal
 import logging
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 from app.models.InferenceLogModel import InferenceLogModel
+from app.schemas.InferenceLogSchema import InferenceLogResponseSchema
+from app.infrastructure.Environment import get_environment_variables
+from app.infrastructure.Metrics import (
+    CASCADE_ESCALATED,
+    INFERENCE_BATCH_SIZE,
+    INFERENCE_COMPLETED,
+    INFERENCE_DROPPED,
+    INFERENCE_ERRORS,
+    INFERENCE_IN_FLIGHT,
+    INFERENCE_PIPELINE_OCCUPANCY,
+    INFERENCE_STAGE_SECONDS,
+    INFERENCE_WORKER_BUSY_SECONDS,
+)
+from app.infrastructure.EngineRouting import CASCADE_INFERENCE_ENGINE
+from app.infrastructure.Queue import PRIORITY_CLASSES
+from app.infrastructure.Tracing import Span
 from app.infrastructure.Interfaces import (
-    get_db,
+    SessionLocal,
+    get_admission_controller,
+    get_engine_router,
     get_model_session,
+    get_near_duplicate_index,
+    get_notifier,
     get_queue,
+    get_result_cache,
     get_s3_client,
+    get_tensor_shard_store,
+    get_tracer,
+)
+
+# 큐가 전달할 때 붙이는 필드 (다른 큐로 다시 넣을 때는 제외)
+QUEUE_DELIVERY_FIELDS = (
+    "queue_name",
+    "queue_message_id",
+    "cancelled",
+    "exceeded_deliveries",
 )
 
 
+def get_prediction_confidence(output: np.ndarray) -> Tuple[float, float]:
+    """모델 출력 한 행의 top-1 확률과 top-1/top-2 확률 차이를 반환합니다.
+
+    현재 모델은 로짓을 출력하므로 softmax로 확률을 구하고,
+    이미 확률 분포인 출력은 그대로 사용합니다.
+    """
+    scores = np.asarray(output, dtype=np.float64).ravel()
+    if scores.min() < 0 or not np.isclose(scores.sum(), 1.0, atol=1e-3):
+        scores = np.exp(scores - scores.max())
+        scores /= scores.sum()
+    second, first = np.partition(scores, -2)[-2:]
+    return float(first), float(first - second)
+
+
+def get_requested_at(message: Dict) -> Optional[datetime]:
+    try:
+        return datetime.strptime(message["requested_time"], "%Y%m%d%H%M%S%f")
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class PipelineItem:
+    """파이프라인 단계 사이를 이동하는 메시지 하나의 처리 상태"""
+
+    def __init__(self, message: Dict, span: Span, sequence: int = 0):
+        self.message = message
+        self.inference_id = message["inference_id"]
+        self.span = span
+        priority = message.get("priority", PRIORITY_CLASSES[0])
+        self.priority_rank = (
+            PRIORITY_CLASSES.index(priority) if priority in PRIORITY_CLASSES else 0
+        )
+        self.sequence = sequence
+        self.started_at = time.perf_counter()
+        self.image_data: Optional[bytes] = None
+        self.tensor: Optional[np.ndarray] = None
+        self.tensor_path: Optional[str] = None
+        self.decode_seconds = 0.0
+        self.inference_seconds = 0.0
+        self.class_result: Optional[Dict] = None
+        self.inference_log: Optional[InferenceLogModel] = None
+
+    def __lt__(self, other: "PipelineItem") -> bool:
+        # 단계 큐에서도 우선순위가 높은 항목이 먼저, 같은 우선순위는 꺼낸 순서대로
+        return (self.priority_rank, self.sequence) < (
+            other.priority_rank,
+            other.sequence,
+        )
+
+
 class InferenceWorker:
-    def __init__(self, inference_engine):
+    """다운로드 -> 디코딩 -> 배치 추론 -> 저장/발행 단계를 크기가 제한된 큐로 연결한 워커
+
+    S3 다운로드를 미리 받아 두고 디코딩을 스레드에서 병렬로 수행하여,
+    추론 단계가 입력을 기다리지 않고 계속 실행되도록 합니다.
+    """
+
+    def __init__(self, inference_engine, num_threads: Optional[int] = None):
+        self.env = get_environment_variables()
         self.stop_event = asyncio.Event()
         self.queue = get_queue()
         self.s3_client = get_s3_client()
-        self.vision_model = get_model_session(inference_engine)
-        self.db_session = next(get_db())
+        self.notifier = get_notifier()
+        self.result_cache = get_result_cache()
+        self.tracer = get_tracer()
+        self.admission_controller = get_admission_controller()
+        self.engine_router = get_engine_router()
+        self.worker_id = uuid.uuid4().hex
+        self.last_heartbeat = 0.0
+        self.vision_model = get_model_session(inference_engine, num_threads)
         self.inference_engine = inference_engine
+        self.prefetch_size = max(1, self.env.INFERENCE_PREFETCH_SIZE)
+        self.decode_concurrency = max(1, self.env.INFERENCE_DECODE_CONCURRENCY)
+        self.batch_size = max(1, self.env.INFERENCE_BATCH_SIZE)
+        self.item_sequence = 0
+        # 디코딩한 텐서를 샤드로 저장해 재추론 시 원본 다운로드와 디코딩을 생략
+        self.tensor_shard_store = (
+            get_tensor_shard_store() if self.env.TENSOR_SHARD_ENABLED else None
+        )
+        # 저장된 결과의 이미지 해시를 등록해 유사 이미지 요청이 결과를 재사용하도록 함
+        self.near_duplicate_index = (
+            get_near_duplicate_index() if self.env.NEAR_DUPLICATE_ENABLED else None
+        )
+        # 종료 시그널은 실행 주체(uvicorn lifespan 또는 python -m app.worker)가 처리
 
-        signal.signal(signal.SIGTERM, self.shutdown_handler)
-        signal.signal(signal.SIGINT, self.shutdown_handler)
-
-    def shutdown_handler(self, signum, frame):
+    def shutdown_handler(self, signum=None, frame=None):
         logging.info("[LOG] Shutdown signal received : Cleaning up...")
         self.stop_event.set()
 
     async def run(self):
+        # 미리 받아 둔 batch 항목 뒤에 interactive 항목이 줄 서지 않도록 우선순위 큐 사용
+        self.decode_queue = asyncio.PriorityQueue(self.env.INFERENCE_DECODE_QUEUE_DEPTH)
+        self.batch_queue = asyncio.PriorityQueue(self.env.INFERENCE_BATCH_QUEUE_DEPTH)
+        self.persist_queue = asyncio.PriorityQueue(
+            self.env.INFERENCE_PERSIST_QUEUE_DEPTH
+        )
+        stages = [
+            asyncio.create_task(self.decode_stage())
+            for _ in range(self.decode_concurrency)
+        ]
+        stages.append(asyncio.create_task(self.inference_stage()))
+        stages.append(asyncio.create_task(self.persist_stage()))
+        if self.tensor_shard_store:
+            stages.append(asyncio.create_task(self.tensor_shard_stage()))
+        try:
+            await self.fetch_stage()
+            # 종료 요청 전에 꺼낸 메시지는 끝까지 처리
+            for stage_queue in (self.decode_queue, self.batch_queue, self.persist_queue):
+                await stage_queue.join()
+        finally:
+            for stage in stages:
+                stage.cancel()
+            await asyncio.gather(*stages, return_exceptions=True)
+            if self.tensor_shard_store:
+                # 종료 전에 아직 채워지지 않은 샤드도 업로드
+                await self.tensor_shard_store.flush(force=True)
+
+        logging.info("[LOG] Worker has been stopped gracefully.")
+
+    def observe_stage(self, stage: str, seconds: float):
+        INFERENCE_STAGE_SECONDS.labels(self.inference_engine, stage).observe(seconds)
+
+    def set_occupancy(self, stage: str, delta: int):
+        INFERENCE_PIPELINE_OCCUPANCY.labels(self.inference_engine, stage).inc(delta)
+
+    def observe_queue_wait(self, item: PipelineItem):
+        message = item.message
+        requested_at = get_requested_at(message)
+        if requested_at is not None:
+            self.observe_stage(
+                "queue_wait", max((datetime.now() - requested_at).total_seconds(), 0.0)
+            )
+        if message.get("enqueued_at"):
+            self.tracer.record_span(
+                "queue.wait",
+                int(message["enqueued_at"] * 1e9),
+                item.span.start_time_ns,
+                parent=item.span.context,
+            )
+
+    @contextmanager
+    def measure_stage(self, item: PipelineItem, stage: str):
+        """단계별 지연 시간 히스토그램과 트레이스 스팬을 함께 기록합니다."""
+        stage_start = time.perf_counter()
+        start_time_ns = time.time_ns()
+        attributes = {}
+        try:
+            yield
+        except Exception as e:
+            INFERENCE_ERRORS.labels(self.inference_engine, stage).inc()
+            attributes["error"] = str(e)
+            raise
+        finally:
+            self.observe_stage(stage, time.perf_counter() - stage_start)
+            self.tracer.record_span(
+                f"worker.{stage}",
+                start_time_ns,
+                time.time_ns(),
+                parent=item.span.context,
+                attributes=attributes,
+            )
+
+    def start_item(self, message: Dict) -> PipelineItem:
+        span = self.tracer.begin_span(
+            "worker.process",
+            parent=message.get("traceparent"),
+            attributes={
+                "inference_id": message["inference_id"],
+                "inference_engine": self.inference_engine,
+            },
+        )
+        self.item_sequence += 1
+        item = PipelineItem(message, span, self.item_sequence)
+        INFERENCE_IN_FLIGHT.labels(self.inference_engine).inc()
+        self.observe_queue_wait(item)
+        return item
+
+    def finish_item(self, item: PipelineItem, error: Optional[Exception] = None):
+        INFERENCE_IN_FLIGHT.labels(self.inference_engine).dec()
+        self.tracer.end_span(item.span, error)
+        if error is not None:
+            logging.error(
+                f"[Error] worker processing message {item.inference_id}: {str(error)}"
+            )
+            return
+        INFERENCE_COMPLETED.labels(self.inference_engine).inc()
+        self.observe_stage("total", time.perf_counter() - item.started_at)
+
+    @staticmethod
+    def is_expired(message: Dict) -> bool:
+        deadline_at = message.get("deadline_at")
+        return bool(deadline_at) and time.time() > deadline_at
+
+    def get_drop_reason(self, message: Dict) -> Optional[str]:
+        if self.is_expired(message):
+            return "expired"
+        try:
+            if self.queue.is_cancelled(message):
+                return "cancelled"
+        except Exception as e:
+            logging.error(f"[Error] worker checking cancellation: {str(e)}")
+        return None
+
+    def drop_message(self, message: Dict, reason: str):
+        """마감이 지났거나 취소된 메시지는 처리하지 않고 구독자에게만 알림"""
+        INFERENCE_DROPPED.labels(self.inference_engine, reason).inc()
+        logging.info(f"[LOG] Inference {reason}: {message.get('inference_id')}")
+        try:
+            self.notifier.publish_completion(
+                {
+                    "status": {"msg": reason},
+                    "data": {
+                        "inference_id": message.get("inference_id"),
+                        "user_id": message.get("user_id"),
+                    },
+                },
+                message.get("batch_id"),
+            )
+        except Exception as e:
+            logging.error(f"[Error] worker publishing {reason} event: {str(e)}")
+
+    def drop_item(self, item: PipelineItem, reason: str):
+        item.tensor = None
+        self.drop_message(item.message, reason)
+        INFERENCE_IN_FLIGHT.labels(self.inference_engine).dec()
+        item.span.set_attribute("dropped", reason)
+        self.tracer.end_span(item.span)
+
+    async def put_stage(self, stage_queue: asyncio.Queue, stage: str, item: PipelineItem):
+        await stage_queue.put(item)
+        self.set_occupancy(stage, 1)
+
+    async def get_stage_batch(
+        self, stage_queue: asyncio.Queue, stage: str
+    ) -> List[PipelineItem]:
+        # 첫 항목은 기다리고, 이미 쌓여 있는 항목은 배치 크기까지 함께 가져옴
+        items = [await stage_queue.get()]
+        while len(items) < self.batch_size and not stage_queue.empty():
+            items.append(stage_queue.get_nowait())
+        self.set_occupancy(stage, -len(items))
+        return items
+
+    async def fetch_stage(self):
+        download_slots = asyncio.Semaphore(self.prefetch_size)
+        downloads = set()
         while not self.stop_event.is_set():
+            self.send_heartbeat()
+            await download_slots.acquire()
+            slots = 1
+            # 비어 있는 다운로드 슬롯만큼 한 번의 왕복으로 꺼냄
+            while slots < self.batch_size and not download_slots.locked():
+                await download_slots.acquire()
+                slots += 1
             try:
-                message = self.queue.dequeue_message(self.inference_engine)
-                if message:
-                    inference_id = message["inference_id"]
-                    user_id = message["user_id"]
-                    image_path = message["image_path"]
-                    requested_time = message["requested_time"]
-
-                    image_data = await self.s3_client.download_file(
-                        "IMAGES/" + inference_id
+                if self.queue.blocking_io:
+                    messages = await asyncio.to_thread(
+                        self.queue.dequeue_messages, self.inference_engine, slots
                     )
-                    start_time = datetime.now()
+                else:
+                    messages = self.queue.dequeue_messages(self.inference_engine, slots)
+            except Exception as e:
+                logging.error(f"[Error] worker dequeuing message: {str(e)}")
+                messages = []
 
-                    numeric_result = self.vision_model.run_inference(image_data)
-                    class_result = self.vision_model.get_top_k_predictions(
-                        numeric_result
+            dropped_messages = []
+            for message in messages:
+                drop_reason = self.get_drop_reason(message)
+                if drop_reason:
+                    self.drop_message(message, drop_reason)
+                    dropped_messages.append(message)
+                    continue
+                if message.get("exceeded_deliveries"):
+                    await self.fail_undeliverable(message)
+                    continue
+                slots -= 1
+                download = asyncio.create_task(
+                    self.download_stage(message, download_slots)
+                )
+                downloads.add(download)
+                download.add_done_callback(downloads.discard)
+            for _ in range(slots):
+                download_slots.release()
+            await self.ack_messages(dropped_messages)
+            if not messages:
+                await self.queue.wait_for_message(self.inference_engine, 1.0)
+        await asyncio.gather(*downloads, return_exceptions=True)
+
+    async def fail_undeliverable(self, message: Dict):
+        """처리 중 반복해서 중단된 메시지는 다시 처리하지 않고 실패 상태를 기록합니다."""
+        item = self.start_item(message)
+        await self.fail_item(
+            item,
+            RuntimeError(
+                f"not completed after {message['exceeded_deliveries']} deliveries"
+            ),
+        )
+
+    async def download_stage(self, message: Dict, download_slots: asyncio.Semaphore):
+        try:
+            item = self.start_item(message)
+            self.set_occupancy("download", 1)
+            try:
+                with self.measure_stage(item, "download"):
+                    object_key = message.get(
+                        "object_key", "IMAGES/" + item.inference_id
                     )
-                    end_time = datetime.now()
-                    inference_time = (end_time - start_time).total_seconds()
-
-                    inference_log = InferenceLogModel(
-                        inference_id=inference_id,
-                        user_id=user_id,
-                        inference_engine=self.inference_engine,
-                        image_path=image_path,
-                        inference_time=inference_time,
-                        result=str(class_result),
-                        requested_time=requested_time,
-                        created_at=end_time.strftime("%Y-%m-%d %H:%M:%S"),
+                    if "tensor_offset" in message:
+                        item.tensor = await self.download_tensor(message, object_key)
+                    else:
+                        item.image_data = await self.s3_client.download_file(object_key)
+            except Exception as e:
+                await self.fail_item(item, e)
+                return
+            finally:
+                self.set_occupancy("download", -1)
+            if item.tensor is not None:
+                # 이미 디코딩된 텐서는 디코딩 단계를 건너뜀
+                await self.put_stage(self.batch_queue, "inference", item)
+                return
+            # 디코딩 큐가 가득 차면 슬롯을 잡은 채로 기다려 다운로드 선행량을 제한
+            await self.put_stage(self.decode_queue, "decode", item)
+        finally:
+            download_slots.release()
+
+    async def download_tensor(self, message: Dict, object_key: str) -> np.ndarray:
+        tensor_shape = tuple(message["tensor_shape"])
+        if tensor_shape != (*self.vision_model.input_size, 3):
+            raise ValueError(
+                f"tensor shape {tensor_shape} does not match model input "
+                f"{self.vision_model.input_size}"
+            )
+        tensor_data = await self.s3_client.download_file_range(
+            object_key, message["tensor_offset"], int(np.prod(tensor_shape))
+        )
+        return np.frombuffer(tensor_data, dtype=np.uint8).reshape(tensor_shape)
+
+    async def decode_stage(self):
+        while True:
+            item = await self.decode_queue.get()
+            self.set_occupancy("decode", -1)
+            try:
+                stage_start = time.perf_counter()
+                with self.measure_stage(item, "decode"):
+                    item.tensor = await asyncio.to_thread(
+                        self.vision_model.decode_image, item.image_data
                     )
+                item.decode_seconds = time.perf_counter() - stage_start
+                item.image_data = None
+                await self.put_stage(self.batch_queue, "inference", item)
+            except Exception as e:
+                await self.fail_item(item, e)
+            finally:
+                self.decode_queue.task_done()
 
-                    self.db_session.add(inference_log)
-                    self.db_session.commit()
-                    logging.info(f"[LOG] Inference completed: {inference_id}")
-                else:
-                    await asyncio.sleep(1)
+    async def inference_stage(self):
+        while True:
+            items = await self.get_stage_batch(self.batch_queue, "inference")
+            try:
+                # 다운로드/디코딩 중에 마감이 지난 항목은 모델에 넣지 않음
+                live_items, expired_items = [], []
+                for item in items:
+                    if self.is_expired(item.message):
+                        self.drop_item(item, "expired")
+                        expired_items.append(item)
+                    else:
+                        live_items.append(item)
+                await self.ack_messages([item.message for item in expired_items])
+                if live_items:
+                    await self.run_batch_inference(live_items)
+            finally:
+                for _ in items:
+                    self.batch_queue.task_done()
+
+    async def run_batch_inference(self, items: List[PipelineItem]):
+        stage_start = time.perf_counter()
+        start_time_ns = time.time_ns()
+        try:
+            # 추론은 이벤트 루프 밖에서 실행하여 다른 단계를 막지 않음
+            outputs = await asyncio.to_thread(
+                self.vision_model.run_tensor_inference,
+                np.stack([item.tensor for item in items]),
+            )
+            error = None
+        except Exception as e:
+            outputs, error = None, e
+        elapsed = time.perf_counter() - stage_start
+        end_time_ns = time.time_ns()
+        INFERENCE_WORKER_BUSY_SECONDS.labels(self.inference_engine).inc(elapsed)
+        INFERENCE_BATCH_SIZE.labels(self.inference_engine).observe(len(items))
+        if error is None:
+            self.record_service_time(elapsed / len(items))
+
+        for idx, item in enumerate(items):
+            escalated = error is None and await self.escalate_if_uncertain(
+                item, outputs[idx : idx + 1]
+            )
+            if error is None and not escalated:
+                self.store_tensor(item)
+            item.tensor = None
+            self.observe_stage("inference", elapsed)
+            attributes = {"batch_size": len(items)}
+            if error is not None:
+                attributes["error"] = str(error)
+            if escalated:
+                attributes["cascade_escalated"] = True
+            self.tracer.record_span(
+                "worker.inference",
+                start_time_ns,
+                end_time_ns,
+                parent=item.span.context,
+                attributes=attributes,
+            )
+            if error is not None:
+                INFERENCE_ERRORS.labels(self.inference_engine, "inference").inc()
+                await self.fail_item(item, error)
+                continue
+            if escalated:
+                # 결과는 두 번째 엔진의 워커가 저장
+                self.finish_item(item)
+                continue
+            # 배치 추론 시간은 이미지 수로 나누어 이미지별 모델 사용 시간으로 기록
+            item.inference_seconds = elapsed / len(items)
+            item.class_result = self.vision_model.get_top_k_predictions(
+                outputs[idx : idx + 1]
+            )
+            await self.put_stage(self.persist_queue, "persist", item)
+
+    async def escalate_if_uncertain(
+        self, item: PipelineItem, output: np.ndarray
+    ) -> bool:
+        """cascade 요청의 첫 단계 결과가 불확실하면 두 번째 엔진의 큐로 넘깁니다."""
+        message = item.message
+        second_engine = self.env.CASCADE_SECOND_ENGINE
+        if (
+            message.get("requested_engine") != CASCADE_INFERENCE_ENGINE
+            or message.get("cascade_stage")
+            or self.inference_engine == second_engine
+        ):
+            return False
+        top_score, margin = get_prediction_confidence(output)
+        if (
+            top_score >= self.env.CASCADE_MIN_CONFIDENCE
+            and margin >= self.env.CASCADE_MIN_MARGIN
+        ):
+            return False
+
+        escalated_message = {
+            key: value
+            for key, value in message.items()
+            if key not in QUEUE_DELIVERY_FIELDS
+        }
+        escalated_message["inference_engine"] = second_engine
+        escalated_message["cascade_stage"] = 2
+        escalated_message["enqueued_at"] = time.time()
+        try:
+            if self.queue.blocking_io:
+                await asyncio.to_thread(
+                    self.queue.enqueue_message, escalated_message, second_engine
+                )
+            else:
+                self.queue.enqueue_message(escalated_message, second_engine)
+        except Exception as e:
+            # 넘기지 못하면 첫 번째 엔진의 결과로 응답
+            logging.error(
+                f"[Error] worker escalating cascade message {item.inference_id}: "
+                f"{str(e)}"
+            )
+            return False
+        # 넘긴 뒤에 확인하여, 그 사이에 종료되더라도 요청이 사라지지 않고 다시 전달됨
+        await self.ack_messages([message])
+        CASCADE_ESCALATED.labels(self.inference_engine).inc()
+        logging.info(
+            f"[LOG] Cascade escalated to {second_engine}: {item.inference_id} "
+            f"(top-1 {top_score:.3f}, margin {margin:.3f})"
+        )
+        return True
+
+    def store_tensor(self, item: PipelineItem):
+        message = item.message
+        if "tensor_index" in message:
+            # 텐서로 받은 입력은 업로드된 객체 자체가 텐서 저장소 역할을 함
+            item.tensor_path = f"{message['object_key']}#{message['tensor_index']}"
+        elif self.tensor_shard_store and "tensor_offset" not in message:
+            item.tensor_path = self.tensor_shard_store.append(
+                item.inference_id, item.tensor, message["requested_time"][:8]
+            )
+
+    async def tensor_shard_stage(self):
+        while True:
+            await asyncio.sleep(1.0)
+            await self.tensor_shard_store.flush()
+
+    async def persist_stage(self):
+        while True:
+            items = await self.get_stage_batch(self.persist_queue, "persist")
+            try:
+                await self.persist_items(items)
+            finally:
+                for _ in items:
+                    self.persist_queue.task_done()
+
+    def make_inference_log(
+        self, item: PipelineItem, error: Optional[Exception] = None
+    ) -> InferenceLogModel:
+        message = item.message
+        # 다시 전달된 메시지도 같은 created_at을 갖도록 요청 시각을 사용
+        # (파티션 사용 시 기본 키가 (inference_id, created_at)이므로 중복 저장을 막음)
+        # DB가 돌려주는 값과 식별 키가 같도록 시간대를 붙임 (커밋 후 일괄 조회로 다시 채움)
+        created_at = (get_requested_at(message) or datetime.now()).astimezone()
+        return InferenceLogModel(
+            inference_id=item.inference_id,
+            user_id=message["user_id"],
+            inference_engine=self.inference_engine,
+            requested_engine=message.get("requested_engine"),
+            image_path=message["image_path"],
+            tensor_path=item.tensor_path,
+            cascade_stage=(
+                message.get("cascade_stage", 1)
+                if message.get("requested_engine") == CASCADE_INFERENCE_ENGINE
+                else None
+            ),
+            inference_time=item.decode_seconds + item.inference_seconds,
+            result=str(item.class_result if error is None else {}),
+            requested_time=message["requested_time"],
+            created_at=created_at.replace(microsecond=0),
+            error=str(error) if error is not None else None,
+        )
+
+    def save_inference_logs(self, inference_logs: List[InferenceLogModel]) -> None:
+        inference_ids = [inference_log.inference_id for inference_log in inference_logs]
+        with SessionLocal() as db:
+            # 커밋 후 확인 전에 다시 전달된 메시지는 이미 저장되어 있으므로 건너뜀
+            saved_ids = {
+                inference_id
+                for (inference_id,) in db.query(InferenceLogModel.inference_id).filter(
+                    InferenceLogModel.inference_id.in_(inference_ids)
+                )
+            }
+            db.add_all(
+                [
+                    inference_log
+                    for inference_log in inference_logs
+                    if inference_log.inference_id not in saved_ids
+                ]
+            )
+            db.commit()
+            # 커밋으로 만료된 속성(updated_at 등)을 한 번의 조회로 다시 채움
+            db.query(InferenceLogModel).filter(
+                InferenceLogModel.inference_id.in_(inference_ids)
+            ).all()
+            db.expunge_all()
+
+    async def persist_items(self, items: List[PipelineItem]):
+        stage_start = time.perf_counter()
+        start_time_ns = time.time_ns()
+        for item in items:
+            item.inference_log = self.make_inference_log(item)
+
+        saved_items, failed_items = items, []
+        try:
+            # 묶음 단위로 커밋하고, DB 작업은 이벤트 루프 밖에서 실행
+            await asyncio.to_thread(
+                self.save_inference_logs, [item.inference_log for item in items]
+            )
+        except Exception:
+            # 한 건의 오류로 묶음 전체가 실패하지 않도록 개별 커밋으로 재시도
+            saved_items = []
+            for item in items:
+                item.inference_log = self.make_inference_log(item)
+                try:
+                    await asyncio.to_thread(self.save_inference_logs, [item.inference_log])
+                    saved_items.append(item)
+                except Exception as e:
+                    failed_items.append((item, e))
+
+        elapsed = time.perf_counter() - stage_start
+        end_time_ns = time.time_ns()
+        # 결과가 저장된 메시지만 확인하여, 실패한 메시지는 큐가 다시 전달할 수 있게 둠
+        await self.ack_messages([item.message for item in saved_items])
+        for item in saved_items:
+            self.observe_stage("db_commit", elapsed)
+            self.tracer.record_span(
+                "worker.db_commit",
+                start_time_ns,
+                end_time_ns,
+                parent=item.span.context,
+                attributes={"batch_size": len(items)},
+            )
+            logging.info(f"[LOG] Inference completed: {item.inference_id}")
+            with self.measure_stage(item, "publish"):
+                self.publish_result(item.inference_log, item.message.get("batch_id"))
+            self.index_image_hash(item)
+            self.finish_item(item)
+        for item, error in failed_items:
+            INFERENCE_ERRORS.labels(self.inference_engine, "db_commit").inc()
+            if self.queue.redelivers_unacked:
+                # 확인하지 않은 메시지는 큐가 다시 전달하여 저장을 재시도
+                self.finish_item(item, error)
+            else:
+                await self.fail_item(item, error, save=False)
+        self.record_drain(len(saved_items))
+
+    async def fail_item(
+        self, item: PipelineItem, error: Exception, save: bool = True
+    ):
+        """처리하지 못한 메시지의 실패 상태를 기록/발행하고 큐에서 확인합니다."""
+        self.finish_item(item, error)
+        item.tensor = None
+        item.image_data = None
+        inference_log = self.make_inference_log(item, error)
+        if save:
+            try:
+                await asyncio.to_thread(self.save_inference_logs, [inference_log])
             except Exception as e:
-                logging.error(f"[Error] worker processing message: {str(e)}")
+                logging.error(
+                    f"[Error] worker saving failed status {item.inference_id}: {str(e)}"
+                )
+        # 저장하지 못해도 캐시와 이벤트로 상태 조회와 구독자에게 실패를 알림
+        self.publish_result(inference_log, item.message.get("batch_id"))
+        await self.ack_messages([item.message])
 
-        logging.info("[LOG] Worker has been stopped gracefully.")
+    async def ack_messages(self, messages: List[Dict]):
+        if not messages:
+            return
+        try:
+            if self.queue.blocking_io:
+                await asyncio.to_thread(self.queue.ack_messages, messages)
+            else:
+                self.queue.ack_messages(messages)
+        except Exception as e:
+            logging.error(f"[Error] worker acknowledging messages: {str(e)}")
+
+    def send_heartbeat(self):
+        # auto 라우팅이 워커가 실행 중인 엔진만 고르도록 주기적으로 알림
+        now = time.monotonic()
+        if now - self.last_heartbeat < self.env.ENGINE_ROUTING_WORKER_TTL_SECONDS / 3:
+            return
+        self.last_heartbeat = now
+        try:
+            self.engine_router.record_heartbeat(self.inference_engine, self.worker_id)
+        except Exception as e:
+            logging.error(f"[Error] worker sending heartbeat: {str(e)}")
+
+    def record_service_time(self, seconds_per_image: float):
+        try:
+            self.engine_router.record_service_time(
+                self.inference_engine, seconds_per_image
+            )
+        except Exception as e:
+            logging.error(f"[Error] worker recording service time: {str(e)}")
+
+    def record_drain(self, count: int):
+        # API의 Retry-After 계산에 쓰이는 프로세스 간 공유 처리량
+        if not count:
+            return
+        try:
+            self.admission_controller.record_completions(self.inference_engine, count)
+        except Exception as e:
+            logging.error(f"[Error] worker recording drain rate: {str(e)}")
+
+    def index_image_hash(self, item: PipelineItem):
+        image_hash = item.message.get("image_hash")
+        if self.near_duplicate_index is None or not image_hash:
+            return
+        try:
+            self.near_duplicate_index.add(
+                int(image_hash, 16),
+                item.message["user_id"],
+                self.inference_engine,
+                item.inference_id,
+            )
+        except Exception as e:
+            logging.error(f"[Error] worker indexing image hash: {str(e)}")
+
+    def publish_result(self, inference_log: InferenceLogModel, batch_id=None):
+        try:
+            result = InferenceLogResponseSchema.model_validate(
+                inference_log.normalize()
+            )
+            # 상태 조회가 DB까지 내려가지 않도록 완료 결과를 먼저 캐시에 기록
+            self.result_cache.set(result.inference_id, result.model_dump_json())
+            self.notifier.publish_completion(
+                {
+                    "status": {"msg": "failed" if result.error else "completed"},
+                    "data": result.model_dump(mode="json"),
+                },
+                batch_id,
+            )
+        except Exception as e:
+            INFERENCE_ERRORS.labels(self.inference_engine, "publish").inc()
+            logging.error(f"[Error] worker publishing result: {str(e)}")
 
     def stop(self):
         """Stop the worker gracefully."""
@@ -1,33 +1,185 @@
 import asyncio
 import logging
+import time
 from datetime import datetime, timedelta
-from app.models.InferenceLogModel import InferenceLogModel
-from app.services.InferenceLogService import InferenceLogService
-from app.infrastructure.Interfaces import get_db
+from typing import List, Optional, Tuple
+from app.models.BaseModel import (
+    create_upcoming_partitions,
+    drop_partition,
+    find_expired_partitions,
+    get_partitioned_table_names,
+)
+from app.repositories.InferenceLogRepository import InferenceLogRepository
+from app.infrastructure.TensorShardStore import TENSOR_SHARD_PREFIX
+from app.infrastructure.Environment import get_environment_variables
+from app.infrastructure.Interfaces import SessionLocal, get_s3_client
 
 
 class LogCleanupWorker:
     def __init__(self):
-        self.db_session = next(get_db())
+        self.env = get_environment_variables()
+        self.s3_client = get_s3_client()
         self.interval = 60
         self.period = 90
+        self.chunk_size = self.env.RETENTION_CHUNK_SIZE
+        self.throttle = self.env.RETENTION_THROTTLE_SECONDS
         self.running = False
         self.task = None
 
     async def run(self):
         self.running = True
         while self.running:
-            await self.delete_old_inference_logs()
+            try:
+                await self.delete_old_inference_logs()
+            except Exception as e:
+                logging.error(f"[Error] cleanup worker: {str(e)}")
             await asyncio.sleep(self.interval * 60)
 
+    async def delete_inference_log_chunk(
+        self, retention_date: datetime
+    ) -> Tuple[int, int]:
+        """만료된 로그 한 청크의 객체를 지운 뒤 행을 삭제하고 (행 수, 객체 수)를 반환합니다.
+
+        행을 잠근 채로 객체를 먼저 지우므로, 객체 삭제가 실패하거나 중간에 종료되면
+        행이 그대로 남아 다음 실행에서 다시 시도됩니다.
+        """
+        with SessionLocal() as db:
+            inference_log_repository = InferenceLogRepository(db)
+            expired_logs = await asyncio.to_thread(
+                inference_log_repository.lock_expired_inference_logs,
+                retention_date,
+                self.chunk_size,
+            )
+            if not expired_logs:
+                return 0, 0
+            deleted_object_count = await self.delete_objects(
+                [image_path for _, image_path in expired_logs]
+            )
+            await asyncio.to_thread(
+                inference_log_repository.delete_inference_logs,
+                [inference_id for inference_id, _ in expired_logs],
+            )
+        return len(expired_logs), deleted_object_count
+
+    def get_partition_image_chunk(
+        self, partition_name: str, after_inference_id: str
+    ) -> List[Tuple[str, str]]:
+        with SessionLocal() as db:
+            return InferenceLogRepository(db).get_partition_image_paths(
+                partition_name, after_inference_id, self.chunk_size
+            )
+
+    def get_object_key(self, image_path: str) -> Optional[str]:
+        # 서비스가 업로드한 IMAGES/, TENSORS/ 하위 객체만 정리 대상
+        prefix = f"/{self.env.S3_SCALITY_BUCKET}/"
+        if image_path and image_path.startswith(
+            (prefix + "IMAGES/", prefix + "TENSORS/")
+        ):
+            return image_path[len(prefix) :]
+        return None
+
+    async def delete_objects(self, image_paths: List[str]) -> int:
+        object_keys = {self.get_object_key(image_path) for image_path in image_paths}
+        object_keys.discard(None)
+        if not object_keys:
+            return 0
+        return await self.s3_client.delete_files(sorted(object_keys))
+
+    async def delete_partition_objects(self, partition_name: str) -> int:
+        deleted_object_count = 0
+        after_inference_id = ""
+        while True:
+            image_chunk = await asyncio.to_thread(
+                self.get_partition_image_chunk, partition_name, after_inference_id
+            )
+            if not image_chunk:
+                break
+            deleted_object_count += await self.delete_objects(
+                [image_path for _, image_path in image_chunk]
+            )
+            after_inference_id = image_chunk[-1][0]
+            await asyncio.sleep(self.throttle)
+        return deleted_object_count
+
+    async def drop_expired_partitions(self, retention_date: datetime) -> int:
+        await asyncio.to_thread(create_upcoming_partitions)
+        deleted_object_count = 0
+        for table_name in await asyncio.to_thread(get_partitioned_table_names):
+            expired_partitions = await asyncio.to_thread(
+                find_expired_partitions, table_name, retention_date
+            )
+            for partition_name in expired_partitions:
+                # 이미지 참조를 잃지 않도록 객체를 먼저 지우고 파티션을 제거
+                deleted_object_count += await self.delete_partition_objects(
+                    partition_name
+                )
+                await asyncio.to_thread(drop_partition, table_name, partition_name)
+                logging.info(f"[LOG] Dropped expired partition : {partition_name}")
+        return deleted_object_count
+
+    async def delete_expired_tensor_shards(self, retention_date: datetime) -> int:
+        """보존 기준일 이전 날짜의 TENSOR_SHARDS/{yyyymmdd}/ 객체를 지우고 객체 수를 반환합니다.
+
+        키는 날짜 순으로 나열되므로 앞에서부터 만료된 키를 지우고,
+        보존 기간 안의 날짜가 나오면 멈춥니다.
+        """
+        retention_day = retention_date.strftime("%Y%m%d")
+        deleted_object_count = 0
+        while True:
+            object_keys, _ = await self.s3_client.list_objects(
+                TENSOR_SHARD_PREFIX, max_keys=self.chunk_size
+            )
+            expired_keys = [
+                object_key
+                for object_key in object_keys
+                if object_key[len(TENSOR_SHARD_PREFIX) :].split("/", 1)[0]
+                < retention_day
+            ]
+            if expired_keys:
+                deleted_object_count += await self.s3_client.delete_files(expired_keys)
+            if (
+                len(expired_keys) < len(object_keys)
+                or len(object_keys) < self.chunk_size
+            ):
+                return deleted_object_count
+            await asyncio.sleep(self.throttle)
+
     async def delete_old_inference_logs(self):
         retention_date = datetime.now() - timedelta(days=self.period)
-        deleted_count = (
-            self.db_session.query(InferenceLogModel)
-            .filter(InferenceLogModel.created_at <= retention_date)
-            .delete()
+        start_time = time.monotonic()
+        deleted_count = 0
+        # 전체가 만료된 파티션은 통째로 제거하고, 경계 파티션의 나머지만 행 단위로 삭제
+        deleted_object_count = await self.drop_expired_partitions(retention_date)
+
+        while True:
+            # 청크 단위로 커밋하여 잠금 시간을 제한하고, DB 작업은 이벤트 루프 밖에서 실행
+            chunk_count, chunk_object_count = await self.delete_inference_log_chunk(
+                retention_date
+            )
+            if not chunk_count:
+                break
+            deleted_count += chunk_count
+            deleted_object_count += chunk_object_count
+
+            elapsed = max(time.monotonic() - start_time, 1e-6)
+            logging.info(
+                f"[LOG] Deleting old inference logs : {deleted_count} rows "
+                f"({deleted_count / elapsed:.1f} rows/s), {deleted_object_count} objects "
+                f"({deleted_object_count / elapsed:.1f} objects/s)"
+            )
+
+            if chunk_count < self.chunk_size:
+                break
+            await asyncio.sleep(self.throttle)
+
+        # 텐서 샤드는 사용자 이미지의 축소본이므로 같은 보존 기간이 지나면 삭제
+        # (행을 먼저 지워 남아 있는 로그가 지워진 샤드를 가리키지 않도록 함)
+        deleted_object_count += await self.delete_expired_tensor_shards(retention_date)
+
+        logging.info(
+            f"[LOG] Deleted old inference logs : {deleted_count} rows, "
+            f"{deleted_object_count} objects in {time.monotonic() - start_time:.2f}s"
         )
-        logging.info(f"[LOG] Deleting old inference logs : {deleted_count}")
 
     def set_interval(self, new_interval):
         self.interval = new_interval
@@ -0,0 +1,254 @@
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from app.models.ReprocessJobModel import ReprocessJobModel
+from app.repositories.ReprocessJobRepository import ReprocessJobRepository
+from app.infrastructure.Environment import get_environment_variables
+from app.infrastructure.VisionModel import IVisionModel
+from app.infrastructure.Interfaces import (
+    SessionLocal,
+    get_model_session,
+    get_queue,
+    get_s3_client,
+    get_tensor_shard_store,
+)
+
+
+class ReprocessWorker:
+    """저장된 추론 로그를 다시 추론하는 재추론 작업을 청크 단위로 실행합니다.
+
+    청크마다 결과와 체크포인트를 한 트랜잭션으로 기록하므로, 중단된 작업은 마지막
+    체크포인트부터 이어서 실행됩니다. 실시간 추론 큐가 밀려 있으면 다음 청크를 미룹니다.
+    """
+
+    def __init__(self, inference_engines: List[str]):
+        self.env = get_environment_variables()
+        self.inference_engines = inference_engines
+        self.s3_client = get_s3_client()
+        self.tensor_shard_store = get_tensor_shard_store()
+        self.queue = get_queue()
+        # 작업 임대를 구분하기 위한 프로세스 식별자
+        self.owner = uuid.uuid4().hex
+        self.chunk_size = max(1, self.env.REPROCESS_CHUNK_SIZE)
+        self.batch_size = max(1, self.env.INFERENCE_BATCH_SIZE)
+        self.throttle = self.env.REPROCESS_THROTTLE_SECONDS
+        self.vision_models: Dict[str, IVisionModel] = {}
+        self.running = False
+        self.task = None
+
+    async def run(self):
+        self.running = True
+        while self.running:
+            try:
+                reprocess_job = await asyncio.to_thread(self.claim_next_job)
+                if reprocess_job:
+                    await self.run_job(reprocess_job)
+                    continue
+            except Exception as e:
+                logging.error(f"[Error] reprocess worker: {str(e)}")
+            await asyncio.sleep(self.env.REPROCESS_POLL_SECONDS)
+
+    def claim_next_job(self) -> Optional[ReprocessJobModel]:
+        lease_expired_before = datetime.now() - timedelta(
+            seconds=self.env.REPROCESS_JOB_LEASE_SECONDS
+        )
+        with SessionLocal() as db:
+            return ReprocessJobRepository(db).claim_next_job(
+                self.owner, lease_expired_before
+            )
+
+    def get_target_logs(
+        self, reprocess_job: ReprocessJobModel
+    ) -> List[Tuple[str, str, Optional[str]]]:
+        with SessionLocal() as db:
+            return ReprocessJobRepository(db).get_target_logs(
+                reprocess_job, self.chunk_size
+            )
+
+    def save_chunk(self, job_id: str, results: List[Dict], *args) -> bool:
+        with SessionLocal() as db:
+            return ReprocessJobRepository(db).save_chunk(
+                job_id, self.owner, results, *args
+            )
+
+    def update_job(self, job_id: str, values: Dict) -> bool:
+        with SessionLocal() as db:
+            return ReprocessJobRepository(db).update_job(job_id, self.owner, values)
+
+    async def get_vision_model(self, inference_engine: str) -> IVisionModel:
+        # 실시간 워커와 CPU를 나눠 쓰도록 적은 스레드로 모델을 따로 불러옴
+        if inference_engine not in self.vision_models:
+            self.vision_models[inference_engine] = await asyncio.to_thread(
+                get_model_session,
+                inference_engine,
+                self.env.REPROCESS_NUM_THREADS or None,
+            )
+        return self.vision_models[inference_engine]
+
+    def get_live_queue_length(self) -> int:
+        queue_length = 0
+        for inference_engine in self.inference_engines:
+            try:
+                queue_length += self.queue.get_queue_length(inference_engine)
+            except Exception as e:
+                logging.error(f"[ERROR] Failed to read queue length: {e}")
+        return queue_length
+
+    async def wait_for_live_traffic(self, job_id: str) -> bool:
+        """실시간 큐가 밀려 있는 동안 대기합니다. 작업을 잃으면 False를 반환합니다."""
+        while self.running:
+            if not await asyncio.to_thread(
+                self.update_job, job_id, {"heartbeat_at": datetime.now()}
+            ):
+                return False
+            live_queue_length = await asyncio.to_thread(self.get_live_queue_length)
+            if live_queue_length <= self.env.REPROCESS_MAX_LIVE_QUEUE_LENGTH:
+                return True
+            await asyncio.sleep(max(self.throttle, 1.0))
+        return False
+
+    def get_object_key(self, inference_id: str, image_path: str) -> str:
+        prefix = f"/{self.env.S3_SCALITY_BUCKET}/"
+        if image_path and prefix in image_path:
+            return image_path.split(prefix, 1)[1]
+        return "IMAGES/" + inference_id
+
+    async def load_chunk(
+        self,
+        vision_model: IVisionModel,
+        target_logs: List[Tuple[str, str, Optional[str]]],
+    ) -> List[Optional[np.ndarray]]:
+        # 전처리된 텐서가 있으면 디코딩 없이 사용하고, 없거나 모델 입력과 다르면 원본을 디코딩
+        tensor_paths = [tensor_path for _, _, tensor_path in target_logs if tensor_path]
+        stored_tensors = (
+            await self.tensor_shard_store.load_tensors(tensor_paths)
+            if tensor_paths
+            else {}
+        )
+        tensor_shape = (*vision_model.input_size, 3)
+        download_slots = asyncio.Semaphore(
+            max(1, self.env.REPROCESS_DOWNLOAD_CONCURRENCY)
+        )
+
+        async def load_tensor(inference_id, image_path, tensor_path):
+            tensor = stored_tensors.get(tensor_path)
+            if tensor is not None and tensor.shape == tensor_shape:
+                return tensor
+            async with download_slots:
+                image_data = await self.s3_client.download_file(
+                    self.get_object_key(inference_id, image_path)
+                )
+            return await asyncio.to_thread(vision_model.decode_image, image_data)
+
+        tensors = await asyncio.gather(
+            *(load_tensor(*target_log) for target_log in target_logs),
+            return_exceptions=True,
+        )
+        for (inference_id, _, _), tensor in zip(target_logs, tensors):
+            if isinstance(tensor, BaseException):
+                logging.error(
+                    f"[ERROR] Failed to load image for reprocessing {inference_id}: "
+                    f"{tensor}"
+                )
+        return [
+            None if isinstance(tensor, BaseException) else tensor for tensor in tensors
+        ]
+
+    async def run_chunk(
+        self,
+        reprocess_job: ReprocessJobModel,
+        vision_model: IVisionModel,
+        target_logs: List[Tuple[str, str, Optional[str]]],
+    ) -> List[Dict]:
+        tensors = await self.load_chunk(vision_model, target_logs)
+        loaded = [
+            (inference_id, tensor)
+            for (inference_id, _, _), tensor in zip(target_logs, tensors)
+            if tensor is not None
+        ]
+        results = []
+        created_at = datetime.now().replace(microsecond=0)
+        for idx in range(0, len(loaded), self.batch_size):
+            batch = loaded[idx : idx + self.batch_size]
+            outputs = await asyncio.to_thread(
+                vision_model.run_tensor_inference,
+                np.stack([tensor for _, tensor in batch]),
+            )
+            for output_idx, (inference_id, _) in enumerate(batch):
+                class_result = vision_model.get_top_k_predictions(
+                    outputs[output_idx : output_idx + 1]
+                )
+                results.append(
+                    {
+                        "job_id": reprocess_job.job_id,
+                        "inference_id": inference_id,
+                        "inference_engine": reprocess_job.inference_engine,
+                        "result": str(class_result),
+                        "created_at": created_at,
+                    }
+                )
+        return results
+
+    async def run_job(self, reprocess_job: ReprocessJobModel):
+        job_id = reprocess_job.job_id
+        logging.info(
+            f"[LOG] Reprocess job started : {job_id} (checkpoint "
+            f"{reprocess_job.checkpoint})"
+        )
+        start_time = time.monotonic()
+        handled_count = 0
+        try:
+            vision_model = await self.get_vision_model(reprocess_job.inference_engine)
+            while self.running:
+                if not await self.wait_for_live_traffic(job_id):
+                    logging.info(f"[LOG] Reprocess job released : {job_id}")
+                    return
+                target_logs = await asyncio.to_thread(
+                    self.get_target_logs, reprocess_job
+                )
+                if not target_logs:
+                    await asyncio.to_thread(
+                        self.update_job,
+                        job_id,
+                        {"status": "completed", "finished_at": datetime.now()},
+                    )
+                    logging.info(f"[LOG] Reprocess job completed : {job_id}")
+                    return
+
+                results = await self.run_chunk(reprocess_job, vision_model, target_logs)
+                handled_count += len(target_logs)
+                rate = handled_count / max(time.monotonic() - start_time, 1e-6)
+                checkpoint = target_logs[-1][0]
+                # 결과와 체크포인트를 함께 기록하여 재개 시 중복/누락이 없도록 함
+                if not await asyncio.to_thread(
+                    self.save_chunk,
+                    job_id,
+                    results,
+                    checkpoint,
+                    len(results),
+                    len(target_logs) - len(results),
+                    rate,
+                ):
+                    logging.info(f"[LOG] Reprocess job released : {job_id}")
+                    return
+                reprocess_job.checkpoint = checkpoint
+                await asyncio.sleep(self.throttle)
+        except Exception as e:
+            logging.error(f"[ERROR] Reprocess job failed : {job_id} {e}")
+            await asyncio.to_thread(
+                self.update_job,
+                job_id,
+                {"status": "failed", "error": str(e), "finished_at": datetime.now()},
+            )
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    def stop(self):
+        self.running = False
+        if self.task:
+            self.task.cancel()
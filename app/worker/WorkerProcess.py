@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import os
+import signal
+from typing import List, Optional, Set
+from app.worker.InferenceWorker import InferenceWorker
+from app.worker.ReprocessWorker import ReprocessWorker
+
+
+def parse_cpu_list(value: str) -> Set[int]:
+    # taskset 형식 : "0-3,8,10-11"
+    cpus = set()
+    for part in value.split(","):
+        if "-" in part:
+            start, end = part.split("-")
+            cpus.update(range(int(start), int(end) + 1))
+        elif part:
+            cpus.add(int(part))
+    return cpus
+
+
+def get_cpu_sets(cpu_affinity: Optional[str], processes: int) -> List[Optional[Set[int]]]:
+    if not cpu_affinity:
+        return [None] * processes
+    if cpu_affinity == "auto":
+        # 현재 프로세스에 허용된 CPU를 프로세스 수만큼 균등하게 나눔
+        available = sorted(os.sched_getaffinity(0))
+        size = max(1, len(available) // processes)
+        starts = [(i * size) % len(available) for i in range(processes)]
+        return [set(available[start : start + size]) for start in starts]
+    cpu_sets = [parse_cpu_list(value) for value in cpu_affinity.split(":")]
+    # 지정한 묶음보다 프로세스가 많으면 순서대로 다시 사용
+    return [cpu_sets[i % len(cpu_sets)] for i in range(processes)]
+
+
+async def run_workers(inference_engine: str, concurrency: int, num_threads: Optional[int]):
+    # 인터프리터는 스레드 안전하지 않으므로 동시 실행 수만큼 모델 세션을 생성
+    workers = [
+        InferenceWorker(inference_engine, num_threads) for _ in range(concurrency)
+    ]
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(
+            signum, lambda: [worker.shutdown_handler() for worker in workers]
+        )
+    await asyncio.gather(*(worker.run() for worker in workers))
+
+
+async def run_reprocess_worker(inference_engines: List[str]):
+    worker = ReprocessWorker(inference_engines)
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, worker.stop)
+    worker.start()
+    try:
+        await worker.task
+    except asyncio.CancelledError:
+        pass
+
+
+def run_reprocess_process(inference_engines: List[str], metrics_port: Optional[int]):
+    logging.basicConfig(level=logging.INFO, force=True)
+    if metrics_port:
+        from prometheus_client import start_http_server
+
+        start_http_server(metrics_port)
+    logging.info(
+        "[LOG] Reprocess worker process started : "
+        f"engines={','.join(inference_engines)}"
+    )
+    asyncio.run(run_reprocess_worker(inference_engines))
+    logging.info("[LOG] Reprocess worker process has been stopped.")
+
+
+def run_worker_process(
+    index: int,
+    inference_engine: str,
+    concurrency: int,
+    cpus: Optional[Set[int]],
+    num_threads: Optional[int],
+    metrics_port: Optional[int],
+):
+    logging.basicConfig(level=logging.INFO, force=True)
+    if cpus:
+        os.sched_setaffinity(0, cpus)
+    if metrics_port:
+        from prometheus_client import start_http_server
+
+        # 프로세스마다 메트릭 포트를 하나씩 사용
+        start_http_server(metrics_port + index)
+    logging.info(
+        f"[LOG] Inference worker process started : engine={inference_engine} "
+        f"concurrency={concurrency} cpus={sorted(cpus) if cpus else 'all'} "
+        f"threads={num_threads or 'default'}"
+    )
+    asyncio.run(run_workers(inference_engine, concurrency, num_threads))
@@ -0,0 +1,114 @@
+"""독립 실행형 추론 워커
+
+API 서버와 분리하여 추론 용량만 늘릴 때 사용합니다.
+API 서버는 INFERENCE_WORKERS_IN_PROCESS=false 로 실행하여 모델을 올리지 않도록 합니다.
+
+    python -m app.worker --engine tflite --processes 4 --cpu-affinity auto
+    python -m app.worker --engine onnx --concurrency 2 --cpu-affinity 0-3:4-7 --processes 2
+    python -m app.worker --reprocess
+"""
+
+import argparse
+import logging
+import multiprocessing
+import signal
+import time
+from app.infrastructure.Environment import get_environment_variables
+from app.routers.v1.ImageClassificationRouter import SUPPORTED_INFERENCE_ENGINES
+from app.worker.WorkerProcess import (
+    get_cpu_sets,
+    run_reprocess_process,
+    run_worker_process,
+)
+
+
+def main():
+    env = get_environment_variables()
+    parser = argparse.ArgumentParser(prog="python -m app.worker")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--engine", choices=sorted(SUPPORTED_INFERENCE_ENGINES))
+    mode.add_argument(
+        "--reprocess",
+        action="store_true",
+        help="run the reprocessing job worker instead of an inference worker",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=1, help="worker loops per process"
+    )
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument(
+        "--cpu-affinity",
+        help='"auto" to split the allowed CPUs evenly, or per-process CPU lists '
+        'separated by ":" (e.g. "0-3:4-7")',
+    )
+    parser.add_argument(
+        "--num-threads",
+        type=int,
+        default=env.INFERENCE_NUM_THREADS,
+        help="intra-op threads per model, 0 uses the pinned CPU count or the runtime default",
+    )
+    parser.add_argument("--metrics-port", type=int)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, force=True)
+    if env.QUEUE_BACKEND == "memory":
+        # 메모리 대기열은 API 프로세스 안에만 존재하므로 별도 워커가 메시지를 받을 수 없고
+        # 재추론 워커도 실시간 대기열 길이를 볼 수 없음
+        parser.error(
+            "QUEUE_BACKEND=memory requires REPROCESS_ENABLED=true"
+            if args.reprocess
+            else "QUEUE_BACKEND=memory requires INFERENCE_WORKERS_IN_PROCESS=true"
+        )
+    if args.reprocess:
+        run_reprocess_process(sorted(SUPPORTED_INFERENCE_ENGINES), args.metrics_port)
+        return
+    cpu_sets = get_cpu_sets(args.cpu_affinity, args.processes)
+
+    def start_process(index: int) -> multiprocessing.Process:
+        cpus = cpu_sets[index]
+        num_threads = args.num_threads or (len(cpus) if cpus else None)
+        process = multiprocessing.get_context("spawn").Process(
+            target=run_worker_process,
+            args=(
+                index,
+                args.engine,
+                args.concurrency,
+                cpus,
+                num_threads,
+                args.metrics_port,
+            ),
+            name=f"inference-worker-{args.engine}-{index}",
+        )
+        process.start()
+        return process
+
+    processes = [start_process(index) for index in range(args.processes)]
+    stopping = False
+
+    def shutdown_handler(signum, frame):
+        nonlocal stopping
+        logging.info("[LOG] Shutdown signal received : Stopping worker processes...")
+        stopping = True
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGTERM, shutdown_handler)
+    signal.signal(signal.SIGINT, shutdown_handler)
+
+    while not stopping:
+        for index, process in enumerate(processes):
+            if not process.is_alive() and not stopping:
+                logging.error(
+                    f"[ERROR] {process.name} exited with {process.exitcode}, restarting"
+                )
+                processes[index] = start_process(index)
+        time.sleep(1)
+
+    for process in processes:
+        process.join()
+    logging.info("[LOG] All worker processes have been stopped.")
+
+
+if __name__ == "__main__":
+    main()
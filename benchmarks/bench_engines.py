@@ -0,0 +1,294 @@
+"""VisionModel 엔진 오프라인 벤치마크
+
+외부 서비스(DB, Redis, S3) 없이 고정된 이미지 코퍼스로 추론 엔진만 측정합니다.
+엔진 x 스레드 수 x 배치 크기 x 이미지 크기 조합마다 별도 프로세스에서 실행하여
+최대 RSS가 서로 섞이지 않도록 합니다.
+
+    python -m benchmarks.bench_engines
+    python -m benchmarks.bench_engines --engines onnx --batch-sizes 1,8 --threads 1,4
+    python -m benchmarks.bench_engines --compare benchmarks/results/<old>.json benchmarks/results/<new>.json
+"""
+
+import argparse
+import io
+import itertools
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import zipfile
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+from PIL import Image
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT_DIR, "tests", "data")
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+CONFIG_KEYS = ("engine", "num_threads", "batch_size", "image_size")
+
+
+def load_corpus(image_size: int, limit: int) -> List[bytes]:
+    """tests/data의 이미지를 긴 변이 image_size가 되도록 다시 인코딩합니다."""
+    sources = [open(os.path.join(DATA_DIR, "rabbit.jpg"), "rb").read()]
+    for zip_name in ("dataset.zip", "valid.zip"):
+        with zipfile.ZipFile(os.path.join(DATA_DIR, zip_name)) as zip_file:
+            for name in sorted(zip_file.namelist()):
+                if name.lower().endswith(IMAGE_EXTENSIONS) and "__MACOSX" not in name:
+                    sources.append(zip_file.read(name))
+
+    images = []
+    for image_data in sources:
+        try:
+            images.append(Image.open(io.BytesIO(image_data)).convert("RGB"))
+        except OSError:
+            # 테스트용으로 일부러 넣어둔 깨진 이미지는 제외
+            continue
+
+    corpus = []
+    for image in itertools.islice(itertools.cycle(images), limit):
+        scale = image_size / max(image.size)
+        image = image.resize(
+            (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        )
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=90)
+        corpus.append(buffer.getvalue())
+    return corpus
+
+
+def get_peak_rss_mb() -> float:
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 byte 단위
+    return peak_rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_config(config: Dict, iterations: int, warmup: int, corpus_size: int) -> Dict:
+    """하나의 조합을 현재 프로세스에서 측정합니다."""
+    from app.infrastructure.Interfaces import get_model_session
+
+    corpus = load_corpus(config["image_size"], corpus_size)
+    rss_before_model = get_peak_rss_mb()
+    vision_model = get_model_session(config["engine"], config["num_threads"])
+    batch_size = config["batch_size"]
+    batches = [
+        [corpus[(i * batch_size + j) % len(corpus)] for j in range(batch_size)]
+        for i in range(warmup + iterations)
+    ]
+
+    preprocess_seconds, inference_seconds, latencies = [], [], []
+    for i, batch in enumerate(batches):
+        start = time.perf_counter()
+        tensors = np.stack([vision_model.decode_image(image) for image in batch])
+        decoded = time.perf_counter()
+        vision_model.run_tensor_inference(tensors)
+        finished = time.perf_counter()
+        if i < warmup:
+            continue
+        preprocess_seconds.append(decoded - start)
+        inference_seconds.append(finished - decoded)
+        latencies.append(finished - start)
+
+    total_seconds = sum(latencies)
+    total_preprocess = sum(preprocess_seconds)
+    return {
+        **config,
+        "iterations": iterations,
+        "images": iterations * batch_size,
+        "images_per_sec": iterations * batch_size / total_seconds,
+        "batch_latency_p50_ms": float(np.percentile(latencies, 50) * 1000),
+        "batch_latency_p99_ms": float(np.percentile(latencies, 99) * 1000),
+        "preprocess_ms_per_image": total_preprocess / (iterations * batch_size) * 1000,
+        "inference_ms_per_image": sum(inference_seconds)
+        / (iterations * batch_size)
+        * 1000,
+        "preprocess_ratio": total_preprocess / total_seconds,
+        "model_rss_mb": get_peak_rss_mb() - rss_before_model,
+        "peak_rss_mb": get_peak_rss_mb(),
+    }
+
+
+def run_config_in_subprocess(
+    config: Dict, iterations: int, warmup: int, corpus_size: int
+) -> Dict:
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.bench_engines",
+            "--run-config",
+            json.dumps(config),
+            "--iterations",
+            str(iterations),
+            "--warmup",
+            str(warmup),
+            "--corpus-size",
+            str(corpus_size),
+        ],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        return {**config, "error": completed.stderr.strip().splitlines()[-1]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def get_git_sha() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_header():
+    print(
+        f"{'engine':<8} {'threads':>7} {'batch':>5} {'size':>5} {'img/s':>9} "
+        f"{'p50 ms':>9} {'p99 ms':>9} {'pre ms':>8} {'inf ms':>8} {'rss MB':>8}"
+    )
+
+
+def print_result(result: Dict):
+    config = (
+        f"{result['engine']:<8} {str(result['num_threads']):>7} "
+        f"{result['batch_size']:>5} {result['image_size']:>5}"
+    )
+    if "error" in result:
+        print(f"{config} ERROR {result['error']}")
+        return
+    print(
+        f"{config} {result['images_per_sec']:>9.1f} "
+        f"{result['batch_latency_p50_ms']:>9.2f} {result['batch_latency_p99_ms']:>9.2f} "
+        f"{result['preprocess_ms_per_image']:>8.2f} "
+        f"{result['inference_ms_per_image']:>8.2f} {result['peak_rss_mb']:>8.1f}"
+    )
+
+
+def compare_results(base_path: str, head_path: str, threshold: float) -> int:
+    """두 결과 파일을 비교하여 처리량 감소 / p99 증가가 threshold를 넘으면 1을 반환합니다."""
+    with open(base_path) as file:
+        base = json.load(file)
+    with open(head_path) as file:
+        head = json.load(file)
+
+    def index(report: Dict) -> Dict:
+        return {
+            tuple(result[key] for key in CONFIG_KEYS): result
+            for result in report["results"]
+            if "error" not in result
+        }
+
+    base_results, head_results = index(base), index(head)
+    regressions = 0
+    print(f"base {base['git_sha']} -> head {head['git_sha']}")
+    for key in sorted(base_results.keys() & head_results.keys(), key=str):
+        old, new = base_results[key], head_results[key]
+        throughput_change = new["images_per_sec"] / old["images_per_sec"] - 1
+        p99_change = new["batch_latency_p99_ms"] / old["batch_latency_p99_ms"] - 1
+        regressed = throughput_change < -threshold or p99_change > threshold
+        regressions += regressed
+        print(
+            f"{'REGRESSION' if regressed else 'ok':<10} "
+            f"{'/'.join(str(v) for v in key):<24} "
+            f"img/s {old['images_per_sec']:.1f} -> {new['images_per_sec']:.1f} "
+            f"({throughput_change:+.1%}), "
+            f"p99 {old['batch_latency_p99_ms']:.2f} -> {new['batch_latency_p99_ms']:.2f} ms "
+            f"({p99_change:+.1%})"
+        )
+    for key in sorted(base_results.keys() ^ head_results.keys(), key=str):
+        print(f"{'skipped':<10} {'/'.join(str(v) for v in key)} (한쪽 결과에만 존재)")
+    return 1 if regressions else 0
+
+
+def parse_int_list(value: str) -> List[Optional[int]]:
+    # 스레드 수 0은 런타임 기본값을 의미
+    return [int(v) or None for v in value.split(",") if v]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VisionModel engine benchmark")
+    parser.add_argument("--engines", default="tflite,onnx")
+    parser.add_argument("--batch-sizes", default="1,8,32")
+    parser.add_argument("--threads", default="1,4")
+    parser.add_argument("--image-sizes", default="128,512,1024")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--corpus-size", type=int, default=64)
+    parser.add_argument("--threshold", type=float, default=0.1)
+    parser.add_argument("--output")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "HEAD"))
+    parser.add_argument("--run-config", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(compare_results(*args.compare, args.threshold))
+
+    if args.run_config:
+        result = run_config(
+            json.loads(args.run_config), args.iterations, args.warmup, args.corpus_size
+        )
+        print(json.dumps(result))
+        return
+
+    configs = [
+        {
+            "engine": engine,
+            "num_threads": num_threads,
+            "batch_size": batch_size,
+            "image_size": image_size,
+        }
+        for engine, num_threads, batch_size, image_size in itertools.product(
+            args.engines.split(","),
+            parse_int_list(args.threads),
+            parse_int_list(args.batch_sizes),
+            parse_int_list(args.image_sizes),
+        )
+    ]
+    results = []
+    print_header()
+    for config in configs:
+        result = run_config_in_subprocess(
+            config, args.iterations, args.warmup, args.corpus_size
+        )
+        print_result(result)
+        results.append(result)
+
+    git_sha = get_git_sha()
+    output_path = args.output or os.path.join(RESULTS_DIR, f"{git_sha}.json")
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, "w") as file:
+        json.dump(
+            {
+                "git_sha": git_sha,
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "machine": {
+                    "platform": platform.platform(),
+                    "python": platform.python_version(),
+                    "cpu_count": os.cpu_count(),
+                },
+                "args": {
+                    key: value
+                    for key, value in vars(args).items()
+                    if key not in ("compare", "run_config", "output")
+                },
+                "results": results,
+            },
+            file,
+            indent=2,
+        )
+    print(f"[LOG] Benchmark results written to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,18 @@
 import pytest
 import asyncio
+import zipfile
+from io import BytesIO
 from fastapi.testclient import TestClient
 import sys
 from pathlib import Path
+from datetime import datetime
 
 project_root = Path(__file__).resolve().parents[1]
 sys.path.append(str(project_root))
 
 from app.main import app
+from app.infrastructure.Database import engine as database_engine
+from app.models.InferenceLogModel import PARTITIONED
 
 client = TestClient(app)
 
@@ -58,6 +63,53 @@ async def test_get_inference_status_processing(inference_id_holder):
     assert response.json()["status"]["msg"] in ["processing", "completed"]
 
 
+@pytest.mark.asyncio
+async def test_get_inference_status_conditional_request(monkeypatch):
+    from app.infrastructure.Interfaces import SessionLocal
+    from app.models.InferenceLogModel import InferenceLogModel
+    from app.services.ImageClassificationService import ImageClassificationService
+    from app.services.InferenceLogService import InferenceLogService
+
+    # 워커 없이 완료된 결과를 만들어 항상 완료 경로를 검사
+    inference_id = f"SI-conditional-{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+    with SessionLocal() as db:
+        db.add(
+            InferenceLogModel(
+                inference_id=inference_id,
+                user_id="test_user",
+                inference_engine="tflite",
+                image_path="/bucketimg/IMAGES/" + inference_id,
+                inference_time=0.1,
+                result=str({"rabbit": 0.9}),
+                requested_time=datetime.now().strftime("%Y%m%d%H%M%S%f"),
+                created_at=datetime.now().replace(microsecond=0),
+            )
+        )
+        db.commit()
+
+    response = client.get(f"/api/v1/images/classify/{inference_id}")
+    assert response.json()["status"]["msg"] == "completed"
+    etag = response.headers["etag"]
+    # 삭제로 무효화되는 결과이므로 공유 캐시에 저장하지 않음
+    assert response.headers["cache-control"] == "private, no-cache"
+
+    # 캐시된 결과로 비교하므로 대기열과 DB를 조회하지 않고 304로 응답
+    def fail_lookup(*args, **kwargs):
+        raise AssertionError("conditional request reached the backend")
+
+    monkeypatch.setattr(
+        ImageClassificationService, "find_inference_queue_by_id", fail_lookup
+    )
+    monkeypatch.setattr(
+        InferenceLogService, "find_serialized_inference_log_by_id", fail_lookup
+    )
+    response = client.get(
+        f"/api/v1/images/classify/{inference_id}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+
 @pytest.mark.asyncio
 async def test_delete_inference_log_not_found():
     inference_id = "non_existing_inference_id"
@@ -140,6 +192,920 @@ async def test_classify_images_from_zip_invalid_inference_engine():
     assert response_json["data"] == {}
 
 
+@pytest.mark.asyncio
+async def test_metrics_endpoint():
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert "inference_queue_length" in response.text
+    assert "http_request_duration_seconds" in response.text
+
+
+@pytest.mark.asyncio
+async def test_request_spans_are_exported():
+    from app.infrastructure.Interfaces import get_tracer
+    from app.infrastructure.Tracing import InMemoryTraceExporter
+
+    tracer = get_tracer()
+    original_exporter = tracer.exporter
+    tracer.exporter = InMemoryTraceExporter()
+    try:
+        response = client.get("/")
+        assert response.status_code == 200
+        assert "GET /" in [span["name"] for span in tracer.exporter.spans]
+    finally:
+        tracer.exporter = original_exporter
+
+
+@pytest.mark.asyncio
+async def test_file_trace_exporter_flushes_without_new_spans(tmp_path):
+    from app.infrastructure.Tracing import FileTraceExporter, Tracer
+
+    trace_path = tmp_path / "traces.jsonl"
+    exporter = FileTraceExporter(str(trace_path), "test", flush_interval=0.05)
+    try:
+        tracer = Tracer(exporter)
+        with tracer.start_span("last.span"):
+            pass
+        # 뒤이은 export가 없어도 주기적으로 기록됨
+        for _ in range(50):
+            if trace_path.read_text():
+                break
+            await asyncio.sleep(0.05)
+        assert "last.span" in trace_path.read_text()
+    finally:
+        exporter.close()
+    # 닫힌 뒤의 스팬은 오류 없이 버림
+    exporter.export([])
+
+
+@pytest.mark.asyncio
+async def test_get_slowest_traces():
+    response = client.get("/api/v1/debug/traces", params={"limit": 5})
+    assert response.status_code == 200
+    response_json = response.json()
+    assert response_json["status"]["msg"] == "success"
+    assert len(response_json["data"]["traces"]) <= 5
+
+
+@pytest.mark.asyncio
+async def test_classify_single_image_auto_engine():
+    image_path = TEST_DATA_DIR / "rabbit.jpg"
+    with open(image_path, "rb") as img_file:
+        response = client.post(
+            "/api/v1/images/classify",
+            files={"image": ("rabbit.jpg", img_file, "image/jpeg")},
+            data={"user_id": "test_user", "inference_engine": "auto"},
+        )
+    assert response.status_code == 202
+    response_json = response.json()
+    assert response_json["status"]["msg"] == "processing"
+    assert response_json["data"]["inference_engine"] in ["tflite", "onnx"]
+
+    await asyncio.sleep(5)
+
+    inference_id = response_json["data"]["inference_id"]
+    response = client.get(f"/api/v1/images/classify/{inference_id}")
+    assert response.status_code in [200, 202]
+    if response.json()["status"]["msg"] == "completed":
+        assert response.json()["data"]["requested_engine"] == "auto"
+
+
+@pytest.mark.asyncio
+async def test_cascade_escalates_uncertain_predictions(monkeypatch):
+    import numpy as np
+    from app.infrastructure.Environment import get_environment_variables
+    from app.worker.InferenceWorker import InferenceWorker
+
+    image_path = TEST_DATA_DIR / "rabbit.jpg"
+    with open(image_path, "rb") as img_file:
+        response = client.post(
+            "/api/v1/images/classify",
+            files={"image": ("rabbit.jpg", img_file, "image/jpeg")},
+            data={"user_id": "test_user", "inference_engine": "cascade"},
+        )
+    assert response.status_code == 202
+    assert response.json()["data"]["inference_engine"] == "tflite"
+
+    # 실행 중인 워커가 꺼내 가지 않도록 두 번째 엔진은 테스트 전용 이름 사용
+    second_engine = f"test_cascade_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+    monkeypatch.setattr(
+        get_environment_variables(), "CASCADE_SECOND_ENGINE", second_engine
+    )
+    worker = InferenceWorker("tflite")
+    message = {
+        "inference_id": f"SI-{second_engine}",
+        "user_id": "test_user",
+        "inference_engine": "tflite",
+        "requested_engine": "cascade",
+        "image_path": "/bucketimg/IMAGES/SI-cascade",
+        "requested_time": datetime.now().strftime("%Y%m%d%H%M%S%f"),
+    }
+
+    confident = worker.start_item(dict(message))
+    output = np.zeros((1, 100), dtype=np.float32)
+    output[0, 3] = 20.0
+    assert not await worker.escalate_if_uncertain(confident, output)
+    confident.class_result = worker.vision_model.get_top_k_predictions(output)
+    assert worker.make_inference_log(confident).cascade_stage == 1
+
+    # 확률이 고르게 퍼진 결과는 두 번째 엔진의 큐로 넘어감
+    uncertain = worker.start_item(dict(message))
+    uncertain_output = np.zeros((1, 100), dtype=np.float32)
+    assert await worker.escalate_if_uncertain(uncertain, uncertain_output)
+    assert worker.queue.get_queue_length(second_engine) == 1
+    escalated = worker.queue.dequeue_messages(second_engine, 1)[0]
+    assert escalated["inference_engine"] == second_engine
+    assert escalated["cascade_stage"] == 2
+    assert not await worker.escalate_if_uncertain(
+        worker.start_item(escalated), uncertain_output
+    )
+
+
+@pytest.mark.asyncio
+async def test_classify_reuses_near_duplicate_results(monkeypatch):
+    from io import BytesIO
+    from PIL import Image
+    from app.infrastructure.Environment import get_environment_variables
+    from app.infrastructure.Interfaces import SessionLocal, get_near_duplicate_index
+    from app.models.InferenceLogModel import InferenceLogModel
+    from app.services.ImageClassificationService import compute_image_hash
+
+    monkeypatch.setattr(get_environment_variables(), "NEAR_DUPLICATE_ENABLED", True)
+    with open(TEST_DATA_DIR / "rabbit.jpg", "rb") as img_file:
+        image_hash = compute_image_hash(img_file)
+    original_id = f"SI-near-duplicate-{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+    with SessionLocal() as db:
+        db.add(
+            InferenceLogModel(
+                inference_id=original_id,
+                user_id="test_user",
+                inference_engine="tflite",
+                image_path="/bucketimg/IMAGES/" + original_id,
+                inference_time=0.1,
+                result=str({"rabbit": 0.9}),
+                requested_time=datetime.now().strftime("%Y%m%d%H%M%S%f"),
+                created_at=datetime.now().replace(microsecond=0),
+            )
+        )
+        db.commit()
+    get_near_duplicate_index().add(image_hash, "test_user", "tflite", original_id)
+
+    # 다시 인코딩하고 크기를 줄인 이미지도 같은 이미지로 판단
+    with Image.open(TEST_DATA_DIR / "rabbit.jpg") as image:
+        image = image.convert("RGB")
+        image = image.resize((image.width * 9 // 10, image.height * 9 // 10))
+        buffer = BytesIO()
+        image.save(buffer, format="JPEG", quality=60)
+    response = client.post(
+        "/api/v1/images/classify",
+        files={"image": ("rabbit_copy.jpg", buffer.getvalue(), "image/jpeg")},
+        data={"user_id": "test_user", "inference_engine": "tflite"},
+    )
+    assert response.status_code == 200
+    response_json = response.json()
+    assert response_json["status"]["msg"] == "completed"
+    assert response_json["data"]["duplicate_of"] == original_id
+    assert response_json["data"]["result"] == {"rabbit": 0.9}
+
+    inference_id = response_json["data"]["inference_id"]
+    response = client.get(f"/api/v1/images/classify/{inference_id}")
+    assert response.status_code == 200
+    assert response.json()["data"]["duplicate_of"] == original_id
+
+    # 다른 엔진을 요청하면 재사용하지 않고 대기열에 추가
+    response = client.post(
+        "/api/v1/images/classify",
+        files={"image": ("rabbit_copy.jpg", buffer.getvalue(), "image/jpeg")},
+        data={"user_id": "test_user", "inference_engine": "onnx"},
+    )
+    assert response.status_code == 202
+
+    # 다른 사용자의 결과는 재사용하지 않아 추론 ID가 노출되지 않음
+    response = client.post(
+        "/api/v1/images/classify",
+        files={"image": ("rabbit_copy.jpg", buffer.getvalue(), "image/jpeg")},
+        data={"user_id": "other_user", "inference_engine": "tflite"},
+    )
+    assert response.status_code == 202
+    assert "duplicate_of" not in response.json()["data"]
+
+
+@pytest.mark.asyncio
+async def test_worker_records_failed_inference():
+    from app.worker.InferenceWorker import InferenceWorker
+
+    worker = InferenceWorker("tflite")
+    inference_id = f"SI-failed-{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+    message = {
+        "inference_id": inference_id,
+        "user_id": "test_user",
+        "inference_engine": "tflite",
+        "image_path": "/bucketimg/IMAGES/" + inference_id,
+        "requested_time": datetime.now().strftime("%Y%m%d%H%M%S%f"),
+    }
+    # 원본 이미지가 없으면 다운로드 단계에서 실패
+    download_slots = asyncio.Semaphore(1)
+    await download_slots.acquire()
+    await worker.download_stage(message, download_slots)
+
+    response = client.get(f"/api/v1/images/classify/{inference_id}")
+    assert response.status_code == 200
+    assert response.json()["status"]["msg"] == "failed"
+    assert response.json()["data"]["error"]
+    assert response.json()["data"]["result"] == {}
+
+
+@pytest.mark.asyncio
+async def test_worker_records_undeliverable_message():
+    from app.worker.InferenceWorker import InferenceWorker
+
+    worker = InferenceWorker("tflite")
+    inference_id = f"SI-undeliverable-{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+    await worker.fail_undeliverable(
+        {
+            "inference_id": inference_id,
+            "user_id": "test_user",
+            "inference_engine": "tflite",
+            "image_path": "/bucketimg/IMAGES/" + inference_id,
+            "requested_time": datetime.now().strftime("%Y%m%d%H%M%S%f"),
+            "exceeded_deliveries": 3,
+        }
+    )
+
+    response = client.get(f"/api/v1/images/classify/{inference_id}")
+    assert response.status_code == 200
+    assert response.json()["status"]["msg"] == "failed"
+    assert "3 deliveries" in response.json()["data"]["error"]
+
+
+@pytest.mark.asyncio
+async def test_classify_single_image_rate_limited():
+    from app.infrastructure.Interfaces import get_admission_controller, get_queue
+    from app.infrastructure.AdmissionControl import RedisAdmissionController
+
+    app.dependency_overrides[get_admission_controller] = (
+        lambda: RedisAdmissionController(get_queue(), user_rate=0.01, user_burst=1)
+    )
+    user_id = f"rate_limited_user_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+    try:
+        status_codes = []
+        for _ in range(2):
+            with open(TEST_DATA_DIR / "rabbit.jpg", "rb") as img_file:
+                response = client.post(
+                    "/api/v1/images/classify",
+                    files={"image": ("rabbit.jpg", img_file, "image/jpeg")},
+                    data={"user_id": user_id, "inference_engine": "tflite"},
+                )
+            status_codes.append(response.status_code)
+    finally:
+        app.dependency_overrides.pop(get_admission_controller, None)
+
+    assert status_codes == [202, 429]
+    assert int(response.headers["retry-after"]) >= 1
+    assert response.json()["status"]["msg"] == "too many requests"
+
+
+@pytest.mark.asyncio
+async def test_classify_images_from_zip_exceeding_burst():
+    from app.infrastructure.Interfaces import get_admission_controller, get_queue
+    from app.infrastructure.AdmissionControl import RedisAdmissionController
+
+    app.dependency_overrides[get_admission_controller] = (
+        lambda: RedisAdmissionController(get_queue(), user_rate=0.01, user_burst=1)
+    )
+    user_id = f"burst_user_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+    zip_buffer = BytesIO()
+    with zipfile.ZipFile(zip_buffer, "w") as myzip:
+        for idx in range(2):
+            myzip.write(TEST_DATA_DIR / "rabbit.jpg", f"rabbit_{idx}.jpg")
+    try:
+        response = client.post(
+            "/api/v1/images/batch-classify",
+            files={
+                "zip_file": ("rabbits.zip", zip_buffer.getvalue(), "application/zip")
+            },
+            data={"user_id": user_id, "inference_engine": "tflite"},
+        )
+    finally:
+        app.dependency_overrides.pop(get_admission_controller, None)
+
+    # 버스트보다 큰 요청은 재시도해도 통과할 수 없으므로 429가 아닌 413
+    assert response.status_code == 413
+    assert "retry-after" not in response.headers
+    assert response.json()["data"]["limit"] == 1
+    assert response.json()["data"]["requested"] == 2
+
+
+@pytest.mark.asyncio
+async def test_queue_priority_and_user_fairness():
+    from app.infrastructure.Interfaces import get_queue
+
+    queue = get_queue()
+    # 실행 중인 워커가 꺼내 가지 않도록 테스트 전용 엔진 이름 사용
+    inference_engine = f"test_fair_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+    messages = [
+        ("fair_a", "BI-a-0", "batch"),
+        ("fair_a", "BI-a-1", "batch"),
+        ("fair_a", "BI-a-2", "batch"),
+        ("fair_b", "BI-b-0", "batch"),
+        ("fair_c", "SI-c-0", "interactive"),
+    ]
+    for user_id, inference_id, priority in messages:
+        queue.enqueue_message(
+            {
+                "inference_id": f"{inference_engine}-{inference_id}",
+                "user_id": user_id,
+                "inference_engine": inference_engine,
+                "priority": priority,
+            },
+            inference_engine,
+        )
+    assert queue.get_queue_length(inference_engine) == 5
+
+    order = [
+        queue.dequeue_message(inference_engine)["inference_id"].split("-", 1)[1]
+        for _ in range(5)
+    ]
+    assert order == ["SI-c-0", "BI-a-0", "BI-b-0", "BI-a-1", "BI-a-2"]
+    assert queue.dequeue_message(inference_engine) == {}
+    assert queue.get_queue_length(inference_engine) == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_queue_migrates_legacy_list():
+    import json
+    from app.infrastructure.Queue import RedisQueue
+
+    queue = RedisQueue()
+    inference_engine = f"test_legacy_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+    # 이전 버전은 엔진별 리스트에 ID를, 해시에 본문을 저장
+    for idx in range(2):
+        inference_id = f"SI-{inference_engine}-{idx}"
+        queue.client.lpush(queue.get_legacy_queue_name(inference_engine), inference_id)
+        queue.client.hset(
+            queue.hash_name,
+            inference_id,
+            json.dumps(
+                {
+                    "inference_id": inference_id,
+                    "user_id": "legacy_user",
+                    "inference_engine": inference_engine,
+                }
+            ),
+        )
+
+    messages = queue.dequeue_messages(inference_engine, 10)
+    assert [message["inference_id"] for message in messages] == [
+        f"SI-{inference_engine}-0",
+        f"SI-{inference_engine}-1",
+    ]
+    assert not queue.client.exists(queue.get_legacy_queue_name(inference_engine))
+    assert queue.get_queue_length(inference_engine) == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(
+    database_engine.dialect.name != "postgresql", reason="pgmq requires Postgres"
+)
+async def test_pgmq_queue_redelivers_unacked_messages():
+    from app.infrastructure.Queue import PGMQQueue
+
+    queue = PGMQQueue()
+    queue.visibility_timeout = 1
+    # 테이블 이름 길이 제한을 넘지 않도록 짧은 엔진 이름 사용
+    inference_engine = f"pg{datetime.now().strftime('%H%M%S%f')}"
+    inference_id = f"SI-{inference_engine}"
+    queue.enqueue_message(
+        {
+            "inference_id": inference_id,
+            "user_id": "pgmq_user",
+            "inference_engine": inference_engine,
+        },
+        inference_engine,
+    )
+    assert queue.get_queue_length(inference_engine) == 1
+    assert queue.get_message_by_inference_id(inference_id)["user_id"] == "pgmq_user"
+
+    messages = queue.dequeue_messages(inference_engine, 10)
+    assert [message["inference_id"] for message in messages] == [inference_id]
+    # 가시성 제한 시간 동안에는 다른 워커에게 전달되지 않음
+    assert queue.dequeue_messages(inference_engine, 10) == []
+
+    # 확인하지 않은 메시지는 제한 시간이 지나면 다시 전달됨
+    await asyncio.sleep(1.5)
+    messages = queue.dequeue_messages(inference_engine, 10)
+    assert [message["inference_id"] for message in messages] == [inference_id]
+    assert "exceeded_deliveries" not in messages[0]
+
+    # 최대 전달 횟수를 넘으면 워커가 실패로 기록하도록 표시하여 전달
+    queue.max_deliveries = 2
+    await asyncio.sleep(1.5)
+    messages = queue.dequeue_messages(inference_engine, 10)
+    assert messages[0]["exceeded_deliveries"] == 2
+
+    queue.ack_messages(messages)
+    assert queue.get_queue_length(inference_engine) == 0
+    assert queue.get_message_by_inference_id(inference_id) == {}
+    await asyncio.sleep(1.5)
+    assert queue.dequeue_messages(inference_engine, 10) == []
+
+
+@pytest.mark.asyncio
+async def test_cancel_queued_batch():
+    from app.infrastructure.Interfaces import get_queue
+
+    queue = get_queue()
+    inference_engine = f"test_cancel_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+    batch_id = f"BI-{inference_engine}"
+    for idx in range(3):
+        queue.enqueue_message(
+            {
+                "inference_id": f"{batch_id}-{idx}",
+                "user_id": "cancel_user",
+                "inference_engine": inference_engine,
+                "batch_id": batch_id,
+            },
+            inference_engine,
+        )
+    queue.enqueue_message(
+        {
+            "inference_id": f"SI-{inference_engine}",
+            "user_id": "cancel_user",
+            "inference_engine": inference_engine,
+        },
+        inference_engine,
+    )
+
+    response = client.delete(f"/api/v1/images/batch-classify/{batch_id}")
+    assert response.status_code == 200
+    response_json = response.json()
+    assert response_json["status"]["msg"] == "cancelled"
+    assert response_json["data"]["cancelled"] == 3
+
+    assert queue.get_queue_length(inference_engine) == 1
+    assert queue.is_cancelled({"inference_id": f"{batch_id}-9", "batch_id": batch_id})
+    assert queue.dequeue_message(inference_engine)["inference_id"] == f"SI-{inference_engine}"
+    assert queue.dequeue_message(inference_engine) == {}
+
+    response = client.delete(f"/api/v1/images/classify/SI-{inference_engine}")
+    assert response.status_code == 200
+    assert response.json()["data"]["cancelled"] == 0
+
+
+@pytest.mark.asyncio
+async def test_classify_streams_uploads_above_threshold(monkeypatch, tmp_path):
+    from app.infrastructure.Interfaces import get_s3_client
+    from app.routers.v1.ImageClassificationRouter import env
+
+    # 모든 업로드가 청크 업로드 경로를 타도록 임계값을 낮춤
+    monkeypatch.setattr(env, "S3_MULTIPART_THRESHOLD_BYTES", 1)
+
+    image_path = TEST_DATA_DIR / "rabbit.jpg"
+    with open(image_path, "rb") as img_file:
+        response = client.post(
+            "/api/v1/images/classify",
+            files={"image": ("rabbit.jpg", img_file, "image/jpeg")},
+            data={"user_id": "stream_user", "inference_engine": "tflite"},
+        )
+    assert response.status_code == 202
+    inference_id = response.json()["data"]["inference_id"]
+    uploaded = await get_s3_client().download_file(f"IMAGES/{inference_id}")
+    assert uploaded == image_path.read_bytes()
+
+    zip_path = tmp_path / "images.zip"
+    with zipfile.ZipFile(zip_path, "w") as myzip:
+        myzip.write(image_path, "rabbit.jpg")
+    with open(zip_path, "rb") as zip_file:
+        response = client.post(
+            "/api/v1/images/batch-classify",
+            files={"zip_file": ("images.zip", zip_file, "application/zip")},
+            data={"user_id": "stream_user", "inference_engine": "tflite"},
+        )
+    assert response.status_code == 202
+    inference_ids = response.json()["data"]["inference_ids"]
+    assert len(inference_ids) == 1
+    uploaded = await get_s3_client().download_file(f"IMAGES/{inference_ids[0]}")
+    assert uploaded == image_path.read_bytes()
+
+
+@pytest.mark.asyncio
+async def test_multipart_upload_stops_remaining_parts_on_failure():
+    from botocore.exceptions import ClientError
+    from app.infrastructure.ObjectStorage import ZenkoObjectStorage
+
+    uploaded = []
+
+    class FailingS3Client:
+        async def upload_part(self, PartNumber, **kwargs):
+            await asyncio.sleep(0.01 * PartNumber)
+            if PartNumber == 2:
+                raise ClientError({"Error": {"Code": "500"}}, "UploadPart")
+            uploaded.append(PartNumber)
+            return {"ETag": str(PartNumber)}
+
+    storage = ZenkoObjectStorage()
+    file_obj = BytesIO(b"x" * 90)
+    with pytest.raises(ClientError):
+        await storage.upload_parts(
+            FailingS3Client(), "IMAGES/parts", "upload", file_obj, file_obj.read(10)
+        )
+    finished = list(uploaded)
+    # 실패 이후에는 남은 파트를 읽거나 올리지 않음
+    await asyncio.sleep(0.2)
+    assert uploaded == finished
+    assert max(uploaded) < 5
+    assert file_obj.tell() < 90
+
+
+@pytest.mark.asyncio
+async def test_classify_rejects_invalid_images_before_upload(monkeypatch, tmp_path):
+    import io
+    from PIL import Image
+    from app.routers.v1.ImageClassificationRouter import env
+
+    monkeypatch.setattr(env, "IMAGE_MAX_PIXELS", 64 * 64)
+    small_png = io.BytesIO()
+    Image.new("RGB", (32, 32)).save(small_png, format="PNG")
+
+    zip_path = tmp_path / "mixed.zip"
+    with zipfile.ZipFile(zip_path, "w") as myzip:
+        myzip.writestr("small.png", small_png.getvalue())
+        myzip.write(TEST_DATA_DIR / "rabbit.jpg", "rabbit.jpg")
+        myzip.writestr("fake.jpg", "This is not an image")
+        myzip.writestr("truncated.png", small_png.getvalue()[:20])
+        myzip.writestr("notes.txt", "ignored")
+
+    with open(zip_path, "rb") as zip_file:
+        response = client.post(
+            "/api/v1/images/batch-classify",
+            files={"zip_file": ("mixed.zip", zip_file, "application/zip")},
+            data={"user_id": "validation_user", "inference_engine": "tflite"},
+        )
+    assert response.status_code == 202
+    data = response.json()["data"]
+    assert data["inference_ids"] == [f"{data['batch_id']}-0"]
+    assert {entry["file_name"]: entry["reason"] for entry in data["rejected"]} == {
+        "rabbit.jpg": "too_many_pixels",
+        "fake.jpg": "unsupported_format",
+        "truncated.png": "corrupt_header",
+    }
+
+    response = client.post(
+        "/api/v1/images/classify",
+        files={"image": ("fake.jpg", b"This is not an image", "image/jpeg")},
+        data={"user_id": "validation_user", "inference_engine": "tflite"},
+    )
+    assert response.status_code == 400
+    assert response.json()["status"]["msg"] == "invalid image"
+    assert response.json()["data"]["reason"] == "unsupported_format"
+
+
+@pytest.mark.asyncio
+async def test_classify_accepts_bmp_and_tiff(monkeypatch):
+    import io
+    from PIL import Image
+    from app.routers.v1.ImageClassificationRouter import env
+    from app.services.ImageClassificationService import sniff_image_format
+
+    assert sniff_image_format(b"MM\x00*\x00\x00\x00\x08") == "TIFF"
+    monkeypatch.setattr(env, "IMAGE_MAX_PIXELS", 64 * 64)
+    for image_format, file_name, content_type in (
+        ("BMP", "image.bmp", "image/bmp"),
+        ("TIFF", "image.tif", "image/tiff"),
+    ):
+        # 크기는 헤더에서 읽으므로 픽셀 수 제한도 적용됨
+        for size, status_code in (((32, 32), 202), ((128, 128), 400)):
+            image_data = io.BytesIO()
+            Image.new("RGB", size).save(image_data, format=image_format)
+            response = client.post(
+                "/api/v1/images/classify",
+                files={"image": (file_name, image_data.getvalue(), content_type)},
+                data={"user_id": "format_user", "inference_engine": "tflite"},
+            )
+            assert response.status_code == status_code
+            if status_code == 400:
+                assert response.json()["data"]["reason"] == "too_many_pixels"
+
+
+@pytest.mark.asyncio
+async def test_classify_decoded_tensors():
+    import io
+    import numpy as np
+    from PIL import Image
+    from app.infrastructure.Interfaces import get_s3_client
+
+    frame = np.asarray(
+        Image.open(TEST_DATA_DIR / "rabbit.jpg").convert("RGB").resize((128, 128)),
+        dtype=np.uint8,
+    )
+
+    def to_npy(array):
+        buffer = io.BytesIO()
+        np.save(buffer, array)
+        return buffer.getvalue()
+
+    response = client.post(
+        "/api/v1/images/tensor-classify",
+        files={"tensor": ("frame.npy", to_npy(frame), "application/octet-stream")},
+        data={"user_id": "tensor_user", "inference_engine": "tflite"},
+    )
+    assert response.status_code == 202
+    inference_id = response.json()["data"]["inference_id"]
+
+    frames = np.stack([frame, frame[::-1]])
+    response = client.post(
+        "/api/v1/images/tensor-classify",
+        files={"tensor": ("frames.npy", to_npy(frames), "application/octet-stream")},
+        data={"user_id": "tensor_user", "inference_engine": "tflite"},
+    )
+    assert response.status_code == 202
+    data = response.json()["data"]
+    assert data["inference_ids"] == [f"{data['batch_id']}-0", f"{data['batch_id']}-1"]
+
+    # 각 추론은 업로드된 객체에서 자기 프레임 구간만 읽음
+    stored = await get_s3_client().download_file(f"TENSORS/{data['batch_id']}.npy")
+    assert stored == to_npy(frames)
+
+    response = client.post(
+        "/api/v1/images/tensor-classify",
+        files={
+            "tensor": ("frame.npy", to_npy(frame.astype(np.float32)), "application/octet-stream")
+        },
+        data={"user_id": "tensor_user", "inference_engine": "tflite"},
+    )
+    assert response.status_code == 400
+    assert response.json()["data"]["reason"] == "unsupported_dtype"
+
+    await asyncio.sleep(5)
+    response = client.get(f"/api/v1/images/classify/{inference_id}")
+    assert response.status_code in [200, 202]
+    assert response.json()["status"]["msg"] in ["processing", "completed"]
+
+
+@pytest.mark.asyncio
+async def test_classify_images_from_prefix(monkeypatch):
+    from app.infrastructure.Environment import get_environment_variables
+    from app.infrastructure.Interfaces import get_s3_client
+
+    # 한 페이지에 한 개씩 나열하여 페이지 이어받기까지 확인
+    monkeypatch.setattr(get_environment_variables(), "PREFIX_BATCH_PAGE_SIZE", 1)
+    prefix = f"datasets/{datetime.now().strftime('%Y%m%d%H%M%S%f')}/"
+    image_data = (TEST_DATA_DIR / "rabbit.jpg").read_bytes()
+    s3_client = get_s3_client()
+    for object_key in ("a/rabbit_0.jpg", "b/rabbit_1.jpg"):
+        await s3_client.upload_file(prefix + object_key, image_data)
+    await s3_client.upload_file(prefix + "notes.txt", b"not an image")
+    object_keys, continuation_token = await s3_client.list_objects(prefix, None, 2)
+    assert object_keys == [prefix + "a/rabbit_0.jpg", prefix + "b/rabbit_1.jpg"]
+    assert continuation_token is not None
+
+    response = client.post(
+        "/api/v1/images/prefix-classify",
+        data={"user_id": "prefix_user", "inference_engine": "tflite", "prefix": prefix},
+    )
+    assert response.status_code == 202
+    batch_id = response.json()["data"]["batch_id"]
+
+    # 워커는 복사본 없이 원래 키에서 이미지를 읽음
+    for idx, object_key in enumerate(("a/rabbit_0.jpg", "b/rabbit_1.jpg")):
+        response = client.get(f"/api/v1/images/classify/{batch_id}-{idx}")
+        assert response.json()["status"]["msg"] in ["processing", "completed"]
+        if response.json()["status"]["msg"] == "processing":
+            assert response.json()["data"]["object_key"] == prefix + object_key
+    response = client.get(f"/api/v1/images/classify/{batch_id}-2")
+    assert response.json()["status"]["msg"] == "no data"
+
+    for data in ({"prefix": "IMAGES/"}, {}):
+        response = client.post(
+            "/api/v1/images/prefix-classify",
+            data={"user_id": "prefix_user", "inference_engine": "tflite", **data},
+        )
+        assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_classify_images_from_prefix_charges_user_tokens(monkeypatch):
+    from app.infrastructure.Environment import get_environment_variables
+    from app.infrastructure.Interfaces import (
+        get_admission_controller,
+        get_queue,
+        get_s3_client,
+    )
+    from app.infrastructure.AdmissionControl import RedisAdmissionController
+    from app.services.ImageClassificationService import ImageClassificationService
+
+    monkeypatch.setattr(get_environment_variables(), "PREFIX_BATCH_PAGE_SIZE", 1)
+    bucket = get_environment_variables().S3_SCALITY_BUCKET
+    # 키 안에 버킷 이름이 있어도 이미지 경로가 잘리지 않음
+    prefix = f"datasets/{bucket}/{datetime.now().strftime('%Y%m%d%H%M%S%f')}/"
+    assert (
+        ImageClassificationService.get_image_path(f"http://s3/{bucket}/{prefix}a.jpg")
+        == f"/{bucket}/{prefix}a.jpg"
+    )
+    image_data = (TEST_DATA_DIR / "rabbit.jpg").read_bytes()
+    s3_client = get_s3_client()
+    for idx in range(3):
+        await s3_client.upload_file(f"{prefix}rabbit_{idx}.jpg", image_data)
+
+    app.dependency_overrides[get_admission_controller] = (
+        lambda: RedisAdmissionController(get_queue(), user_rate=0.01, user_burst=2)
+    )
+    user_id = f"prefix_rate_user_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+    try:
+        response = client.post(
+            "/api/v1/images/prefix-classify",
+            data={"user_id": user_id, "inference_engine": "tflite", "prefix": prefix},
+        )
+    finally:
+        app.dependency_overrides.pop(get_admission_controller, None)
+    assert response.status_code == 202
+    batch_id = response.json()["data"]["batch_id"]
+
+    # 버스트 2개만큼만 대기열에 넣고 나열을 멈춤
+    for idx in range(2):
+        response = client.get(f"/api/v1/images/classify/{batch_id}-{idx}")
+        assert response.json()["status"]["msg"] in ["processing", "completed"]
+    response = client.get(f"/api/v1/images/classify/{batch_id}-2")
+    assert response.json()["status"]["msg"] == "no data"
+
+
+@pytest.mark.asyncio
+async def test_tensor_shard_store_round_trip():
+    import numpy as np
+    from app.infrastructure.Interfaces import get_tensor_shard_store
+
+    store = get_tensor_shard_store()
+    store.max_frames = 2
+    shard_date = datetime.now().strftime("%Y%m%d")
+    tensors = {
+        f"SI-shard-{idx}": np.full((128, 128, 3), idx, dtype=np.uint8)
+        for idx in range(3)
+    }
+    tensor_paths = {
+        inference_id: store.append(inference_id, tensor, shard_date)
+        for inference_id, tensor in tensors.items()
+    }
+    # 샤드당 최대 2장 : 3장이면 샤드 2개
+    assert len({path.split("#")[0] for path in tensor_paths.values()}) == 2
+    assert await store.flush(force=True) == 2
+
+    loaded = await store.load_tensors(list(tensor_paths.values()))
+    for inference_id, tensor_path in tensor_paths.items():
+        assert np.array_equal(loaded[tensor_path], tensors[inference_id])
+
+
+@pytest.mark.asyncio
+async def test_reprocess_job_runs_and_resumes():
+    from app.models.InferenceLogModel import InferenceLogModel
+    from app.infrastructure.Interfaces import SessionLocal, get_s3_client
+    from app.worker.ReprocessWorker import ReprocessWorker
+
+    user_id = f"reprocess_user_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+    inference_ids = [f"SI-{user_id}-{idx}" for idx in range(3)]
+    image_data = (TEST_DATA_DIR / "rabbit.jpg").read_bytes()
+    with SessionLocal() as db:
+        for inference_id in inference_ids:
+            await get_s3_client().upload_file("IMAGES/" + inference_id, image_data)
+            db.add(
+                InferenceLogModel(
+                    inference_id=inference_id,
+                    user_id=user_id,
+                    inference_engine="tflite",
+                    image_path="IMAGES/" + inference_id,
+                    inference_time=0.0,
+                    result="{}",
+                    requested_time=datetime.now().strftime("%Y%m%d%H%M%S%f"),
+                    created_at=datetime.now().replace(microsecond=0),
+                )
+            )
+        db.commit()
+
+    response = client.post(
+        "/api/v1/reprocess/jobs",
+        json={"inference_engine": "invalid_engine", "user_id": user_id},
+    )
+    assert response.status_code == 400
+
+    response = client.post(
+        "/api/v1/reprocess/jobs", json={"inference_engine": "onnx", "user_id": user_id}
+    )
+    assert response.status_code == 202
+    job = response.json()["data"]["job"]
+    assert job["status"] == "queued"
+    assert job["total_count"] == 3
+    job_id = job["job_id"]
+
+    # 일시 중지된 작업은 워커가 가져가지 않고, 재개하면 다시 대기 상태가 됨
+    assert client.put(f"/api/v1/reprocess/jobs/{job_id}/pause").status_code == 200
+    assert client.put(f"/api/v1/reprocess/jobs/{job_id}/pause").status_code == 409
+    response = client.put(f"/api/v1/reprocess/jobs/{job_id}/resume")
+    assert response.json()["data"]["job"]["status"] == "queued"
+
+    worker = ReprocessWorker(["tflite", "onnx"])
+    worker.running = True
+    worker.chunk_size = 2
+    worker.throttle = 0
+    claimed_job = worker.claim_next_job()
+    while claimed_job.job_id != job_id:
+        # 다른 테스트가 남긴 작업은 건너뜀
+        worker.update_job(claimed_job.job_id, {"status": "cancelled"})
+        claimed_job = worker.claim_next_job()
+    await worker.run_job(claimed_job)
+
+    job = client.get(f"/api/v1/reprocess/jobs/{job_id}").json()["data"]["job"]
+    assert job["status"] == "completed"
+    assert job["processed_count"] == 3
+    assert job["failed_count"] == 0
+    assert job["checkpoint"] == inference_ids[-1]
+    assert job["rate"] > 0
+
+    response = client.get(f"/api/v1/reprocess/jobs/{job_id}/results")
+    data = response.json()["data"]
+    assert data["total_count"] == 3
+    assert [result["inference_id"] for result in data["results"]] == inference_ids
+    assert all(result["inference_engine"] == "onnx" for result in data["results"])
+
+    assert client.delete(f"/api/v1/reprocess/jobs/{job_id}").status_code == 409
+    assert client.get("/api/v1/reprocess/jobs/RJ-missing").status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_memory_queue_wakeup_and_journal_recovery(tmp_path):
+    from app.infrastructure.Queue import InMemoryQueue
+
+    journal_path = str(tmp_path / "queue.jsonl")
+    queue = InMemoryQueue(journal_path)
+
+    async def enqueue_later():
+        await asyncio.sleep(0.05)
+        for idx in range(3):
+            queue.enqueue_message(
+                {
+                    "inference_id": f"SI-memory-{idx}",
+                    "user_id": "memory_user",
+                    "inference_engine": "tflite",
+                },
+                "tflite",
+            )
+
+    # 메시지가 들어오면 폴링 간격(10초)을 기다리지 않고 바로 깨어나야 함
+    enqueue_task = asyncio.create_task(enqueue_later())
+    started = asyncio.get_running_loop().time()
+    await queue.wait_for_message("tflite", 10.0)
+    assert asyncio.get_running_loop().time() - started < 1.0
+    await enqueue_task
+
+    messages = queue.dequeue_messages("tflite", 2)
+    assert [message["inference_id"] for message in messages] == [
+        "SI-memory-0",
+        "SI-memory-1",
+    ]
+    queue.ack_messages(messages[:1])
+
+    # 확인되지 않은 메시지(처리 중 1건, 대기 중 1건)는 재시작 후 다시 대기열에 들어감
+    recovered_queue = InMemoryQueue(journal_path)
+    assert recovered_queue.get_queue_length("tflite") == 2
+    assert [
+        message["inference_id"]
+        for message in recovered_queue.dequeue_messages("tflite", 10)
+    ] == ["SI-memory-1", "SI-memory-2"]
+
+
+@pytest.mark.asyncio
+async def test_memory_queue_journal_acks_each_delivery(tmp_path):
+    from app.infrastructure.Queue import InMemoryQueue
+
+    journal_path = str(tmp_path / "queue.jsonl")
+    queue = InMemoryQueue(journal_path)
+    message = {
+        "inference_id": "SI-cascade-journal",
+        "user_id": "memory_user",
+        "inference_engine": "tflite",
+    }
+    queue.enqueue_message(message, "tflite")
+    original = queue.dequeue_messages("tflite", 1)[0]
+
+    # cascade는 두 번째 엔진의 큐에 같은 추론 ID로 넣은 뒤 원래 메시지를 확인
+    queue.enqueue_message(dict(message, inference_engine="onnx"), "onnx")
+    escalated = queue.dequeue_messages("onnx", 1)[0]
+    queue.ack_messages([original])
+    assert InMemoryQueue(journal_path).dequeue_messages("onnx", 10) == [escalated]
+
+    # 확인 전에 종료되면 두 번째 엔진의 메시지만 다시 대기열에 들어감
+    crashed_path = str(tmp_path / "crashed.jsonl")
+    crashed_queue = InMemoryQueue(crashed_path)
+    crashed_queue.enqueue_message(message, "tflite")
+    crashed_queue.dequeue_messages("tflite", 1)
+    crashed_queue.enqueue_message(dict(message, inference_engine="onnx"), "onnx")
+    recovered_queue = InMemoryQueue(crashed_path)
+    assert recovered_queue.get_queue_length("tflite") == 0
+    assert recovered_queue.get_queue_length("onnx") == 1
+    assert [
+        message["inference_engine"]
+        for message in recovered_queue.dequeue_messages("onnx", 10)
+    ] == ["onnx"]
+
+
 # ------------------------ LogRouter Tests ------------------------
 
 
@@ -271,6 +1237,7 @@ import pytest
 from fastapi.testclient import TestClient
 import sys
 from pathlib import Path
+from datetime import datetime
 
 project_root = Path(__file__).resolve().parents[1]
 sys.path.append(str(project_root))
@@ -371,3 +1338,202 @@ async def test_delete_inference_log():
         assert response_json["data"]["log"] == "no data"
 
 """
+
+
+@pytest.mark.asyncio
+async def test_worker_persist_is_idempotent_on_redelivery():
+    from app.infrastructure.Interfaces import SessionLocal
+    from app.models.InferenceLogModel import InferenceLogModel
+    from app.worker.InferenceWorker import InferenceWorker, PipelineItem
+
+    worker = InferenceWorker("tflite")
+    requested_time = datetime.now().strftime("%Y%m%d%H%M%S%f")
+    inference_id = f"SI-redelivered-{requested_time}"
+    message = {
+        "inference_id": inference_id,
+        "user_id": "test_user",
+        "inference_engine": "tflite",
+        "image_path": "/bucketimg/IMAGES/" + inference_id,
+        "requested_time": requested_time,
+    }
+    # 커밋 후 확인 전에 종료되어 같은 메시지가 다시 전달된 경우
+    for _ in range(2):
+        item = PipelineItem(dict(message), None)
+        item.class_result = {"rabbit": 0.9}
+        worker.save_inference_logs([worker.make_inference_log(item)])
+
+    with SessionLocal() as db:
+        inference_logs = (
+            db.query(InferenceLogModel)
+            .filter(InferenceLogModel.inference_id == inference_id)
+            .all()
+        )
+    assert len(inference_logs) == 1
+    assert (
+        inference_logs[0].created_at.timestamp()
+        == datetime.strptime(requested_time, "%Y%m%d%H%M%S%f")
+        .replace(microsecond=0)
+        .timestamp()
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(
+    database_engine.dialect.name != "postgresql" or not PARTITIONED,
+    reason="requires Postgres and INFERENCE_LOG_PARTITION_INTERVAL",
+)
+async def test_inference_log_partitions(monkeypatch):
+    from datetime import date
+    from sqlalchemy import text
+    from app.infrastructure.Environment import get_environment_variables
+    from app.infrastructure.Interfaces import SessionLocal
+    from app.models.BaseModel import (
+        create_upcoming_partitions,
+        drop_partition,
+        find_expired_partitions,
+        get_default_partition_name,
+        get_partition_interval,
+        get_partition_name,
+        get_partition_range,
+    )
+    from app.models.InferenceLogModel import InferenceLogModel
+
+    monkeypatch.setattr(
+        get_environment_variables(), "INFERENCE_LOG_PARTITION_PREMAKE", 1
+    )
+    interval = get_partition_interval()
+    table_name = InferenceLogModel.__tablename__
+    starts = [date(2000, 1, 1)]
+    for _ in range(3):
+        starts.append(get_partition_range(starts[-1], interval)[1])
+    partition_names = [
+        get_partition_name(table_name, start, interval) for start in starts
+    ]
+
+    def find_partition(inference_id):
+        with database_engine.connect() as connection:
+            return connection.execute(
+                text(
+                    f'SELECT tableoid::regclass::text FROM "{table_name}" '
+                    "WHERE inference_id = :inference_id"
+                ),
+                {"inference_id": inference_id},
+            ).scalar()
+
+    def partition_exists(partition_name):
+        with database_engine.connect() as connection:
+            return connection.execute(
+                text("SELECT to_regclass(:name)"), {"name": f'"{partition_name}"'}
+            ).scalar()
+
+    # 오늘을 포함한 파티션과 PREMAKE개의 다음 파티션, DEFAULT 파티션을 생성
+    create_upcoming_partitions(starts[0])
+    assert partition_exists(get_default_partition_name(table_name))
+    assert partition_exists(partition_names[0])
+    assert partition_exists(partition_names[1])
+    assert not partition_exists(partition_names[2])
+
+    # 파티션이 없는 범위의 행은 DEFAULT 파티션에 저장되고,
+    # 해당 파티션을 만들 때 새 파티션으로 옮겨짐
+    inference_id = f"SI-partition-{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+    with SessionLocal() as db:
+        db.add(
+            InferenceLogModel(
+                inference_id=inference_id,
+                user_id="test_user",
+                inference_engine="tflite",
+                image_path="/bucketimg/IMAGES/" + inference_id,
+                inference_time=0.1,
+                result=str({"rabbit": 0.9}),
+                requested_time=starts[2].strftime("%Y%m%d%H%M%S%f"),
+                created_at=datetime.combine(starts[2], datetime.min.time()),
+            )
+        )
+        db.commit()
+    assert find_partition(inference_id) == get_default_partition_name(table_name)
+    create_upcoming_partitions(starts[2])
+    assert find_partition(inference_id) == partition_names[2]
+    assert partition_exists(partition_names[3])
+
+    # 상한이 보존 기준일 이전인 파티션만 만료 대상
+    expired_partitions = find_expired_partitions(
+        table_name, datetime.combine(starts[2], datetime.min.time())
+    )
+    assert set(partition_names[:2]) <= set(expired_partitions)
+    assert not set(partition_names[2:]) & set(expired_partitions)
+    for partition_name in partition_names:
+        drop_partition(table_name, partition_name)
+        assert not partition_exists(partition_name)
+    assert find_partition(inference_id) is None
+
+
+@pytest.mark.asyncio
+async def test_cleanup_keeps_rows_until_objects_are_deleted(monkeypatch):
+    from datetime import timedelta
+    from app.infrastructure.Interfaces import SessionLocal
+    from app.models.InferenceLogModel import InferenceLogModel
+    from app.worker.LogCleanupWorker import LogCleanupWorker
+
+    inference_id = f"SI-expired-{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+    worker = LogCleanupWorker()
+    await worker.s3_client.upload_file("IMAGES/" + inference_id, b"image")
+    with SessionLocal() as db:
+        db.add(
+            InferenceLogModel(
+                inference_id=inference_id,
+                user_id="test_user",
+                inference_engine="tflite",
+                image_path="/bucketimg/IMAGES/" + inference_id,
+                inference_time=0.1,
+                result=str({"rabbit": 0.9}),
+                requested_time="20200101000000000000",
+                created_at=datetime.now() - timedelta(days=worker.period + 1),
+            )
+        )
+        db.commit()
+
+    def find_log():
+        with SessionLocal() as db:
+            return db.get(InferenceLogModel, inference_id)
+
+    # 객체 삭제가 실패하면 행을 지우지 않아 다음 실행에서 다시 시도
+    async def fail_delete(file_names):
+        raise Exception("object storage unavailable")
+
+    monkeypatch.setattr(worker.s3_client, "delete_files", fail_delete)
+    with pytest.raises(Exception):
+        await worker.delete_old_inference_logs()
+    assert find_log() is not None
+
+    monkeypatch.undo()
+    await worker.delete_old_inference_logs()
+    assert find_log() is None
+    with pytest.raises(Exception):
+        await worker.s3_client.download_file("IMAGES/" + inference_id)
+
+
+@pytest.mark.asyncio
+async def test_cleanup_deletes_expired_tensor_shards(monkeypatch):
+    from datetime import timedelta
+    from app.worker.LogCleanupWorker import LogCleanupWorker
+
+    worker = LogCleanupWorker()
+    # 여러 번 나누어 나열해도 만료된 날짜를 모두 지우는지 확인
+    monkeypatch.setattr(worker, "chunk_size", 2)
+    monkeypatch.setattr(worker, "throttle", 0)
+    retention_date = datetime.now() - timedelta(days=worker.period)
+    expired_days = [
+        (retention_date - timedelta(days=days)).strftime("%Y%m%d") for days in (1, 2)
+    ]
+    kept_days = [retention_date.strftime("%Y%m%d"), datetime.now().strftime("%Y%m%d")]
+    for shard_day in expired_days + kept_days:
+        for idx in range(2):
+            await worker.s3_client.upload_file(
+                f"TENSOR_SHARDS/{shard_day}/shard-{idx}.npy", b"tensor"
+            )
+
+    await worker.delete_old_inference_logs()
+    remaining_keys, _ = await worker.s3_client.list_objects("TENSOR_SHARDS/")
+    remaining_days = {object_key.split("/")[1] for object_key in remaining_keys}
+    assert not remaining_days & set(expired_days)
+    assert set(kept_days) <= remaining_days
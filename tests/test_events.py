@@ -0,0 +1,79 @@
+import pytest
+from fastapi.testclient import TestClient
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.append(str(project_root))
+
+from app.main import app
+
+client = TestClient(app)
+
+TEST_DATA_DIR = Path(__file__).parent / "data"
+
+
+@pytest.mark.asyncio
+async def test_classify_single_image_and_receive_completion_event():
+    image_path = TEST_DATA_DIR / "rabbit.jpg"
+    with open(image_path, "rb") as img_file:
+        response = client.post(
+            "/api/v1/images/classify",
+            files={"image": ("rabbit.jpg", img_file, "image/jpeg")},
+            data={"user_id": "test_user", "inference_engine": "tflite"},
+        )
+    assert response.status_code == 202
+    inference_id = response.json()["data"]["inference_id"]
+
+    # Completion is pushed as soon as the worker commits, no polling needed
+    # (the context manager runs the lifespan, which starts the in-process workers)
+    with TestClient(app) as live_client, live_client.websocket_connect(
+        f"/api/v1/events/ws?inference_id={inference_id}"
+    ) as websocket:
+        event = websocket.receive_json()
+        while event["status"]["msg"] == "keep-alive":
+            event = websocket.receive_json()
+
+    assert event["status"]["msg"] == "completed"
+    assert event["data"]["inference_id"] == inference_id
+
+
+@pytest.mark.asyncio
+async def test_stream_inference_events_without_target():
+    response = client.get("/api/v1/events/classify")
+    assert response.status_code == 400
+    assert response.json()["status"]["msg"] == "inference_id, batch_id or user_id is required"
+
+
+@pytest.mark.asyncio
+async def test_stream_inference_events_idle_timeout(monkeypatch):
+    from app.infrastructure.Environment import get_environment_variables
+
+    monkeypatch.setattr(
+        get_environment_variables(), "EVENT_STREAM_IDLE_TIMEOUT_SECONDS", 1.0
+    )
+    # A subscription that never receives an event ends instead of hanging
+    with client.websocket_connect(
+        "/api/v1/events/ws?inference_id=SI-never-enqueued"
+    ) as websocket:
+        event = websocket.receive_json()
+        while event["status"]["msg"] == "keep-alive":
+            event = websocket.receive_json()
+    assert event["status"]["msg"] == "timeout"
+
+
+@pytest.mark.asyncio
+async def test_stream_inference_events_notifier_unavailable():
+    from app.infrastructure.Interfaces import get_notifier
+
+    class UnavailableNotifier:
+        async def listen(self, **kwargs):
+            raise ConnectionError("redis is down")
+            yield
+
+    app.dependency_overrides[get_notifier] = UnavailableNotifier
+    try:
+        response = client.get("/api/v1/events/classify?inference_id=SI-any")
+    finally:
+        app.dependency_overrides.pop(get_notifier, None)
+    assert response.status_code == 503